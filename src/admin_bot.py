@@ -1,6 +1,7 @@
 """Модуль админского бота"""
 import logging
 from telegram.ext import Application
+from src.middleware.unit_of_work import UnitOfWorkApplication
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,12 @@ class AdminBot:
             token (str): Токен бота от BotFather
         """
         from src.handlers.admin_bot.bot import setup_admin_bot
-        self.application = Application.builder().token(token).build()
+        self.application = (
+            Application.builder()
+            .token(token)
+            .application_class(UnitOfWorkApplication)
+            .build()
+        )
         setup_admin_bot(self.application)
 
 __all__ = ['AdminBot']
\ No newline at end of file
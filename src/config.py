@@ -1,21 +1,66 @@
 """Конфигурация приложения"""
 import os
-from datetime import time
-from dataclasses import dataclass
+import tempfile
+from datetime import date, time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
 
 # Загрузка переменных окружения
 load_dotenv()
 
+# Каталог кэша отчетов по умолчанию
+DEFAULT_REPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'taskbot_reports')
+
 @dataclass
 class Config:
     """Класс конфигурации"""
     admin_bot_token: str
     user_bot_token: str
     database_url: str
+    database_replica_url: Optional[str] = None  # реплика для чтения, None - все запросы на основную БД
     work_start_time: time = time(9, 30)
     work_end_time: time = time(17, 30)
+    # Рабочий календарь (src/utils/work_calendar.py): дни недели (0 - понедельник),
+    # часы отдельных дней вместо work_start_time - work_end_time и праздники
+    work_days: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    work_hours: Dict[int, Tuple[time, time]] = field(default_factory=dict)
+    holidays: Tuple[date, ...] = ()
+    # Часовой пояс учета: по нему метки времени (UTC) относятся к дням в сводках
+    timezone: str = 'UTC'
     datetime_format: str = "%Y-%m-%d %H:%M"  # Формат для парсинга даты и времени
+    # Пул соединений с БД
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1  # секунды, -1 - без пересоздания соединений
+    db_pool_pre_ping: str = 'always'  # always / recycle / none
+    db_statement_cache_size: int = 100  # кэш подготовленных выражений asyncpg
+    db_pool_stats_interval: int = 15  # минуты между записями статистики пула в лог, 0 - отключено
+    db_bulk_chunk_size: int = 500  # размер пачки для пакетных INSERT/UPSERT
+    # Инструментация запросов
+    db_slow_query_ms: int = 500  # порог медленного запроса, 0 - не логировать
+    db_n_plus_one_threshold: int = 5  # повторов одного запроса за апдейт, 0 - не проверять
+    # Канал LISTEN/NOTIFY для сброса кэшей в других процессах, пусто - отключено
+    db_change_channel: str = 'taskbot_changes'
+    # Секционирование task_times
+    task_times_partitions_ahead: int = 2  # сколько месяцев вперед создавать секции
+    task_times_retention_months: int = 24  # секции старше отсоединяются, 0 - хранить все
+    rollup_lookback_days: int = 3  # сколько последних закрытых дней пересчитывать в сводках
+    report_workers: int = 2  # процессы сборки Excel-отчетов
+    report_concurrency: int = 2  # отчетов, собираемых одновременно
+    report_queue_size: int = 10  # отчетов в работе и в очереди, сверх - отказ
+    report_max_waiters: int = 20  # запросов, ожидающих одну сборку, сверх - отказ
+    # Файловый кэш готовых отчетов
+    report_cache_dir: str = DEFAULT_REPORT_CACHE_DIR
+    report_cache_size_mb: int = 200  # предельный размер, 0 - кэш отключен
+    # Кэш аутентифицированных пользователей
+    auth_cache_ttl: int = 300  # секунды
+    auth_cache_size: int = 1024
+    # Кэш справочников (клиенты, проекты, исполнители)
+    reference_cache_size: int = 256
+    reference_cache_ttl: int = 600  # секунды
 
 def get_config() -> Config:
     """Получение конфигурации приложения"""
@@ -30,12 +75,130 @@ def get_config() -> Config:
     if not database_url:
         raise ValueError("❌ Не установлен DATABASE_URL")
 
+    db_pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'always').lower()
+    if db_pool_pre_ping not in DB_POOL_PRE_PING_STRATEGIES:
+        raise ValueError(f"❌ Некорректное значение DB_POOL_PRE_PING: {db_pool_pre_ping}")
+
+    report_workers = int(os.getenv('REPORT_WORKERS', 2))
+    if report_workers < 1:
+        raise ValueError(f"❌ REPORT_WORKERS должно быть не меньше 1: {report_workers}")
+    report_concurrency = int(os.getenv('REPORT_CONCURRENCY', 2))
+    if report_concurrency < 1:
+        raise ValueError(f"❌ REPORT_CONCURRENCY должно быть не меньше 1: {report_concurrency}")
+    report_queue_size = int(os.getenv('REPORT_QUEUE_SIZE', 10))
+    if report_queue_size < report_concurrency:
+        raise ValueError(f"❌ REPORT_QUEUE_SIZE должно быть не меньше REPORT_CONCURRENCY: {report_queue_size}")
+    report_max_waiters = int(os.getenv('REPORT_MAX_WAITERS', 20))
+    if report_max_waiters < 1:
+        raise ValueError(f"❌ REPORT_MAX_WAITERS должно быть не меньше 1: {report_max_waiters}")
+    report_cache_size_mb = int(os.getenv('REPORT_CACHE_SIZE_MB', 200))
+    if report_cache_size_mb < 0:
+        raise ValueError(f"❌ REPORT_CACHE_SIZE_MB не может быть отрицательным: {report_cache_size_mb}")
+
     return Config(
         admin_bot_token=admin_bot_token,
         user_bot_token=user_bot_token,
-        database_url=database_url
+        database_url=database_url,
+        database_replica_url=os.getenv('DATABASE_REPLICA_URL') or None,
+        work_start_time=_parse_time(os.getenv('WORK_START_TIME', '09:30'), 'WORK_START_TIME'),
+        work_end_time=_parse_time(os.getenv('WORK_END_TIME', '17:30'), 'WORK_END_TIME'),
+        work_days=_parse_work_days(os.getenv('WORK_DAYS', 'mon,tue,wed,thu,fri')),
+        work_hours=_parse_work_hours(os.getenv('WORK_HOURS', '')),
+        holidays=_parse_holidays(os.getenv('HOLIDAYS', '')),
+        timezone=_parse_timezone(os.getenv('TIMEZONE')) if os.getenv('TIMEZONE') else _local_timezone(),
+        db_pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
+        db_max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        db_pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        db_pool_recycle=int(os.getenv('DB_POOL_RECYCLE', -1)),
+        db_pool_pre_ping=db_pool_pre_ping,
+        db_statement_cache_size=int(os.getenv('DB_STATEMENT_CACHE_SIZE', 100)),
+        db_pool_stats_interval=int(os.getenv('DB_POOL_STATS_INTERVAL', 15)),
+        db_bulk_chunk_size=int(os.getenv('DB_BULK_CHUNK_SIZE', 500)),
+        db_slow_query_ms=int(os.getenv('DB_SLOW_QUERY_MS', 500)),
+        db_n_plus_one_threshold=int(os.getenv('DB_N_PLUS_ONE_THRESHOLD', 5)),
+        db_change_channel=os.getenv('DB_CHANGE_CHANNEL', 'taskbot_changes'),
+        task_times_partitions_ahead=int(os.getenv('TASK_TIMES_PARTITIONS_AHEAD', 2)),
+        task_times_retention_months=int(os.getenv('TASK_TIMES_RETENTION_MONTHS', 24)),
+        rollup_lookback_days=int(os.getenv('ROLLUP_LOOKBACK_DAYS', 3)),
+        report_workers=report_workers,
+        report_concurrency=report_concurrency,
+        report_queue_size=report_queue_size,
+        report_max_waiters=report_max_waiters,
+        report_cache_dir=os.getenv('REPORT_CACHE_DIR') or DEFAULT_REPORT_CACHE_DIR,
+        report_cache_size_mb=report_cache_size_mb,
+        auth_cache_ttl=int(os.getenv('AUTH_CACHE_TTL', 300)),
+        auth_cache_size=int(os.getenv('AUTH_CACHE_SIZE', 1024)),
+        reference_cache_size=int(os.getenv('REFERENCE_CACHE_SIZE', 256)),
+        reference_cache_ttl=int(os.getenv('REFERENCE_CACHE_TTL', 600))
     )
 
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+def _parse_time(value: str, name: str) -> time:
+    """Время в формате ЧЧ:ММ"""
+    try:
+        return time.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"❌ Некорректное время в {name}: {value}")
+
+def _parse_weekday(value: str, name: str) -> int:
+    """Номер дня недели по сокращению (mon - 0)"""
+    try:
+        return WEEKDAYS.index(value.strip().lower())
+    except ValueError:
+        raise ValueError(f"❌ Некорректный день недели в {name}: {value}")
+
+def _parse_work_days(value: str) -> Tuple[int, ...]:
+    """WORK_DAYS: mon,tue,wed,thu,fri"""
+    return tuple(sorted({_parse_weekday(day, 'WORK_DAYS') for day in value.split(',') if day.strip()}))
+
+def _parse_work_hours(value: str) -> Dict[int, Tuple[time, time]]:
+    """WORK_HOURS: fri=09:30-16:30,sat=10:00-14:00"""
+    work_hours = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        day, _, hours = item.partition('=')
+        start, _, end = hours.partition('-')
+        start_time = _parse_time(start, 'WORK_HOURS')
+        end_time = _parse_time(end, 'WORK_HOURS')
+        if end_time < start_time:
+            raise ValueError(f"❌ Конец рабочего дня раньше начала в WORK_HOURS: {item}")
+        work_hours[_parse_weekday(day, 'WORK_HOURS')] = (start_time, end_time)
+    return work_hours
+
+def _parse_holidays(value: str) -> Tuple[date, ...]:
+    """HOLIDAYS: 2026-01-01,2026-01-02"""
+    try:
+        return tuple(sorted({date.fromisoformat(day.strip()) for day in value.split(',') if day.strip()}))
+    except ValueError:
+        raise ValueError(f"❌ Некорректная дата в HOLIDAYS: {value}")
+
+def _local_timezone() -> str:
+    """Имя системного часового пояса (TZ или /etc/localtime), иначе UTC"""
+    name = os.getenv('TZ', '').lstrip(':')
+    if not name and os.path.islink('/etc/localtime'):
+        _, _, name = os.path.realpath('/etc/localtime').partition('zoneinfo/')
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return 'UTC'
+    return name
+
+def _parse_timezone(value: str) -> str:
+    """TIMEZONE: имя часового пояса IANA, например Europe/Moscow"""
+    try:
+        ZoneInfo(value.strip())
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"❌ Некорректный часовой пояс в TIMEZONE: {value}")
+    return value.strip()
+
+# Стратегии проверки соединений пула:
+# always - pre-ping перед каждой выдачей соединения (лишний запрос к БД)
+# recycle - без pre-ping, соединения пересоздаются по DB_POOL_RECYCLE
+# none - без проверок
+DB_POOL_PRE_PING_STRATEGIES = ('always', 'recycle', 'none')
+
 # Статусы задач
 TASK_STATUSES = {
     'not_started': 'Не начата',
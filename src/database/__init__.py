@@ -10,13 +10,23 @@ from src.database.db import (
     Base,
     db,
     init_db,
-    get_session  # Используем новый асинхронный контекстный менеджер
+    get_session,  # Используем новый асинхронный контекстный менеджер
+    get_read_session,
+    read_your_writes,
+    unit_of_work,
+    get_pool_stats
 )
+from src.database.loader import get_loader
 
 __all__ = [
     # Базовые компоненты
     'Base',
     'db',
     'init_db',
-    'get_session'  # Экспортируем новый асинхронный контекстный менеджер
+    'get_session',  # Экспортируем новый асинхронный контекстный менеджер
+    'get_read_session',
+    'read_your_writes',
+    'unit_of_work',
+    'get_pool_stats',
+    'get_loader'
 ]
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Межпроцессный сброс кэшей через LISTEN/NOTIFY PostgreSQL
+
+Каждая транзакция с изменениями отправляет в канал DB_CHANGE_CHANNEL
+уведомление со списком измененных таблиц и id (см. _before_commit в db.py).
+ChangeFeed слушает канал на отдельном соединении asyncpg (вне пула)
+и передает чужие изменения тем же подписчикам, что и локальные
+(add_change_listener). При потере соединения уведомления за время
+переподключения теряются, поэтому подписчики получают изменение ALL_TABLES.
+
+Изменения в обход приложения (ручной SQL, миграции) можно разослать так:
+    SELECT pg_notify('taskbot_changes', '{"changes": {"clients": null}}');
+"""
+import asyncio
+import logging
+from typing import Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.config import get_config
+from src.database.db import engine, dispatch_changes, decode_changes, PROCESS_ID, ALL_TABLES
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Пауза перед повторным подключением (секунды)
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+
+# Интервал проверки соединения (секунды)
+HEALTHCHECK_INTERVAL = 30.0
+
+def _connect_args() -> dict:
+    """Параметры asyncpg.connect из DATABASE_URL (с теми же правилами, что у движка)"""
+    _, kwargs = engine.dialect.create_connect_args(make_url(config.database_url))
+    kwargs.pop('prepared_statement_cache_size', None)
+    kwargs.pop('async_creator_fn', None)
+    return kwargs
+
+class ChangeFeed:
+    """Подписка на канал изменений с автоматическим переподключением"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float = 10.0) -> None:
+        """Запуск прослушивания; ожидает первого подключения не дольше timeout"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name=f"change-feed-{self.channel}")
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Канал изменений {self.channel}: нет подключения, продолжаем попытки в фоне")
+
+    async def stop(self) -> None:
+        """Остановка прослушивания"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            origin, changes = decode_changes(payload)
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Некорректное уведомление в канале {channel}: {payload!r} ({e})")
+            return
+        # Свои изменения подписчики уже получили после COMMIT
+        if origin == PROCESS_ID or not changes:
+            return
+        logger.debug(f"Изменения из другого процесса: {sorted(changes, key=str)}")
+        dispatch_changes(changes)
+
+    async def _wait_lost(self, connection: asyncpg.Connection, lost: asyncio.Event) -> None:
+        """Ожидание обрыва соединения с периодической проверкой (обрыв сети сам не виден)"""
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), HEALTHCHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                await connection.execute("SELECT 1", timeout=HEALTHCHECK_INTERVAL)
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        first = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(**_connect_args())
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notification)
+                logger.info(f"Подписка на канал изменений {self.channel}")
+                if not first:
+                    # Уведомления за время без соединения потеряны
+                    dispatch_changes({(ALL_TABLES, None)})
+                first = False
+                delay = RECONNECT_DELAY
+                self._connected.set()
+                await self._wait_lost(connection, lost)
+                logger.warning(f"Соединение канала изменений {self.channel} потеряно")
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"Канал изменений {self.channel}: ошибка подключения ({e}), повтор через {delay:.0f} с")
+            finally:
+                self._connected.clear()
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            first = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+change_feed = ChangeFeed(config.db_change_channel)
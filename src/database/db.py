@@ -1,13 +1,22 @@
 """База данных Task Bot"""
 
-from sqlalchemy import select, text
+from sqlalchemy import bindparam, event, func, select, text, tuple_, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, aliased, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from contextlib import asynccontextmanager
-from typing import TypeVar, Type, Optional, List, Any, AsyncGenerator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Generic, TypeVar, Type, Optional, List, Dict, Any, AsyncGenerator, Generator, Iterable, Iterator, Sequence, Set, Tuple
 from src.database.base import Base
+from src.database.pool import InstrumentedAsyncPool
+from src.database.instrumentation import instrument_engine
+import itertools
+import json
 import logging
+import uuid
 
 from src.config import get_config
 
@@ -20,12 +29,34 @@ config = get_config()
 # Создание типа для моделей
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Время жизни соединения по умолчанию для стратегии 'recycle' (секунды)
+DEFAULT_POOL_RECYCLE = 1800
+
+def _engine_options(database_url: str) -> dict:
+    """Параметры пула соединений и драйвера из конфигурации"""
+    pool_recycle = config.db_pool_recycle
+    if config.db_pool_pre_ping == 'recycle' and pool_recycle < 0:
+        pool_recycle = DEFAULT_POOL_RECYCLE
+
+    options = {
+        'echo': False,  # Отключаем echo для уменьшения шума в логах
+        'poolclass': InstrumentedAsyncPool,
+        'pool_size': config.db_pool_size,
+        'max_overflow': config.db_max_overflow,
+        'pool_timeout': config.db_pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': config.db_pool_pre_ping == 'always'  # Проверка соединения перед использованием
+    }
+    if make_url(database_url).get_driver_name() == 'asyncpg':
+        options['connect_args'] = {
+            'prepared_statement_cache_size': config.db_statement_cache_size
+        }
+    return options
+
 # Создание асинхронного движка базы данных
-engine = create_async_engine(
-    config.database_url,
-    echo=False,  # Отключаем echo для уменьшения шума в логах
-    pool_pre_ping=True  # Проверка соединения перед использованием
-)
+engine = create_async_engine(config.database_url, **_engine_options(config.database_url))
+
+instrument_engine(engine)
 
 # Создание асинхронной фабрики сессий
 AsyncSessionFactory = async_sessionmaker(
@@ -34,15 +65,301 @@ AsyncSessionFactory = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Движок реплики для чтения (если настроен DATABASE_REPLICA_URL)
+replica_engine = (
+    create_async_engine(config.database_replica_url, **_engine_options(config.database_replica_url))
+    if config.database_replica_url else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine)
+
+# Фабрика сессий реплики (только чтение)
+ReplicaSessionFactory = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    info={'replica': True}
+) if replica_engine is not None else None
+
+class UnitOfWork:
+    """
+    Единица работы: одна сессия и одна транзакция на весь апдейт Telegram.
+
+    Сессия создается лениво при первом обращении к БД, а фиксируется
+    или откатывается один раз в конце обработки апдейта.
+    """
+
+    def __init__(self):
+        self._session: Optional[AsyncSession] = None
+        self._replica_session: Optional[AsyncSession] = None
+        self.rollback_only = False
+        self.closed = False
+        # После первой записи чтения идут на основную БД (read-your-writes)
+        self.wrote = False
+        # Пакетные загрузчики по ID на время апдейта (src/database/loader.py)
+        self.loaders: Dict[Any, Any] = {}
+
+    @property
+    def session(self) -> AsyncSession:
+        """Общая сессия единицы работы"""
+        if self._session is None:
+            self._session = AsyncSessionFactory()
+        return self._session
+
+    @property
+    def replica_session(self) -> AsyncSession:
+        """Сессия реплики для чтений до первой записи"""
+        if self._replica_session is None:
+            self._replica_session = ReplicaSessionFactory()
+        return self._replica_session
+
+    def mark_rollback_only(self) -> None:
+        """Помечает транзакцию для отката в конце апдейта"""
+        self.rollback_only = True
+
+    async def close(self) -> None:
+        """Фиксация или откат транзакции и закрытие сессии"""
+        self.closed = True
+        if self._replica_session is not None:
+            await self._replica_session.close()
+        if self._session is None:
+            return
+        try:
+            if self.rollback_only:
+                await self._session.rollback()
+            else:
+                await self._session.commit()
+        except SQLAlchemyError as e:
+            await self._session.rollback()
+            logger.error(f"Ошибка при фиксации единицы работы: {e}", exc_info=True)
+            raise
+        finally:
+            await self._session.close()
+
+# Текущая единица работы (привязывается к апдейту Telegram)
+_current_uow: ContextVar[Optional[UnitOfWork]] = ContextVar("current_uow", default=None)
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """Возвращает активную единицу работы или None"""
+    uow = _current_uow.get()
+    if uow is None or uow.closed:
+        return None
+    return uow
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Контекстный менеджер единицы работы.
+
+    Все вызовы db.* и get_session() внутри блока используют одну сессию.
+    Вложенный вызов переиспользует внешнюю единицу работы.
+    """
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+
+    uow = UnitOfWork()
+    token = _current_uow.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        uow.mark_rollback_only()
+        raise
+    finally:
+        _current_uow.reset(token)
+        await uow.close()
+
 @asynccontextmanager
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Асинхронный контекстный менеджер для работы с сессией БД"""
+    uow = current_unit_of_work()
+    if uow is not None:
+        # Внутри апдейта отдаем общую сессию, ее закроет единица работы
+        yield uow.session
+        return
+
     session = AsyncSessionFactory()
     try:
         yield session
     finally:
         await session.close()
 
+# Принудительное чтение с основной БД (см. read_your_writes)
+_read_your_writes: ContextVar[bool] = ContextVar("read_your_writes", default=False)
+
+@contextmanager
+def read_your_writes() -> Generator[None, None, None]:
+    """
+    Направляет все чтения внутри блока на основную БД.
+
+    Нужен для сценариев, которые читают данные сразу после записи
+    и не могут ждать, пока изменения дойдут до реплики.
+    """
+    token = _read_your_writes.set(True)
+    try:
+        yield
+    finally:
+        _read_your_writes.reset(token)
+
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для чтения: реплика, если она настроена.
+
+    На основную БД чтение уходит, если реплика не настроена, включен
+    read_your_writes() или в текущей единице работы уже была запись.
+    """
+    uow = current_unit_of_work()
+    if ReplicaSessionFactory is None or _read_your_writes.get() or (uow is not None and uow.wrote):
+        async with get_session() as session:
+            yield session
+        return
+
+    if uow is not None:
+        yield uow.replica_session
+        return
+
+    session = ReplicaSessionFactory()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+def _forget_loaded(model: Type[ModelType], id: int) -> None:
+    """Сброс измененной записи из загрузчика текущего апдейта"""
+    uow = current_unit_of_work()
+    if uow is not None and model in uow.loaders:
+        uow.loaders[model].clear(id)
+
+# Изменение записи: (таблица, id или None, если id неизвестен)
+Change = Tuple[str, Optional[int]]
+
+# Изменение с неизвестным набором таблиц (например, после потери канала уведомлений)
+ALL_TABLES = '*'
+
+# Идентификатор процесса в уведомлениях: свои изменения уже обработаны после COMMIT
+PROCESS_ID = uuid.uuid4().hex
+
+# Предел размера уведомления NOTIFY с запасом (ограничение PostgreSQL - 8000 байт)
+MAX_NOTIFY_PAYLOAD = 7900
+
+# Подписчики на зафиксированные изменения (кэши справочников и т.п.)
+_change_listeners: List[Callable[[Set[Change]], None]] = []
+
+def add_change_listener(listener: Callable[[Set[Change]], None]) -> None:
+    """
+    Подписка на изменения, зафиксированные в основной БД
+
+    Слушатель вызывается после COMMIT с набором измененных записей.
+    """
+    _change_listeners.append(listener)
+
+def dispatch_changes(changes: Set[Change]) -> None:
+    """Передача изменений подписчикам (ошибки подписчиков пишутся в лог)"""
+    for listener in _change_listeners:
+        try:
+            listener(changes)
+        except Exception as e:
+            logger.error(f"Ошибка в обработчике изменений {listener!r}: {e}", exc_info=True)
+
+def encode_changes(changes: Set[Change]) -> str:
+    """
+    Уведомление об изменениях для NOTIFY: {"origin": ..., "changes": {таблица: [id] | null}}
+
+    Если список id не помещается в уведомление, передаются только таблицы.
+    """
+    by_table: Dict[str, Optional[List[int]]] = {}
+    for table, id in changes:
+        ids = by_table.setdefault(table, [])
+        if id is None or ids is None:
+            by_table[table] = None
+        else:
+            ids.append(id)
+
+    payload = json.dumps({'origin': PROCESS_ID, 'changes': by_table})
+    if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+        payload = json.dumps({'origin': PROCESS_ID, 'changes': dict.fromkeys(by_table)})
+    return payload
+
+def decode_changes(payload: str) -> Tuple[Optional[str], Set[Change]]:
+    """Разбор уведомления: (процесс-источник, изменения)"""
+    data = json.loads(payload)
+    changes: Set[Change] = set()
+    for table, ids in data.get('changes', {}).items():
+        if ids is None:
+            changes.add((table, None))
+        else:
+            changes.update((table, id) for id in ids)
+    return data.get('origin'), changes
+
+def pending_changes() -> Set[Change]:
+    """Незафиксированные изменения текущей единицы работы"""
+    uow = current_unit_of_work()
+    if uow is None or uow._session is None:
+        return set()
+    return uow._session.sync_session.info.get('changes', set())
+
+def _mark_write(session: Session, changes: Iterable[Change] = ()) -> None:
+    """Отмечает запись в основную БД в текущей единице работы и запоминает изменения"""
+    if session.info.get('replica'):
+        return
+    session.info.setdefault('changes', set()).update(changes)
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.wrote = True
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    _mark_write(session, (
+        (item.__tablename__, getattr(item, 'id', None))
+        for item in itertools.chain(session.new, session.dirty, session.deleted)
+        if hasattr(item, '__tablename__')
+    ))
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_orm_execute(orm_execute_state: Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        _mark_write(orm_execute_state.session, [(table.name, None)] if table is not None else [])
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    # NOTIFY в той же транзакции: другие процессы получат его только после COMMIT
+    if not config.db_change_channel or session.info.get('replica'):
+        return
+    session.flush()
+    changes = session.info.get('changes')
+    if changes:
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {'channel': config.db_change_channel, 'payload': encode_changes(changes)}
+        )
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    changes = session.info.pop('changes', None)
+    if changes:
+        dispatch_changes(changes)
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop('changes', None)
+
+def _pool_snapshot(pool_engine) -> dict:
+    """Статистика пула соединений одного движка"""
+    pool = pool_engine.sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncPool):
+        return pool.snapshot()
+    return {'status': pool.status()}
+
+def get_pool_stats() -> dict:
+    """Текущая статистика пула соединений движка (и реплики, если настроена)"""
+    stats = _pool_snapshot(engine)
+    if replica_engine is not None:
+        stats['replica'] = _pool_snapshot(replica_engine)
+    return stats
+
 async def init_db() -> None:
     """Инициализация базы данных: создание всех таблиц"""
     try:
@@ -56,8 +373,142 @@ async def init_db() -> None:
         logger.error(f"Неожиданная ошибка при инициализации БД: {e}", exc_info=True)
         raise
 
+@dataclass
+class Page(Generic[ModelType]):
+    """Страница результатов keyset-пагинации"""
+    items: List[ModelType] = field(default_factory=list)
+    has_next: bool = False
+    has_prev: bool = False
+
+    @property
+    def first_id(self) -> Optional[int]:
+        """ID первой записи страницы (курсор для предыдущей страницы)"""
+        return self.items[0].id if self.items else None
+
+    @property
+    def last_id(self) -> Optional[int]:
+        """ID последней записи страницы (курсор для следующей страницы)"""
+        return self.items[-1].id if self.items else None
+
+def _apply_filters(stmt, model: Type[ModelType], filters: Dict[str, Any]):
+    """Добавление фильтров вида поле=значение (список - IN)"""
+    for field_name, value in filters.items():
+        if isinstance(value, list):
+            stmt = stmt.where(getattr(model, field_name).in_(value))
+        else:
+            stmt = stmt.where(getattr(model, field_name) == value)
+    return stmt
+
+# Кэш построенных выражений: (вид запроса, модель, форма фильтров, ...) -> выражение.
+# Значения фильтров передаются параметрами, поэтому выражение одной формы
+# строится и компилируется один раз, а asyncpg переиспользует подготовленный запрос.
+_statement_cache: Dict[Tuple[Any, ...], Any] = {}
+
+def _cached_statement(key: Tuple[Any, ...], build: Callable[[], Any]) -> Any:
+    """Выражение из кэша или построенное build() при первом обращении"""
+    stmt = _statement_cache.get(key)
+    if stmt is None:
+        stmt = _statement_cache[key] = build()
+    return stmt
+
+def _filter_shape(filters: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """Форма фильтров: поля и вид сравнения (eq / in / null) без значений"""
+    shape = []
+    for field_name, value in filters.items():
+        if value is None:
+            kind = 'null'
+        elif isinstance(value, list):
+            kind = 'in'
+        else:
+            kind = 'eq'
+        shape.append((field_name, kind))
+    return tuple(sorted(shape))
+
+def _bind_filters(stmt, model: Type[ModelType], shape: Tuple[Tuple[str, str], ...]):
+    """Добавление фильтров формы shape с параметрами вместо значений"""
+    for field_name, kind in shape:
+        column = getattr(model, field_name)
+        if kind == 'null':
+            stmt = stmt.where(column.is_(None))
+        elif kind == 'in':
+            stmt = stmt.where(column.in_(bindparam(f"f_{field_name}", expanding=True)))
+        else:
+            stmt = stmt.where(column == bindparam(f"f_{field_name}"))
+    return stmt
+
+def _filter_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Значения параметров для выражения из _bind_filters"""
+    return {f"f_{field_name}": value for field_name, value in filters.items() if value is not None}
+
+def _tasks_with_relations_statement(only_active: bool):
+    """Задачи исполнителя с предзагрузкой клиента и проекта"""
+    from src.database.models import Task  # Импорт здесь во избежание циклических зависимостей
+    stmt = (
+        select(Task)
+        .options(
+            selectinload(Task.client),
+            selectinload(Task.project)
+        )
+        .where(Task.assignee_id == bindparam('user_id'))
+    )
+    if only_active:
+        stmt = stmt.where(Task.status.in_(Task.ACTIVE_STATUSES))
+    return stmt
+
+def _task_with_relations_statement():
+    """Задача по ID с предзагрузкой клиента и проекта"""
+    from src.database.models import Task  # Импорт здесь во избежание циклических зависимостей
+    return (
+        select(Task)
+        .options(
+            selectinload(Task.client),
+            selectinload(Task.project)
+        )
+        .where(Task.id == bindparam('task_id'))
+    )
+
+def _page_statement(model: Type[ModelType], order_by: str, direction: Optional[str], shape: Tuple[Tuple[str, str], ...]):
+    """Выражение страницы keyset-пагинации (direction: None / 'after' / 'before')"""
+    order_col = getattr(model, order_by)
+    stmt = _bind_filters(select(model), model, shape)
+    if direction is not None:
+        cursor = aliased(model)
+        cursor_key = (
+            select(getattr(cursor, order_by), cursor.id)
+            .where(cursor.id == bindparam('cursor_id'))
+            .scalar_subquery()
+        )
+        key = tuple_(order_col, model.id)
+        stmt = stmt.where(key < cursor_key if direction == 'before' else key > cursor_key)
+    if direction == 'before':
+        stmt = stmt.order_by(order_col.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(order_col, model.id)
+    return stmt.limit(bindparam('page_limit'))
+
+def _chunks(rows: Sequence[Dict[str, Any]], size: int) -> Iterator[Sequence[Dict[str, Any]]]:
+    """Разбиение списка строк на пачки"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
 class DatabaseManager:
     """Асинхронный менеджер для работы с базой данных"""
+
+    @staticmethod
+    async def _commit(session: AsyncSession) -> None:
+        """Фиксация изменений (внутри единицы работы - только flush)"""
+        if current_unit_of_work() is not None:
+            await session.flush()
+        else:
+            await session.commit()
+
+    @staticmethod
+    async def _rollback(session: AsyncSession) -> None:
+        """Откат изменений (внутри единицы работы - откат всего апдейта)"""
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.mark_rollback_only()
+        await session.rollback()
     
     async def create(self, model: Type[ModelType], **kwargs: Any) -> ModelType:
         """Создание новой записи в БД"""
@@ -65,11 +516,10 @@ class DatabaseManager:
             try:
                 item = model(**kwargs)
                 session.add(item)
-                await session.flush()
-                await session.commit()
+                await self._commit(session)
                 return item
             except SQLAlchemyError as e:
-                await session.rollback()
+                await self._rollback(session)
                 logger.error(f"Ошибка при создании записи: {e}", exc_info=True)
                 raise
 
@@ -80,7 +530,7 @@ class DatabaseManager:
     
     async def get(self, model: Type[ModelType], id: int) -> Optional[ModelType]:
         """Получение записи по ID"""
-        async with get_session() as session:
+        async with get_read_session() as session:
             try:
                 return await session.get(model, id)
             except SQLAlchemyError as e:
@@ -95,19 +545,24 @@ class DatabaseManager:
                     "SELECT setval('users_id_seq', COALESCE((SELECT MAX(id) FROM users)::BIGINT, 1), true);"
                 )
                 await session.execute(stmt)
-                await session.commit()
+                await self._commit(session)
                 logger.info("Последовательность 'users_id_seq' успешно обновлена")
             except SQLAlchemyError as e:
-                await session.rollback()
+                await self._rollback(session)
                 logger.error(f"Ошибка при обновлении 'users_id_seq': {e}", exc_info=True)
                 raise
 
     async def get_by_field(self, model: Type[ModelType], field: str, value: Any) -> Optional[ModelType]:
         """Получение записи по произвольному полю"""
-        async with get_session() as session:
+        async with get_read_session() as session:
             try:
-                stmt = select(model).where(getattr(model, field) == value)
-                result = await session.execute(stmt)
+                filters = {field: value}
+                shape = _filter_shape(filters)
+                stmt = _cached_statement(
+                    ('get_by_field', model, shape),
+                    lambda: _bind_filters(select(model), model, shape)
+                )
+                result = await session.execute(stmt, _filter_params(filters))
                 return result.scalar_one_or_none()
             except SQLAlchemyError as e:
                 logger.error(f"Ошибка при получении записи по полю: {e}", exc_info=True)
@@ -115,43 +570,109 @@ class DatabaseManager:
 
     async def get_all(self, model: Type[ModelType], **filters: Any) -> List[ModelType]:
         """Получение всех записей с опциональными фильтрами"""
-        async with get_session() as session:
+        async with get_read_session() as session:
             try:
-                stmt = select(model)
-                for field, value in filters.items():
-                    if isinstance(value, list):
-                        stmt = stmt.where(getattr(model, field).in_(value))
-                    else:
-                        stmt = stmt.where(getattr(model, field) == value)
-                result = await session.execute(stmt)
+                shape = _filter_shape(filters)
+                stmt = _cached_statement(
+                    ('get_all', model, shape),
+                    lambda: _bind_filters(select(model), model, shape)
+                )
+                result = await session.execute(stmt, _filter_params(filters))
                 return list(result.scalars().all())
             except SQLAlchemyError as e:
                 logger.error(f"Ошибка при получении списка записей: {e}", exc_info=True)
                 raise
 
+    async def get_page(
+        self,
+        model: Type[ModelType],
+        after_id: Optional[int] = None,
+        limit: int = 10,
+        order_by: str = 'id',
+        before_id: Optional[int] = None,
+        **filters: Any
+    ) -> Page[ModelType]:
+        """
+        Keyset-пагинация: страница записей после (или до) записи-курсора
+
+        Сортировка по (order_by, id), поэтому order_by должен быть NOT NULL колонкой.
+        Стоимость запроса не зависит от номера страницы.
+
+        Args:
+            after_id: ID последней записи предыдущей страницы (следующая страница)
+            limit: Размер страницы
+            order_by: Поле сортировки
+            before_id: ID первой записи текущей страницы (предыдущая страница)
+        """
+        backward = before_id is not None
+        cursor_id = before_id if backward else after_id
+        direction = None if cursor_id is None else ('before' if backward else 'after')
+
+        async with get_read_session() as session:
+            try:
+                shape = _filter_shape(filters)
+                stmt = _cached_statement(
+                    ('get_page', model, order_by, direction, shape),
+                    lambda: _page_statement(model, order_by, direction, shape)
+                )
+                params = _filter_params(filters)
+                if cursor_id is not None:
+                    params['cursor_id'] = cursor_id
+                # Лишняя запись показывает, есть ли страница дальше
+                params['page_limit'] = limit + 1
+                result = await session.execute(stmt, params)
+                items = list(result.scalars().all())
+                has_more = len(items) > limit
+                items = items[:limit]
+
+                if backward:
+                    items.reverse()
+                    return Page(items=items, has_next=True, has_prev=has_more)
+                return Page(items=items, has_next=has_more, has_prev=cursor_id is not None)
+            except SQLAlchemyError as e:
+                logger.error(f"Ошибка при получении страницы записей: {e}", exc_info=True)
+                raise
+
+    async def count(self, model: Type[ModelType], **filters: Any) -> int:
+        """Количество записей с опциональными фильтрами"""
+        async with get_read_session() as session:
+            try:
+                shape = _filter_shape(filters)
+                stmt = _cached_statement(
+                    ('count', model, shape),
+                    lambda: _bind_filters(select(func.count()).select_from(model), model, shape)
+                )
+                result = await session.execute(stmt, _filter_params(filters))
+                return result.scalar_one()
+            except SQLAlchemyError as e:
+                logger.error(f"Ошибка при подсчете записей: {e}", exc_info=True)
+                raise
+
     async def get_tasks_with_relations(self, user_id: int, only_active: bool = False) -> List["Task"]:
         """Получение задач с предварительной загрузкой связанных объектов"""
-        from src.database.models import Task  # Импорт здесь во избежание циклических зависимостей
-        async with get_session() as session:
+        async with get_read_session() as session:
             try:
-                stmt = (
-                    select(Task)
-                    .options(
-                        selectinload(Task.client),
-                        selectinload(Task.project)
-                    )
-                    .where(Task.assignee_id == user_id)
+                stmt = _cached_statement(
+                    ('tasks_with_relations', only_active),
+                    lambda: _tasks_with_relations_statement(only_active)
                 )
-                
-                if only_active:
-                    stmt = stmt.where(Task.status.in_(['not_started', 'in_progress']))
-                
-                result = await session.execute(stmt)
+                result = await session.execute(stmt, {'user_id': user_id})
                 return list(result.scalars().all())
             except SQLAlchemyError as e:
                 logger.error(f"Ошибка при получении задач: {e}", exc_info=True)
                 raise
 
+    async def get_task_with_relations(self, task_id: int) -> Optional["Task"]:
+        """Получение задачи по ID с предварительной загрузкой клиента и проекта"""
+        async with get_read_session() as session:
+            try:
+                stmt = _cached_statement(('task_with_relations',), _task_with_relations_statement)
+                result = await session.execute(stmt, {'task_id': task_id})
+                return result.scalar_one_or_none()
+            except SQLAlchemyError as e:
+                logger.error(f"Ошибка при получении задачи: {e}", exc_info=True)
+                raise
+
     async def update(self, model: Type[ModelType], id: int, **kwargs: Any) -> Optional[ModelType]:
         """Обновление существующей записи"""
         async with get_session() as session:
@@ -163,13 +684,105 @@ class DatabaseManager:
                 if item:
                     for key, value in kwargs.items():
                         setattr(item, key, value)
-                    await session.commit()
+                    await self._commit(session)
+                    _forget_loaded(model, id)
                 return item
             except SQLAlchemyError as e:
-                await session.rollback()
+                await self._rollback(session)
                 logger.error(f"Ошибка при обновлении записи: {e}", exc_info=True)
                 raise
 
+    async def create_many(
+        self,
+        model: Type[ModelType],
+        rows: Sequence[Dict[str, Any]],
+        chunk_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """Пакетное создание записей: INSERT ... RETURNING пачками по chunk_size строк"""
+        if not rows:
+            return []
+        chunk_size = chunk_size or config.db_bulk_chunk_size
+        async with get_session() as session:
+            try:
+                items = []
+                for chunk in _chunks(rows, chunk_size):
+                    result = await session.scalars(insert(model).returning(model), chunk)
+                    items.extend(result.all())
+                await self._commit(session)
+                return items
+            except SQLAlchemyError as e:
+                await self._rollback(session)
+                logger.error(f"Ошибка при пакетном создании записей: {e}", exc_info=True)
+                raise
+
+    async def update_where(self, model: Type[ModelType], where: Dict[str, Any], **values: Any) -> int:
+        """
+        Обновление всех записей, подходящих под фильтры, одним UPDATE ... WHERE
+
+        Returns:
+            int: Количество обновленных записей
+        """
+        async with get_session() as session:
+            try:
+                stmt = _apply_filters(
+                    update(model).values(**values).execution_options(synchronize_session=False),
+                    model,
+                    where
+                )
+                result = await session.execute(stmt)
+                await self._commit(session)
+                return result.rowcount
+            except SQLAlchemyError as e:
+                await self._rollback(session)
+                logger.error(f"Ошибка при пакетном обновлении записей: {e}", exc_info=True)
+                raise
+
+    async def upsert_many(
+        self,
+        model: Type[ModelType],
+        rows: Sequence[Dict[str, Any]],
+        conflict_fields: Sequence[str] = ('id',),
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Пакетная вставка или обновление: INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+
+        Args:
+            conflict_fields: Поля уникального ограничения для определения конфликта
+            update_fields: Обновляемые при конфликте поля (по умолчанию все, кроме conflict_fields)
+        """
+        if not rows:
+            return []
+        chunk_size = chunk_size or config.db_bulk_chunk_size
+        if update_fields is None:
+            update_fields = [key for key in rows[0] if key not in conflict_fields]
+
+        async with get_session() as session:
+            try:
+                items = []
+                for chunk in _chunks(rows, chunk_size):
+                    stmt = pg_insert(model)
+                    if update_fields:
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=list(conflict_fields),
+                            set_={field: stmt.excluded[field] for field in update_fields}
+                        )
+                    else:
+                        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_fields))
+                    result = await session.scalars(
+                        stmt.returning(model),
+                        chunk,
+                        execution_options={'populate_existing': True}
+                    )
+                    items.extend(result.all())
+                await self._commit(session)
+                return items
+            except SQLAlchemyError as e:
+                await self._rollback(session)
+                logger.error(f"Ошибка при пакетной вставке/обновлении записей: {e}", exc_info=True)
+                raise
+
     async def delete(self, model: Type[ModelType], id: int) -> bool:
         """Удаление записи по ID"""
         async with get_session() as session:
@@ -180,22 +793,25 @@ class DatabaseManager:
                 
                 if item:
                     await session.delete(item)
-                    await session.commit()
+                    await self._commit(session)
+                    _forget_loaded(model, id)
                     return True
                 return False
             except SQLAlchemyError as e:
-                await session.rollback()
+                await self._rollback(session)
                 logger.error(f"Ошибка при удалении записи: {e}", exc_info=True)
                 raise
 
     async def exists(self, model: Type[ModelType], **filters: Any) -> bool:
         """Проверка существования записи с заданными фильтрами"""
-        async with get_session() as session:
+        async with get_read_session() as session:
             try:
-                stmt = select(1).select_from(model)
-                for field, value in filters.items():
-                    stmt = stmt.where(getattr(model, field) == value)
-                result = await session.execute(stmt)
+                shape = _filter_shape(filters)
+                stmt = _cached_statement(
+                    ('exists', model, shape),
+                    lambda: _bind_filters(select(1).select_from(model), model, shape).limit(1)
+                )
+                result = await session.execute(stmt, _filter_params(filters))
                 return result.scalar_one_or_none() is not None
             except SQLAlchemyError as e:
                 logger.error(f"Ошибка при проверке существования записи: {e}", exc_info=True)
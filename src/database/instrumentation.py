@@ -0,0 +1,199 @@
+"""
+Инструментация SQL-запросов: статистика по апдейтам, поиск N+1 и журнал медленных запросов
+"""
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import get_config
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Максимальная длина текста запроса в логах
+MAX_STATEMENT_LOG_LENGTH = 500
+
+# Параметры запроса ($1::INTEGER) и списки параметров в IN (...)
+_PARAM_RE = re.compile(r"\$\d+(?:::[A-Z ]+(?:\(\d+\))?)?")
+_PARAM_LIST_RE = re.compile(r"\(\?(?:, \?)+\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Форма запроса: текст без параметров и с одинаковым видом списков IN"""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _PARAM_LIST_RE.sub("(?)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+def _truncate(statement: str) -> str:
+    """Сокращение текста запроса для логов"""
+    statement = _WHITESPACE_RE.sub(" ", statement).strip()
+    if len(statement) > MAX_STATEMENT_LOG_LENGTH:
+        return statement[:MAX_STATEMENT_LOG_LENGTH] + "..."
+    return statement
+
+class UpdateQueryStats:
+    """Статистика SQL-запросов, выполненных при обработке одного апдейта"""
+
+    def __init__(self, update_id: Optional[int] = None):
+        self.update_id = update_id
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.slowest_handler: Optional[str] = None
+        self.by_handler: Dict[str, int] = {}
+        # форма запроса -> [количество, обработчик первого выполнения]
+        self.shapes: Dict[str, List[Any]] = {}
+
+    def record(self, statement: str, elapsed: float, handler: Optional[str]) -> None:
+        """Учет одного выполненного запроса"""
+        handler = handler or '-'
+        self.count += 1
+        self.total_time += elapsed
+        self.by_handler[handler] = self.by_handler.get(handler, 0) + 1
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+            self.slowest_handler = handler
+
+        shape = statement_shape(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            self.shapes[shape] = [1, handler]
+        else:
+            entry[0] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int, str]]:
+        """Формы запросов, повторенные больше threshold раз: (форма, количество, обработчик)"""
+        return [
+            (shape, count, handler)
+            for shape, (count, handler) in self.shapes.items()
+            if count > threshold
+        ]
+
+# Статистика текущего апдейта и имя текущего обработчика
+_current_stats: ContextVar[Optional[UpdateQueryStats]] = ContextVar("current_query_stats", default=None)
+_current_handler: ContextVar[Optional[str]] = ContextVar("current_handler", default=None)
+
+def current_query_stats() -> Optional[UpdateQueryStats]:
+    """Статистика запросов текущего апдейта или None"""
+    return _current_stats.get()
+
+@contextmanager
+def track_update(update: object) -> Generator[UpdateQueryStats, None, None]:
+    """
+    Сбор статистики SQL-запросов на время обработки апдейта.
+
+    По завершении пишет сводку в лог (DEBUG) и предупреждение
+    о повторяющихся запросах (возможная проблема N+1).
+    """
+    stats = UpdateQueryStats(getattr(update, 'update_id', None))
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        _log_update_stats(stats)
+
+def _log_update_stats(stats: UpdateQueryStats) -> None:
+    """Сводка и предупреждения N+1 по итогам апдейта"""
+    if not stats.count:
+        return
+
+    logger.debug(
+        f"Апдейт {stats.update_id}: {stats.count} SQL-запросов за {stats.total_time * 1000:.1f} мс "
+        f"по обработчикам {stats.by_handler}; самый медленный {stats.slowest_time * 1000:.1f} мс "
+        f"({stats.slowest_handler}): {_truncate(stats.slowest_statement or '')}"
+    )
+
+    threshold = config.db_n_plus_one_threshold
+    if threshold <= 0:
+        return
+    for shape, count, handler in stats.repeated_shapes(threshold):
+        logger.warning(
+            f"Возможная проблема N+1: запрос выполнен {count} раз за апдейт {stats.update_id} "
+            f"(обработчик {handler}): {_truncate(shape)}"
+        )
+
+@contextmanager
+def handler_scope(name: str) -> Generator[None, None, None]:
+    """Привязка выполняемых запросов к обработчику"""
+    token = _current_handler.set(name)
+    try:
+        yield
+    finally:
+        _current_handler.reset(token)
+
+def instrument_callback(callback: Callable) -> Callable:
+    """Обертка callback-функции обработчика, привязывающая запросы к обработчику"""
+    if getattr(callback, '__query_instrumented__', False):
+        return callback
+
+    name = getattr(callback, '__qualname__', repr(callback))
+
+    @wraps(callback)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with handler_scope(name):
+            return await callback(*args, **kwargs)
+
+    wrapper.__query_instrumented__ = True
+    return wrapper
+
+def instrument_handler(handler: Any) -> Any:
+    """
+    Оборачивает callback обработчика (и вложенных обработчиков ConversationHandler)
+    """
+    nested = []
+    if hasattr(handler, 'entry_points'):
+        nested.extend(handler.entry_points)
+        for state_handlers in handler.states.values():
+            nested.extend(state_handlers)
+        nested.extend(handler.fallbacks)
+    for inner in nested:
+        instrument_handler(inner)
+
+    callback = getattr(handler, 'callback', None)
+    if callback is not None and not hasattr(handler, 'entry_points'):
+        handler.callback = instrument_callback(callback)
+    return handler
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info['query_start_time'].pop()
+    elapsed = time.perf_counter() - started
+    handler = _current_handler.get()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed, handler)
+
+    slow_ms = config.db_slow_query_ms
+    if slow_ms > 0 and elapsed * 1000 >= slow_ms:
+        logger.warning(
+            f"Медленный запрос {elapsed * 1000:.1f} мс "
+            f"(апдейт {stats.update_id if stats else '-'}, обработчик {handler or '-'}): "
+            f"{_truncate(statement)}"
+        )
+
+def _handle_error(exception_context) -> None:
+    # Запрос завершился ошибкой: убираем его время начала из стека
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start_time'):
+        connection.info['query_start_time'].pop()
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключение инструментации к движку"""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(sync_engine, 'handle_error', _handle_error)
@@ -0,0 +1,98 @@
+"""
+Пакетная загрузка связанных записей по ID (в стиле DataLoader)
+
+Все ID, запрошенные через load()/load_many() за один шаг цикла событий,
+загружаются одним запросом WHERE id IN (...). Результаты запоминаются
+до конца апдейта: загрузчики хранятся в текущей единице работы.
+
+    users = await get_loader(User).load_many(task.assignee_id for task in tasks)
+    assignee = users.get(task.assignee_id)
+
+Загрузчик выполняет запрос в сессии единицы работы, поэтому его нельзя
+запускать параллельно (asyncio.gather) с другими вызовами db.*.
+"""
+import asyncio
+import logging
+from typing import Dict, Generic, Iterable, List, Optional, Type
+
+from src.database.db import db, current_unit_of_work, ModelType
+
+logger = logging.getLogger(__name__)
+
+class EntityLoader(Generic[ModelType]):
+    """Загрузчик записей одной модели по ID с объединением запросов и памятью"""
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+        self._cache: Dict[int, Optional[ModelType]] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, id: Optional[int]) -> Optional[ModelType]:
+        """Запись по ID (None, если записи нет или ID пустой)"""
+        if id is None:
+            return None
+        if id in self._cache:
+            return self._cache[id]
+
+        future = self._pending.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[id] = future
+            if self._dispatch_task is None:
+                # Запрос уйдет на следующем шаге цикла, когда соберутся все ID
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return await future
+
+    async def load_many(self, ids: Iterable[Optional[int]]) -> Dict[int, ModelType]:
+        """Найденные записи по списку ID (пустые и отсутствующие ID пропускаются)"""
+        unique_ids = list(dict.fromkeys(id for id in ids if id is not None))
+        items = await asyncio.gather(*(self.load(id) for id in unique_ids))
+        return {id: item for id, item in zip(unique_ids, items) if item is not None}
+
+    def prime(self, item: ModelType) -> None:
+        """Запоминание уже загруженной записи"""
+        self._cache[item.id] = item
+
+    def clear(self, id: Optional[int] = None) -> None:
+        """Сброс запомненной записи (или всех записей)"""
+        if id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id, None)
+
+    async def _dispatch(self) -> None:
+        """Загрузка всех ожидающих ID одним запросом"""
+        pending, self._pending = self._pending, {}
+        self._dispatch_task = None
+        ids: List[int] = list(pending)
+        try:
+            items = await db.get_all(self.model, id=ids)
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {item.id: item for item in items}
+        for id, future in pending.items():
+            item = found.get(id)
+            self._cache[id] = item
+            if not future.done():
+                future.set_result(item)
+        logger.debug(f"Загружено {len(found)} из {len(ids)} записей {self.model.__name__} одним запросом")
+
+def get_loader(model: Type[ModelType]) -> EntityLoader[ModelType]:
+    """
+    Загрузчик модели для текущего апдейта
+
+    Вне единицы работы возвращается новый загрузчик без общей памяти.
+    """
+    uow = current_unit_of_work()
+    if uow is None:
+        return EntityLoader(model)
+    loader = uow.loaders.get(model)
+    if loader is None:
+        loader = uow.loaders[model] = EntityLoader(model)
+    return loader
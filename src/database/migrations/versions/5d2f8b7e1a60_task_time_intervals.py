@@ -0,0 +1,89 @@
+"""task_times intervals with timestamps and duration
+
+Revision ID: 5d2f8b7e1a60
+Revises: e52b9a7c3f14
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8b7e1a60'
+down_revision: Union[str, None] = 'e52b9a7c3f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_INDEX = 'ix_task_times_open_task_id'
+
+
+def upgrade() -> None:
+    # На пустой базе таблицу создаст init_db()
+    if not sa.inspect(op.get_bind()).has_table('task_times'):
+        return
+
+    # Новое значение нельзя использовать в этой же транзакции, ниже оно не нужно
+    op.execute("ALTER TYPE task_time_status ADD VALUE IF NOT EXISTS 'paused'")
+
+    op.add_column('task_times', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('task_times', sa.Column('ended_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('task_times', sa.Column('duration', sa.Integer(), nullable=True))
+
+    # Старые записи хранили местное время без даты окончания: интервал,
+    # закончившийся раньше начала, перешел через полночь. Закрытая запись
+    # без времени окончания не должна стать открытым интервалом.
+    op.execute("""
+        UPDATE task_times SET
+            started_at = work_date + start_time,
+            ended_at = CASE
+                WHEN end_time IS NOT NULL THEN work_date + end_time
+                    + CASE WHEN end_time < start_time THEN interval '1 day' ELSE interval '0' END
+                WHEN status <> 'started' THEN work_date + start_time
+            END
+    """)
+    # Прежний обработчик добавлял запись 'started' при каждом обновлении задачи
+    # в работе, а при завершении закрывал только последнюю. Открытым остается
+    # лишь последний интервал задачи в работе, остальные закрываются нулевыми.
+    op.execute("""
+        UPDATE task_times SET ended_at = started_at, status = 'completed'
+        WHERE ended_at IS NULL
+        AND id NOT IN (
+            SELECT max(tt.id) FROM task_times tt
+            JOIN tasks t ON t.id = tt.task_id
+            WHERE tt.ended_at IS NULL AND t.status = 'in_progress'
+            GROUP BY tt.task_id
+        )
+    """)
+    op.execute(
+        "UPDATE task_times SET duration = EXTRACT(EPOCH FROM ended_at - started_at)::int "
+        "WHERE ended_at IS NOT NULL"
+    )
+    op.alter_column('task_times', 'started_at', nullable=False)
+    op.drop_column('task_times', 'start_time')
+    op.drop_column('task_times', 'end_time')
+
+    op.create_index(
+        OPEN_INDEX,
+        'task_times',
+        ['task_id'],
+        postgresql_where=sa.text('ended_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table('task_times'):
+        return
+
+    op.drop_index(OPEN_INDEX, table_name='task_times', if_exists=True)
+    op.add_column('task_times', sa.Column('start_time', sa.Time(), nullable=True))
+    op.add_column('task_times', sa.Column('end_time', sa.Time(), nullable=True))
+    op.execute("UPDATE task_times SET start_time = started_at::time, end_time = ended_at::time")
+    op.alter_column('task_times', 'start_time', nullable=False)
+    # Значение enum удалить нельзя, паузы становятся завершенными интервалами
+    op.execute("UPDATE task_times SET status = 'completed' WHERE status = 'paused'")
+    op.drop_column('task_times', 'duration')
+    op.drop_column('task_times', 'ended_at')
+    op.drop_column('task_times', 'started_at')
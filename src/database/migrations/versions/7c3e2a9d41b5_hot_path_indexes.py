@@ -0,0 +1,58 @@
+"""hot path indexes
+
+Revision ID: 7c3e2a9d41b5
+Revises: 46a5b11d8819
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e2a9d41b5'
+down_revision: Union[str, None] = '46a5b11d8819'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_STATUSES = "status IN ('not_started', 'in_progress')"
+
+# (таблица, имя индекса, колонки, условие частичного индекса)
+INDEXES = [
+    ('tasks', 'ix_tasks_assignee_id_status', ['assignee_id', 'status'], None),
+    ('tasks', 'ix_tasks_client_id_status', ['client_id', 'status'], None),
+    ('tasks', 'ix_tasks_project_id_status', ['project_id', 'status'], None),
+    ('tasks', 'ix_tasks_created_at', ['created_at'], None),
+    ('tasks', 'ix_tasks_active_assignee_id', ['assignee_id'], ACTIVE_STATUSES),
+    ('task_times', 'ix_task_times_task_id_id', ['task_id', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    # Таблицы создаются init_db() при первом запуске приложения вместе с индексами,
+    # поэтому на пустой базе миграция ничего не делает
+    inspector = sa.inspect(op.get_bind())
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for table, name, columns, where in INDEXES:
+            if not inspector.has_table(table):
+                continue
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    with op.get_context().autocommit_block():
+        for table, name, columns, where in reversed(INDEXES):
+            if not inspector.has_table(table):
+                continue
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,75 @@
+"""tasks.completed_at for completion-day rollups
+
+Revision ID: 8b4e6c2d9f37
+Revises: 5d2f8b7e1a60
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b4e6c2d9f37'
+down_revision: Union[str, None] = '5d2f8b7e1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPLETED_INDEX = 'ix_tasks_completed_at'
+
+
+def upgrade() -> None:
+    # На пустой базе таблицы создаст init_db()
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tasks'):
+        return
+
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    # Момент завершения - конец завершающего интервала (в UTC, как created_at),
+    # без учета времени - последнее обновление задачи
+    if inspector.has_table('task_times'):
+        op.execute("""
+            UPDATE tasks t SET completed_at = tt.ended_at AT TIME ZONE 'UTC'
+            FROM (
+                SELECT task_id, max(ended_at) AS ended_at FROM task_times
+                WHERE status = 'completed' AND ended_at IS NOT NULL
+                GROUP BY task_id
+            ) tt
+            WHERE tt.task_id = t.id AND t.status = 'completed'
+        """)
+    op.execute(
+        "UPDATE tasks SET completed_at = updated_at "
+        "WHERE status = 'completed' AND completed_at IS NULL"
+    )
+
+    op.create_index(
+        COMPLETED_INDEX,
+        'tasks',
+        ['completed_at'],
+        postgresql_where=sa.text('completed_at IS NOT NULL')
+    )
+
+    # Завершенные задачи считались по дню начала интервала: сводки удаляются
+    # и пересчитываются при следующем запуске (до него итоги считаются по задачам)
+    _clear_rollups(inspector)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tasks'):
+        return
+
+    op.drop_index(COMPLETED_INDEX, table_name='tasks', if_exists=True)
+    op.drop_column('tasks', 'completed_at')
+    _clear_rollups(inspector)
+
+
+def _clear_rollups(inspector) -> None:
+    if inspector.has_table('work_reports'):
+        op.execute("DELETE FROM work_reports WHERE report_type = 'daily'")
+    for table in ('project_reports', 'client_reports'):
+        if inspector.has_table(table):
+            op.execute(f"DELETE FROM {table}")
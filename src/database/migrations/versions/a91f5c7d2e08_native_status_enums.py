@@ -0,0 +1,103 @@
+"""native status enums
+
+Revision ID: a91f5c7d2e08
+Revises: 7c3e2a9d41b5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91f5c7d2e08'
+down_revision: Union[str, None] = '7c3e2a9d41b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, колонка, тип enum, допустимые значения)
+ENUM_COLUMNS = [
+    ('tasks', 'status', 'task_status', ['not_started', 'in_progress', 'completed']),
+    ('task_times', 'status', 'task_time_status', ['started', 'completed']),
+    ('projects', 'status', 'project_status', ['active', 'completed']),
+    ('users', 'role', 'user_role', ['admin', 'user']),
+]
+
+# Частичный индекс ссылается на status в условии, при смене типа его нужно пересоздать
+PARTIAL_INDEX = 'ix_tasks_active_assignee_id'
+PARTIAL_INDEX_WHERE = "status IN ('not_started', 'in_progress')"
+
+
+def _check_values(table: str, column: str, values: list) -> None:
+    """Прерывает миграцию, если в колонке есть значения вне enum"""
+    rows = op.get_bind().execute(
+        sa.text(
+            f"SELECT DISTINCT {column} FROM {table} "
+            f"WHERE {column} IS NOT NULL AND {column} <> ALL(:values)"
+        ),
+        {'values': values}
+    ).scalars().all()
+    if rows:
+        raise RuntimeError(
+            f"В {table}.{column} есть значения вне enum: {', '.join(rows)}. "
+            f"Исправьте данные перед применением миграции."
+        )
+
+
+def upgrade() -> None:
+    # На пустой базе таблицы и типы создаст init_db()
+    inspector = sa.inspect(op.get_bind())
+    has_tasks = inspector.has_table('tasks')
+    if has_tasks:
+        op.drop_index(PARTIAL_INDEX, table_name='tasks', if_exists=True)
+
+    for table, column, enum_name, values in ENUM_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        _check_values(table, column, values)
+        enum_type = sa.Enum(*values, name=enum_name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            table,
+            column,
+            type_=enum_type,
+            existing_type=sa.String(50),
+            postgresql_using=f"{column}::{enum_name}"
+        )
+
+    if has_tasks:
+        op.create_index(
+            PARTIAL_INDEX,
+            'tasks',
+            ['assignee_id'],
+            postgresql_where=sa.text(PARTIAL_INDEX_WHERE)
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    has_tasks = inspector.has_table('tasks')
+    if has_tasks:
+        op.drop_index(PARTIAL_INDEX, table_name='tasks', if_exists=True)
+
+    for table, column, enum_name, values in reversed(ENUM_COLUMNS):
+        if not inspector.has_table(table):
+            continue
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(50),
+            existing_type=sa.Enum(*values, name=enum_name),
+            postgresql_using=f"{column}::text"
+        )
+        sa.Enum(*values, name=enum_name).drop(op.get_bind(), checkfirst=True)
+
+    if has_tasks:
+        op.create_index(
+            PARTIAL_INDEX,
+            'tasks',
+            ['assignee_id'],
+            postgresql_where=sa.text(PARTIAL_INDEX_WHERE)
+        )
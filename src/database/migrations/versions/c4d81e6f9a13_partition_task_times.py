@@ -0,0 +1,101 @@
+"""partition task_times by work_date
+
+Revision ID: c4d81e6f9a13
+Revises: a91f5c7d2e08
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81e6f9a13'
+down_revision: Union[str, None] = 'a91f5c7d2e08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, task_id, user_id, work_date, start_time, end_time, status, created_at"
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.execute(sa.text(
+        "SELECT relkind::text FROM pg_class WHERE relname = 'task_times' AND relnamespace = 'public'::regnamespace"
+    )).scalar_one_or_none() == 'p'
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # На пустой базе секционированную таблицу создаст init_db(), секции - обслуживание при запуске
+    if not sa.inspect(bind).has_table('task_times') or _is_partitioned(bind):
+        return
+
+    # Старая таблица переименовывается, ее индексы освобождают имена для новой
+    op.execute("ALTER TABLE task_times RENAME TO task_times_legacy")
+    op.execute("ALTER TABLE task_times_legacy RENAME CONSTRAINT task_times_pkey TO task_times_legacy_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_task_times_task_id_id")
+
+    op.execute("""
+        CREATE TABLE task_times (
+            id INTEGER NOT NULL DEFAULT nextval('task_times_id_seq'),
+            task_id INTEGER REFERENCES tasks (id),
+            user_id INTEGER REFERENCES users (id),
+            work_date DATE NOT NULL,
+            start_time TIME WITHOUT TIME ZONE NOT NULL,
+            end_time TIME WITHOUT TIME ZONE,
+            status task_time_status,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (id, work_date)
+        ) PARTITION BY RANGE (work_date)
+    """)
+    op.execute("ALTER SEQUENCE task_times_id_seq OWNED BY task_times.id")
+    op.execute("CREATE INDEX ix_task_times_task_id_id ON task_times (task_id, id)")
+    op.execute("CREATE TABLE task_times_default PARTITION OF task_times DEFAULT")
+
+    # Помесячные секции для имеющихся данных
+    months = bind.execute(sa.text(
+        "SELECT DISTINCT date_trunc('month', work_date)::date FROM task_times_legacy ORDER BY 1"
+    )).scalars().all()
+    for month in months:
+        op.execute(
+            f"CREATE TABLE task_times_p{month:%Y%m} PARTITION OF task_times "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        )
+
+    op.execute(f"INSERT INTO task_times ({COLUMNS}) SELECT {COLUMNS} FROM task_times_legacy")
+    op.execute("DROP TABLE task_times_legacy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('task_times') or not _is_partitioned(bind):
+        return
+
+    op.execute("ALTER TABLE task_times RENAME TO task_times_partitioned")
+    op.execute("ALTER TABLE task_times_partitioned RENAME CONSTRAINT task_times_pkey TO task_times_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_task_times_task_id_id")
+
+    op.execute("""
+        CREATE TABLE task_times (
+            id INTEGER NOT NULL DEFAULT nextval('task_times_id_seq') PRIMARY KEY,
+            task_id INTEGER REFERENCES tasks (id),
+            user_id INTEGER REFERENCES users (id),
+            work_date DATE NOT NULL,
+            start_time TIME WITHOUT TIME ZONE NOT NULL,
+            end_time TIME WITHOUT TIME ZONE,
+            status task_time_status,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("ALTER SEQUENCE task_times_id_seq OWNED BY task_times.id")
+    op.execute("CREATE INDEX ix_task_times_task_id_id ON task_times (task_id, id)")
+    op.execute(f"INSERT INTO task_times ({COLUMNS}) SELECT {COLUMNS} FROM task_times_partitioned")
+    # Секции удаляются вместе с родительской таблицей (отсоединенные архивные остаются)
+    op.execute("DROP TABLE task_times_partitioned")
@@ -0,0 +1,52 @@
+"""report rollups
+
+Revision ID: e52b9a7c3f14
+Revises: c4d81e6f9a13
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e52b9a7c3f14'
+down_revision: Union[str, None] = 'c4d81e6f9a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (таблица, колонка сущности, нужно ли добавить completed_tasks)
+REPORT_TABLES = [
+    ('work_reports', 'user_id', True),
+    ('project_reports', 'project_id', False),
+    ('client_reports', 'client_id', True),
+]
+
+
+def upgrade() -> None:
+    # На пустой базе таблицы создаст init_db()
+    inspector = sa.inspect(op.get_bind())
+    for table, entity_column, add_completed in REPORT_TABLES:
+        if not inspector.has_table(table):
+            continue
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if add_completed and 'completed_tasks' not in columns:
+            op.add_column(table, sa.Column('completed_tasks', sa.Integer(), nullable=True))
+        op.create_index(
+            f'ix_{table}_report_date_{entity_column}',
+            table,
+            ['report_date', entity_column],
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, entity_column, add_completed in reversed(REPORT_TABLES):
+        if not inspector.has_table(table):
+            continue
+        op.drop_index(f'ix_{table}_report_date_{entity_column}', table_name=table, if_exists=True)
+        if add_completed:
+            op.drop_column(table, 'completed_tasks')
@@ -2,8 +2,8 @@
 Модели для клиентов и проектов
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Enum
+from sqlalchemy.orm import relationship, validates
 
 from src.database.base import Base
 
@@ -32,13 +32,22 @@ class Client(Base):
 class Project(Base):
     __tablename__ = 'projects'
 
+    # Статусы проектов
+    STATUS_ACTIVE = 'active'
+    STATUS_COMPLETED = 'completed'
+
+    VALID_STATUSES = [
+        STATUS_ACTIVE,
+        STATUS_COMPLETED
+    ]
+
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     client_id = Column(Integer, ForeignKey('clients.id'))
     description = Column(Text)
     start_date = Column(Date)
     end_date = Column(Date)
-    status = Column(String(50), default='active')
+    status = Column(Enum(*VALID_STATUSES, name='project_status'), default=STATUS_ACTIVE)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -47,6 +56,13 @@ class Project(Base):
     tasks = relationship('Task', back_populates='project')
     reports = relationship('ProjectReport', back_populates='project')
 
+    @validates('status')
+    def validate_status(self, key, status):
+        """Проверка валидности статуса"""
+        if status not in self.VALID_STATUSES:
+            raise ValueError(f"Некорректный статус проекта: {status}")
+        return status
+
     def to_dict(self) -> dict:
         """
         Преобразование объекта в словарь
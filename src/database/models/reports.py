@@ -1,8 +1,11 @@
 """
 Модели для отчетов
+
+Таблицы заполняются ежедневными сводками (см. src/services/rollups.py):
+одна строка на сотрудника, проект или клиента за день.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 
 from src.database.base import Base
@@ -10,14 +13,22 @@ from src.database.base import Base
 class WorkReport(Base):
     __tablename__ = 'work_reports'
 
+    # Тип сводки за день; строка с user_id = NULL содержит итоги по всем задачам
+    REPORT_TYPE_DAILY = 'daily'
+
     id = Column(Integer, primary_key=True)
     report_date = Column(Date, nullable=False)
     user_id = Column(Integer, ForeignKey('users.id'))
     total_tasks = Column(Integer)
+    completed_tasks = Column(Integer)
     total_time = Column(Integer)  # в минутах
     report_type = Column(String(50))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_work_reports_report_date_user_id', 'report_date', 'user_id'),
+    )
+
     # Отношения
     user = relationship('User', back_populates='work_reports')
 
@@ -33,6 +44,10 @@ class ProjectReport(Base):
     milestone_status = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_project_reports_report_date_project_id', 'report_date', 'project_id'),
+    )
+
     # Отношения
     project = relationship('Project', back_populates='reports')
 
@@ -42,10 +57,15 @@ class ClientReport(Base):
     id = Column(Integer, primary_key=True)
     client_id = Column(Integer, ForeignKey('clients.id'))
     report_date = Column(Date, nullable=False)
-    total_projects = Column(Integer)
+    total_projects = Column(Integer)  # проектов, созданных за день
     total_tasks = Column(Integer)
+    completed_tasks = Column(Integer)
     total_time = Column(Integer)  # в минутах
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_client_reports_report_date_client_id', 'report_date', 'client_id'),
+    )
+
     # Отношения
     client = relationship('Client', back_populates='reports')
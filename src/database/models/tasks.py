@@ -2,7 +2,7 @@
 Модели для задач и учета времени
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Date, Time, ForeignKey, event
+from sqlalchemy import Column, Integer, String, Text, DateTime, Date, ForeignKey, Index, Enum
 from sqlalchemy.orm import relationship, validates
 
 from src.database.db import Base
@@ -21,10 +21,17 @@ class Task(Base):
         STATUS_COMPLETED
     ]
 
+    # Статусы активных задач (для частичных индексов)
+    ACTIVE_STATUSES = [
+        STATUS_NOT_STARTED,
+        STATUS_IN_PROGRESS
+    ]
+
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    status = Column(String(50), default=STATUS_NOT_STARTED)
+    # Нативный enum PostgreSQL: 4 байта на строку вместо varchar, в Python - строки
+    status = Column(Enum(*VALID_STATUSES, name='task_status'), default=STATUS_NOT_STARTED)
     creator_id = Column(Integer, ForeignKey('users.id'))
     assignee_id = Column(Integer, ForeignKey('users.id'))
     client_id = Column(Integer, ForeignKey('clients.id'))
@@ -32,6 +39,7 @@ class Task(Base):
     due_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime)  # момент завершения (UTC), по нему сводки считают завершенные задачи
 
     # Отношения
     creator = relationship('User', back_populates='tasks_created', foreign_keys=[creator_id])
@@ -40,6 +48,20 @@ class Task(Base):
     project = relationship('Project', back_populates='tasks')
     times = relationship('TaskTime', back_populates='task')
 
+    __table_args__ = (
+        Index('ix_tasks_assignee_id_status', 'assignee_id', 'status'),
+        Index('ix_tasks_client_id_status', 'client_id', 'status'),
+        Index('ix_tasks_project_id_status', 'project_id', 'status'),
+        Index('ix_tasks_created_at', 'created_at'),
+        Index('ix_tasks_completed_at', 'completed_at', postgresql_where=completed_at.isnot(None)),
+        # Частичный индекс по активным задачам исполнителя
+        Index(
+            'ix_tasks_active_assignee_id',
+            'assignee_id',
+            postgresql_where=status.in_(ACTIVE_STATUSES)
+        ),
+    )
+
     @validates('status')
     def validate_status(self, key, status):
         """Проверка валидности статуса"""
@@ -78,55 +100,55 @@ class Task(Base):
         if not self.can_be_completed:
             raise ValueError("Невозможно завершить задачу в текущем статусе")
         self.status = self.STATUS_COMPLETED
+        self.completed_at = datetime.utcnow()
 
 class TaskTime(Base):
+    """
+    Интервал учета времени по задаче.
+
+    Открытый интервал (ended_at IS NULL) один на задачу; интервалы открывает
+    и закрывает src/services/time_tracking.py. Длительность в секундах
+    записывается при закрытии, отчеты суммируют ее напрямую.
+
+    Таблица секционирована по work_date помесячно (см. src/database/partitions.py),
+    поэтому первичный ключ составной: (id, work_date).
+    """
     __tablename__ = 'task_times'
 
-    id = Column(Integer, primary_key=True)
+    # Статусы записей учета времени
+    STATUS_STARTED = 'started'
+    STATUS_PAUSED = 'paused'
+    STATUS_COMPLETED = 'completed'
+
+    VALID_STATUSES = [
+        STATUS_STARTED,
+        STATUS_COMPLETED,
+        STATUS_PAUSED
+    ]
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
     task_id = Column(Integer, ForeignKey('tasks.id'))
     user_id = Column(Integer, ForeignKey('users.id'))
-    work_date = Column(Date, nullable=False)
-    start_time = Column(Time, nullable=False)
-    end_time = Column(Time)
-    status = Column(String(50))
+    # Рабочий день начала интервала (по местному времени)
+    work_date = Column(Date, primary_key=True, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    ended_at = Column(DateTime(timezone=True))
+    duration = Column(Integer)  # в секундах, заполняется при закрытии интервала
+    status = Column(Enum(*VALID_STATUSES, name='task_time_status'))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Отношения
     task = relationship('Task', back_populates='times')
     user = relationship('User', back_populates='work_times')
 
-# События SQLAlchemy для автоматического создания записи TaskTime
-@event.listens_for(Task, 'after_update')
-def task_status_changed(mapper, connection, target):
-    """Создание записи TaskTime при изменении статуса задачи"""
-    if target.status == Task.STATUS_IN_PROGRESS:
-        # Создаем запись о начале работы
-        now = datetime.now()
-        connection.execute(
-            TaskTime.__table__.insert().values(
-                task_id=target.id,
-                user_id=target.assignee_id,
-                work_date=now.date(),
-                start_time=now.time(),
-                status='started'
-            )
-        )
-    elif target.status == Task.STATUS_COMPLETED:
-        # Завершаем последнюю запись о работе
-        now = datetime.now()
-        latest_time = connection.execute(
-            TaskTime.__table__.select()
-            .where(TaskTime.task_id == target.id)
-            .order_by(TaskTime.id.desc())
-            .limit(1)
-        ).first()
-        
-        if latest_time and not latest_time.end_time:
-            connection.execute(
-                TaskTime.__table__.update()
-                .where(TaskTime.id == latest_time.id)
-                .values(
-                    end_time=now.time(),
-                    status='completed'
-                )
-            )
\ No newline at end of file
+    __table_args__ = (
+        # Последняя запись по задаче: WHERE task_id = ? ORDER BY id DESC
+        Index('ix_task_times_task_id_id', 'task_id', 'id'),
+        # Открытые интервалы: закрытие одним UPDATE ... WHERE task_id = ? AND ended_at IS NULL
+        Index(
+            'ix_task_times_open_task_id',
+            'task_id',
+            postgresql_where=ended_at.is_(None)
+        ),
+        {'postgresql_partition_by': 'RANGE (work_date)'}
+    )
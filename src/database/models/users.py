@@ -2,19 +2,28 @@
 Модели для пользователей и команд
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Enum
+from sqlalchemy.orm import relationship, validates
 
 from src.database.db import Base
 
 class User(Base):
     __tablename__ = 'users'
 
+    # Роли пользователей
+    ROLE_ADMIN = 'admin'
+    ROLE_USER = 'user'
+
+    VALID_ROLES = [
+        ROLE_ADMIN,
+        ROLE_USER
+    ]
+
     id = Column(Integer, primary_key=True)
     telegram_id = Column(BigInteger, unique=True, nullable=True)  # nullable для временных записей
     username = Column(String(255), nullable=True)  # Можно создать пользователя без username
     full_name = Column(String(255), nullable=True)  # Можно создать пользователя без полного имени
-    role = Column(String(50), default='user')
+    role = Column(Enum(*VALID_ROLES, name='user_role'), default=ROLE_USER)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Отношения
@@ -23,6 +32,13 @@ class User(Base):
     work_times = relationship('TaskTime', back_populates='user')
     work_reports = relationship('WorkReport', back_populates='user')
 
+    @validates('role')
+    def validate_role(self, key, role):
+        """Проверка валидности роли"""
+        if role not in self.VALID_ROLES:
+            raise ValueError(f"Некорректная роль пользователя: {role}")
+        return role
+
     def to_dict(self) -> dict:
         """
         Преобразование объекта в словарь
@@ -0,0 +1,169 @@
+"""
+Обслуживание помесячных секций таблицы task_times
+
+Секции называются task_times_pYYYYMM и покрывают один календарный месяц
+по work_date. Строки вне созданных секций попадают в секцию по умолчанию
+task_times_default и переносятся в месячную секцию при ее создании.
+Секции старше срока хранения отсоединяются (DETACH) и остаются
+в базе отдельными архивными таблицами.
+"""
+import logging
+import re
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import get_config
+from src.database.db import engine
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+PARTITIONED_TABLE = 'task_times'
+DEFAULT_PARTITION = f'{PARTITIONED_TABLE}_default'
+_PARTITION_NAME_RE = re.compile(rf'^{PARTITIONED_TABLE}_p(\d{{4}})(\d{{2}})$')
+
+def month_start(day: date) -> date:
+    """Первый день месяца"""
+    return day.replace(day=1)
+
+def add_months(month: date, months: int) -> date:
+    """Первый день месяца, отстоящего на months месяцев"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def retention_cutoff(today: date, retention_months: int) -> Optional[date]:
+    """Начало первого месяца в пределах срока хранения (None - хранить все)"""
+    if retention_months <= 0:
+        return None
+    return add_months(month_start(today), -retention_months)
+
+def partition_name(month: date) -> str:
+    """Имя секции месяца"""
+    return f'{PARTITIONED_TABLE}_p{month:%Y%m}'
+
+def partition_month(name: str) -> Optional[date]:
+    """Месяц секции по ее имени (None для секции по умолчанию и посторонних таблиц)"""
+    match = _PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Проверка, что task_times уже секционирована (после миграции)"""
+    result = await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE relname = :name AND relnamespace = 'public'::regnamespace"),
+        {'name': PARTITIONED_TABLE}
+    )
+    return result.scalar_one_or_none() == 'p'
+
+async def attached_partitions(conn: AsyncConnection) -> List[str]:
+    """Имена секций, присоединенных к task_times"""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :name"
+        ),
+        {'name': PARTITIONED_TABLE}
+    )
+    return list(result.scalars().all())
+
+async def create_month_partition(conn: AsyncConnection, month: date) -> None:
+    """
+    Создание секции месяца с переносом его строк из секции по умолчанию.
+
+    Секция создается отдельной таблицей и присоединяется через ATTACH PARTITION:
+    PostgreSQL не позволяет создать секцию, пока подходящие строки лежат в DEFAULT.
+    """
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    await conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await conn.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE work_date >= :start AND work_date < :end RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {'start': start, 'end': end}
+    )
+    await conn.execute(text(
+        f"ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info(f"Создана секция {name}")
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    today: date,
+    months_ahead: int,
+    retention_months: int = 0
+) -> None:
+    """
+    Секция по умолчанию, секции текущего и следующих месяцев и месяцев из DEFAULT
+
+    Месяцы за пределами срока хранения пропускаются: их секции уже отсоединены.
+    """
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT"
+    ))
+
+    attached = set(await attached_partitions(conn))
+    current = month_start(today)
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+
+    # Месяцы, строки которых попали в секцию по умолчанию
+    result = await conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', work_date)::date FROM {DEFAULT_PARTITION}"
+    ))
+    months.update(result.scalars().all())
+
+    cutoff = retention_cutoff(today, retention_months)
+    for month in sorted(months):
+        if cutoff is not None and add_months(month, 1) <= cutoff:
+            continue
+        if partition_name(month) not in attached:
+            await create_month_partition(conn, month)
+
+async def detach_old_partitions(conn: AsyncConnection, today: date, retention_months: int) -> List[str]:
+    """Отсоединение секций, целиком лежащих за пределами срока хранения"""
+    cutoff = retention_cutoff(today, retention_months)
+    if cutoff is None:
+        return []
+
+    detached = []
+    for name in await attached_partitions(conn):
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            await conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+            logger.info(f"Секция {name} отсоединена (срок хранения {retention_months} мес.)")
+    return detached
+
+async def run_partition_maintenance(today: Optional[date] = None) -> None:
+    """Создание будущих и отсоединение устаревших секций task_times"""
+    today = today or date.today()
+    try:
+        async with engine.begin() as conn:
+            if not await is_partitioned(conn):
+                logger.warning(
+                    f"Таблица {PARTITIONED_TABLE} не секционирована, обслуживание секций пропущено "
+                    f"(примените миграции: alembic upgrade head)"
+                )
+                return
+            await ensure_partitions(
+                conn,
+                today,
+                config.task_times_partitions_ahead,
+                config.task_times_retention_months
+            )
+            await detach_old_partitions(conn, today, config.task_times_retention_months)
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при обслуживании секций {PARTITIONED_TABLE}: {e}", exc_info=True)
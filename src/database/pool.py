@@ -0,0 +1,72 @@
+"""
+Инструментированный пул соединений для асинхронного движка
+"""
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Границы корзин гистограммы времени выдачи соединения (мс)
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+class PoolStats:
+    """Накопительная статистика выдачи соединений из пула"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.histogram: List[int] = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Учет одной выдачи соединения"""
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self.histogram[bisect_left(CHECKOUT_BUCKETS_MS, seconds * 1000)] += 1
+
+    def histogram_dict(self) -> Dict[str, int]:
+        """Гистограмма в виде словаря {"<=5ms": n, ...}"""
+        labels = [f"<={bound}ms" for bound in CHECKOUT_BUCKETS_MS]
+        labels.append(f">{CHECKOUT_BUCKETS_MS[-1]}ms")
+        return dict(zip(labels, self.histogram))
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, измеряющий время выдачи соединения.
+
+    Время включает ожидание свободного соединения, pre-ping
+    и открытие нового соединения при переполнении.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Текущее состояние пула и накопленная статистика"""
+        stats = self.stats
+        return {
+            'pool_size': self.size(),
+            'checked_out': self.checkedout(),
+            'checked_in': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            'checkouts': stats.checkouts,
+            'timeouts': stats.timeouts,
+            'avg_wait_ms': round(stats.total_wait / stats.checkouts * 1000, 2) if stats.checkouts else 0.0,
+            'max_wait_ms': round(stats.max_wait * 1000, 2),
+            'checkout_histogram': stats.histogram_dict()
+        }
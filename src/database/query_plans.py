@@ -0,0 +1,205 @@
+"""
+Проверка планов горячих запросов (EXPLAIN) на локальной PostgreSQL
+
+Запуск: python -m src.database.query_plans
+
+Скрипт наполняет таблицы тестовыми данными внутри транзакции, обновляет
+статистику (ANALYZE), получает планы запросов и завершается с ошибкой,
+если хотя бы один запрос читает таблицу последовательным сканированием.
+В конце транзакция откатывается, данные в базе не меняются.
+"""
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.database.db import engine
+from src.database.models import User, Task, TaskTime, Client, Project
+from src.database.models.invitations import Invitation
+
+logger = logging.getLogger(__name__)
+
+# Объем тестовых данных
+SEED_USERS = 50
+SEED_CLIENTS = 20
+SEED_PROJECTS_PER_CLIENT = 5
+SEED_TASKS = 20000
+SEED_TIMES_PER_TASK = 2
+SEED_INVITATIONS = 2000
+
+# Период, на который равномерно распределяются задачи (дни)
+SEED_PERIOD_DAYS = 730
+
+def _hot_queries(ids: Dict[str, int], now: datetime) -> List[Tuple[str, Any]]:
+    """Горячие запросы приложения в том виде, в котором их строит код"""
+    return [
+        (
+            "Активные задачи исполнителя (get_tasks_with_relations)",
+            select(Task)
+            .where(Task.assignee_id == ids['user_id'])
+            .where(Task.status.in_(Task.ACTIVE_STATUSES))
+        ),
+        (
+            "Задачи исполнителя по статусу",
+            select(Task)
+            .where(Task.assignee_id == ids['user_id'])
+            .where(Task.status == Task.STATUS_COMPLETED)
+        ),
+        (
+            "Задачи клиента по статусу",
+            select(Task)
+            .where(Task.client_id == ids['client_id'])
+            .where(Task.status.in_(Task.ACTIVE_STATUSES))
+        ),
+        (
+            "Задачи проекта по статусу",
+            select(Task)
+            .where(Task.project_id == ids['project_id'])
+            .where(Task.status.in_(Task.ACTIVE_STATUSES))
+        ),
+        (
+            "Задачи за период (ExcelReportGenerator)",
+            select(Task)
+            .where(Task.created_at >= now - timedelta(days=7))
+            .where(Task.created_at <= now)
+        ),
+        (
+            "Открытый интервал задачи (time_tracking)",
+            select(TaskTime)
+            .where(TaskTime.task_id == ids['task_id'])
+            .where(TaskTime.ended_at.is_(None))
+        ),
+        (
+            "Поиск инвайт-кода",
+            select(Invitation).where(Invitation.code == 'Q00001')
+        ),
+    ]
+
+def _scans(plan: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Обход дерева плана: (тип узла, таблица)"""
+    yield plan.get('Node Type', ''), plan.get('Relation Name', '')
+    for child in plan.get('Plans', []):
+        yield from _scans(child)
+
+async def _seed(conn: AsyncConnection, now: datetime) -> Dict[str, int]:
+    """Наполнение таблиц тестовыми данными"""
+    async def insert_rows(model: Any, rows: List[Dict[str, Any]]) -> List[int]:
+        result = await conn.execute(insert(model).returning(model.id), rows)
+        return list(result.scalars().all())
+
+    user_ids = await insert_rows(User, [
+        {'telegram_id': -(i + 1), 'full_name': f"Plan check {i}", 'role': 'user'}
+        for i in range(SEED_USERS)
+    ])
+    client_ids = await insert_rows(Client, [
+        {'name': f"Plan check {i}"} for i in range(SEED_CLIENTS)
+    ])
+    project_rows = [
+        {'name': f"Plan check {i}", 'client_id': client_id, 'status': 'active'}
+        for client_id in client_ids
+        for i in range(SEED_PROJECTS_PER_CLIENT)
+    ]
+    project_ids = await insert_rows(Project, project_rows)
+
+    statuses = Task.VALID_STATUSES
+    task_rows = []
+    for i in range(SEED_TASKS):
+        project_index = i % len(project_ids)
+        created_at = now - timedelta(minutes=i * SEED_PERIOD_DAYS * 24 * 60 // SEED_TASKS)
+        task_rows.append({
+            'title': f"Plan check {i}",
+            'status': statuses[i % len(statuses)],
+            'creator_id': user_ids[0],
+            'assignee_id': user_ids[i % len(user_ids)],
+            'client_id': project_rows[project_index]['client_id'],
+            'project_id': project_ids[project_index],
+            'due_date': created_at + timedelta(days=7),
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+    task_ids = await insert_rows(Task, task_rows)
+
+    await insert_rows(TaskTime, [
+        {
+            'task_id': task_id,
+            'user_id': task_rows[i]['assignee_id'],
+            'work_date': task_rows[i]['created_at'].date(),
+            'started_at': task_rows[i]['created_at'].replace(tzinfo=timezone.utc),
+            'ended_at': task_rows[i]['created_at'].replace(tzinfo=timezone.utc) + timedelta(hours=1),
+            'duration': 3600,
+            'status': 'completed'
+        }
+        for i, task_id in enumerate(task_ids)
+        for _ in range(SEED_TIMES_PER_TASK)
+    ])
+    await insert_rows(Invitation, [
+        {'code': f"Q{i:05d}", 'expires_at': now + timedelta(days=1)}
+        for i in range(SEED_INVITATIONS)
+    ])
+
+    for model in (User, Client, Project, Task, TaskTime, Invitation):
+        await conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+    return {
+        'user_id': user_ids[1],
+        'client_id': client_ids[1],
+        'project_id': project_ids[1],
+        'task_id': task_ids[len(task_ids) // 2]
+    }
+
+async def check_query_plans() -> List[str]:
+    """
+    Проверка планов горячих запросов
+
+    Returns:
+        List[str]: Описания запросов, использующих последовательное сканирование
+    """
+    failures = []
+    now = datetime.utcnow()
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            ids = await _seed(conn, now)
+            for name, stmt in _hot_queries(ids, now):
+                sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                seq_scans = [table for node, table in _scans(plan[0]['Plan']) if node == 'Seq Scan']
+                if seq_scans:
+                    # Пустые секции планировщик сканирует целиком, это не ошибка
+                    result = await conn.execute(
+                        text("SELECT relname FROM pg_class WHERE relname = ANY(:names) AND reltuples > 0"),
+                        {'names': seq_scans}
+                    )
+                    non_empty = set(result.scalars().all())
+                    seq_scans = [table for table in seq_scans if table in non_empty]
+                if seq_scans:
+                    failures.append(f"{name}: Seq Scan по {', '.join(seq_scans)}")
+                    logger.error(f"❌ {name}: Seq Scan по {', '.join(seq_scans)}\n{sql}")
+                else:
+                    logger.info(f"✅ {name}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+    return failures
+
+def main() -> int:
+    """Точка входа скрипта проверки планов"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    failures = asyncio.run(check_query_plans())
+    if failures:
+        logger.error(f"Запросов с последовательным сканированием: {len(failures)}")
+        return 1
+    logger.info("Все горячие запросы используют индексы")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
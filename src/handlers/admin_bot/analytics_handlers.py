@@ -9,38 +9,77 @@ from telegram.ext import (
     ContextTypes
 )
 
-from src.database.db import db
+from sqlalchemy import select, func, extract
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database.db import get_read_session
 from src.database.models import Task, User, Client, Project
 from .keyboards import get_tasks_keyboard  # Исправили имя импортируемой функции
 
 logger = logging.getLogger(__name__)
 
+def _count_where(condition):
+    """COUNT(*) FILTER (WHERE condition)"""
+    return func.count().filter(condition)
+
+async def get_analytics_summary(now: datetime) -> dict:
+    """Общая статистика одним агрегирующим запросом"""
+    def total(model, *conditions):
+        return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+
+    stmt = select(
+        func.count().label('total_tasks'),
+        _count_where(Task.status == Task.STATUS_COMPLETED).label('completed_tasks'),
+        _count_where(Task.status == Task.STATUS_IN_PROGRESS).label('in_progress_tasks'),
+        _count_where(Task.status == Task.STATUS_NOT_STARTED).label('not_started_tasks'),
+        _count_where(
+            (Task.due_date < now) & (Task.status != Task.STATUS_COMPLETED)
+        ).label('overdue_tasks'),
+        func.count(Task.assignee_id.distinct()).label('users_with_tasks'),
+        total(User).label('total_users'),
+        total(Client).label('total_clients'),
+        total(Project).label('total_projects'),
+        total(Project, Project.status == Project.STATUS_ACTIVE).label('active_projects'),
+    ).select_from(Task)
+
+    async with get_read_session() as session:
+        try:
+            result = await session.execute(stmt)
+            return dict(result.one()._mapping)
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при расчете общей статистики: {e}", exc_info=True)
+            raise
+
+async def get_task_stats_summary(since: datetime) -> dict:
+    """Статистика по задачам за период и среднее время выполнения одним запросом"""
+    is_recent = Task.created_at >= since
+    is_completed = Task.status == Task.STATUS_COMPLETED
+    stmt = select(
+        _count_where(is_recent).label('recent_tasks'),
+        _count_where(is_recent & is_completed).label('completed_recent'),
+        # В днях с дробной частью; задачи без completed_at в среднее не входят
+        func.avg(extract('epoch', Task.completed_at - Task.created_at) / 86400).filter(is_completed).label('avg_completion_time'),
+    )
+
+    async with get_read_session() as session:
+        try:
+            result = await session.execute(stmt)
+            return dict(result.one()._mapping)
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при расчете статистики задач: {e}", exc_info=True)
+            raise
+
+def _percent(part: int, whole: int) -> float:
+    """Доля в процентах (0 при пустом множестве)"""
+    return part / whole * 100 if whole else 0.0
+
 async def analytics_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обработчик команды /analytics - показывает общую статистику"""
     try:
-        # Получаем все задачи
-        tasks = db.get_all(Task)
-        users = db.get_all(User)
-        clients = db.get_all(Client)
-        projects = db.get_all(Project)
-
-        # Расчет статистики по задачам
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == 'completed'])
-        in_progress_tasks = len([t for t in tasks if t.status == 'in_progress'])
-        not_started_tasks = len([t for t in tasks if t.status == 'not_started'])
-
-        # Статистика по срокам
-        overdue_tasks = len([t for t in tasks if t.due_date and t.due_date < datetime.now() and t.status != 'completed'])
-        
-        # Статистика по пользователям
-        total_users = len(users)
-        users_with_tasks = len(set(task.assignee_id for task in tasks if task.assignee_id))
-        
-        # Статистика по клиентам и проектам
-        total_clients = len(clients)
-        total_projects = len(projects)
-        active_projects = len([p for p in projects if p.status == 'active'])
+        stats = await get_analytics_summary(datetime.now())
+        total_tasks = stats['total_tasks']
+        completed_tasks = stats['completed_tasks']
+        users_with_tasks = stats['users_with_tasks']
 
         # Формируем сообщение
         analytics_text = (
@@ -49,22 +88,22 @@ async def analytics_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             "*Задачи:*\n"
             f"• Всего: {total_tasks}\n"
             f"• Завершено: {completed_tasks}\n"
-            f"• В работе: {in_progress_tasks}\n"
-            f"• Не начато: {not_started_tasks}\n"
-            f"• Просрочено: {overdue_tasks}\n\n"
+            f"• В работе: {stats['in_progress_tasks']}\n"
+            f"• Не начато: {stats['not_started_tasks']}\n"
+            f"• Просрочено: {stats['overdue_tasks']}\n\n"
             
             "*Пользователи:*\n"
-            f"• Всего пользователей: {total_users}\n"
+            f"• Всего пользователей: {stats['total_users']}\n"
             f"• С активными задачами: {users_with_tasks}\n\n"
             
             "*Клиенты и проекты:*\n"
-            f"• Клиентов: {total_clients}\n"
-            f"• Всего проектов: {total_projects}\n"
-            f"• Активных проектов: {active_projects}\n\n"
+            f"• Клиентов: {stats['total_clients']}\n"
+            f"• Всего проектов: {stats['total_projects']}\n"
+            f"• Активных проектов: {stats['active_projects']}\n\n"
             
             "*Эффективность:*\n"
-            f"• Процент выполнения: {(completed_tasks/total_tasks*100):.1f}%\n"
-            f"• Средняя нагрузка: {(total_tasks/users_with_tasks):.1f} задач/человек\n"
+            f"• Процент выполнения: {_percent(completed_tasks, total_tasks):.1f}%\n"
+            f"• Средняя нагрузка: {(total_tasks / users_with_tasks if users_with_tasks else 0):.1f} задач/человек\n"
         ).replace(".", "\\.")  # Экранируем точки для MarkdownV2
 
         # Получаем клавиатуру для фильтрации задач
@@ -85,28 +124,18 @@ async def analytics_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def task_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обработчик команды /task_stats - показывает статистику по задачам"""
     try:
-        now = datetime.now()
-        last_month = now - timedelta(days=30)
-        tasks = db.get_all(Task)
-
-        # Статистика по последнему месяцу
-        recent_tasks = [t for t in tasks if t.created_at >= last_month]
-        completed_recent = len([t for t in recent_tasks if t.status == 'completed'])
-        
-        # Среднее время выполнения
-        completed_tasks = [t for t in tasks if t.status == 'completed']
-        avg_completion_time = 0
-        if completed_tasks:
-            completion_times = [(t.updated_at - t.created_at).days for t in completed_tasks]
-            avg_completion_time = sum(completion_times) / len(completion_times)
+        stats = await get_task_stats_summary(datetime.now() - timedelta(days=30))
+        recent_tasks = stats['recent_tasks']
+        completed_recent = stats['completed_recent']
+        avg_completion_time = float(stats['avg_completion_time'] or 0)
 
         stats_text = (
             "📈 *Статистика по задачам*\n\n"
             
             "*За последние 30 дней:*\n"
-            f"• Новых задач: {len(recent_tasks)}\n"
+            f"• Новых задач: {recent_tasks}\n"
             f"• Завершено: {completed_recent}\n"
-            f"• Эффективность: {(completed_recent/len(recent_tasks)*100):.1f}%\n\n"
+            f"• Эффективность: {_percent(completed_recent, recent_tasks):.1f}%\n\n"
             
             "*Общая статистика:*\n"
             f"• Среднее время выполнения: {avg_completion_time:.1f} дней\n"
@@ -2,7 +2,7 @@ from telegram import Update, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 
 from src.database.db import db
-from src.database.models import Client, User, Project
+from src.database.models import Client, Project
 
 from .constants import (
     WELCOME_MESSAGE,
@@ -19,6 +19,9 @@ from .constants import (
     EMPLOYEES_MENU_MESSAGE,
     REPORTS_MENU_MESSAGE
 )
+from .callbacks.clients import get_clients_page
+from .callbacks.projects import get_projects_page
+from .callbacks.employees import get_employees_page
 from .keyboards import (
     get_admin_keyboard,
     get_tasks_keyboard,
@@ -57,29 +60,28 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             )
         
         elif text == BUTTON_CLIENTS:
-            # Получаем реальных клиентов из БД
-            clients = await db.get_all(Client)
-            msg = f"{CLIENTS_MENU_MESSAGE}\nВсего клиентов: {len(clients)}"
-            keyboard = await get_clients_keyboard(clients)
+            # Первая страница клиентов и общее количество
+            total = await db.count(Client)
+            msg = f"{CLIENTS_MENU_MESSAGE}\nВсего клиентов: {total}"
+            keyboard = await get_clients_keyboard(await get_clients_page())
             await update.message.reply_text(
                 msg,
                 reply_markup=keyboard
             )
         
         elif text == BUTTON_PROJECTS:
-            # Получаем реальные проекты из БД
-            projects = await db.get_all(Project)
-            msg = f"{PROJECTS_MENU_MESSAGE} {len(projects)}"
-            keyboard = await get_projects_keyboard(projects)
+            # Первая страница проектов и общее количество
+            total = await db.count(Project)
+            msg = f"{PROJECTS_MENU_MESSAGE} {total}"
+            keyboard = await get_projects_keyboard(await get_projects_page())
             await update.message.reply_text(
                 msg,
                 reply_markup=keyboard
             )
         
         elif text == BUTTON_EMPLOYEES:
-            # Получаем реальных сотрудников из БД
-            employees = await db.get_all(User)
-            keyboard = await get_employees_keyboard(employees)
+            # Первая страница сотрудников
+            keyboard = await get_employees_keyboard(await get_employees_page())
             await update.message.reply_text(
                 EMPLOYEES_MENU_MESSAGE,
                 reply_markup=keyboard
@@ -18,8 +18,15 @@ from .base_handlers import (
 from src.middleware.auth import (
     handle_master_key_input, 
     handle_master_key_button,
+    get_auth_stage_handler,
     ENTER_MASTER_KEY,
-    CALLBACK_ENTER_MASTER_KEY
+    CALLBACK_ENTER_MASTER_KEY,
+    AUTH_STAGE_GROUP
+)
+from .callbacks import (
+    handle_clients_page_callback,
+    handle_projects_page_callback,
+    handle_employees_page_callback
 )
 from .callback_handlers import (
     handle_tasks_callback,
@@ -48,6 +55,13 @@ from .constants import (
     CALLBACK_PROJECT_PREFIX,
     CALLBACK_EMPLOYEE_PREFIX,
     CALLBACK_EMPLOYEE_ADD,
+    # Навигация по страницам списков
+    CALLBACK_CLIENTS_PAGE_NEXT,
+    CALLBACK_CLIENTS_PAGE_PREV,
+    CALLBACK_PROJECTS_PAGE_NEXT,
+    CALLBACK_PROJECTS_PAGE_PREV,
+    CALLBACK_EMPLOYEES_PAGE_NEXT,
+    CALLBACK_EMPLOYEES_PAGE_PREV,
     # Отчеты
     CALLBACK_REPORT_WEEK,
     CALLBACK_REPORT_MONTH,
@@ -55,6 +69,8 @@ from .constants import (
     CALLBACK_REPORT_YEAR
 )
 from src.utils.decorators import require_auth
+from src.utils.error_handlers import common_error_handler
+from src.middleware.unit_of_work import UnitOfWorkApplication
 from src.handlers.task_create import new_task_conversation
 
 def setup_admin_bot(application: Application) -> None:
@@ -64,6 +80,9 @@ def setup_admin_bot(application: Application) -> None:
     Args:
         application: Объект приложения telegram.ext.Application
     """
+    # Аутентификация апдейта один раз до всех обработчиков
+    application.add_handler(get_auth_stage_handler(), group=AUTH_STAGE_GROUP)
+
     # Добавляем обработчик для ввода мастер-ключа
     application.add_handler(ConversationHandler(
         entry_points=[
@@ -159,6 +178,20 @@ def setup_admin_bot(application: Application) -> None:
         pattern=f"^({CALLBACK_EMPLOYEE_PREFIX}[0-9]+|{CALLBACK_EMPLOYEE_ADD})$"
     ))
 
+    # Навигация по страницам списков
+    application.add_handler(CallbackQueryHandler(
+        require_auth(bot_type='admin')(handle_clients_page_callback),
+        pattern=rf"^({CALLBACK_CLIENTS_PAGE_NEXT}|{CALLBACK_CLIENTS_PAGE_PREV})[0-9]+$"
+    ))
+    application.add_handler(CallbackQueryHandler(
+        require_auth(bot_type='admin')(handle_projects_page_callback),
+        pattern=rf"^({CALLBACK_PROJECTS_PAGE_NEXT}|{CALLBACK_PROJECTS_PAGE_PREV})[0-9]+$"
+    ))
+    application.add_handler(CallbackQueryHandler(
+        require_auth(bot_type='admin')(handle_employees_page_callback),
+        pattern=rf"^({CALLBACK_EMPLOYEES_PAGE_NEXT}|{CALLBACK_EMPLOYEES_PAGE_PREV})[0-9]+$"
+    ))
+
     # Отчеты
     application.add_handler(CallbackQueryHandler(
         require_auth(bot_type='admin')(handle_reports_callback),
@@ -171,6 +204,9 @@ def setup_admin_bot(application: Application) -> None:
         require_auth(bot_type='admin')(handle_unknown)
     ))
 
+    # Обработчик ошибок, в том числе ошибок фиксации транзакции апдейта
+    application.add_error_handler(common_error_handler)
+
 class AdminBot:
     """Класс для управления админским ботом"""
 
@@ -181,5 +217,10 @@ class AdminBot:
         Args:
             token (str): Токен бота от BotFather
         """
-        self.application = Application.builder().token(token).build()
+        self.application = (
+            Application.builder()
+            .token(token)
+            .application_class(UnitOfWorkApplication)
+            .build()
+        )
         setup_admin_bot(self.application)
@@ -6,15 +6,17 @@
 from .tasks import handle_tasks_callback
 from .clients import (
     handle_clients_callback,
+    handle_clients_page_callback,
     handle_client_name_input,
     ENTER_CLIENT_NAME
 )
 from .projects import (
     handle_projects_callback,
+    handle_projects_page_callback,
     handle_project_name_input,
     ENTER_PROJECT_NAME
 )
-from .employees import handle_employees_callback
+from .employees import handle_employees_callback, handle_employees_page_callback
 from .reports import handle_reports_callback
 from .utils import format_tasks_list, sort_tasks
 
@@ -24,16 +26,19 @@ __all__ = [
     
     # Client handlers
     'handle_clients_callback',
+    'handle_clients_page_callback',
     'handle_client_name_input',
     'ENTER_CLIENT_NAME',
     
     # Project handlers
     'handle_projects_callback',
+    'handle_projects_page_callback',
     'handle_project_name_input',
     'ENTER_PROJECT_NAME',
     
     # Employee handlers
     'handle_employees_callback',
+    'handle_employees_page_callback',
     
     # Report handlers
     'handle_reports_callback',
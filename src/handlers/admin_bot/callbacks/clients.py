@@ -2,22 +2,52 @@
 
 import re
 from datetime import datetime
+from typing import Optional
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.helpers import escape_markdown
 
-from src.database.db import db
+from src.database.db import db, Page
+from src.database.loader import get_loader
 from src.database.models import Client, Task, User
 from ..keyboards import get_clients_keyboard
 from ..constants import (
     CALLBACK_CLIENT_PREFIX,
-    CALLBACK_CLIENT_ADD
+    CALLBACK_CLIENT_ADD,
+    CALLBACK_CLIENTS_PAGE_NEXT,
+    CALLBACK_CLIENTS_PAGE_PREV,
+    LIST_PAGE_SIZE
 )
-from .utils import sort_tasks
+from .utils import sort_tasks, parse_page_cursor
 
 # Состояния обработки
 ENTER_CLIENT_NAME = 1
 
+async def get_clients_page(after_id: Optional[int] = None, before_id: Optional[int] = None) -> Page:
+    """Страница списка клиентов (сортировка по названию)"""
+    return await db.get_page(
+        Client,
+        after_id=after_id,
+        before_id=before_id,
+        limit=LIST_PAGE_SIZE,
+        order_by='name'
+    )
+
+async def handle_clients_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обработчик кнопок навигации по страницам списка клиентов
+
+    Args:
+        update: Объект обновления Telegram
+        context: Контекст Telegram бота
+    """
+    query = update.callback_query
+    await query.answer()
+
+    cursor = parse_page_cursor(query.data, CALLBACK_CLIENTS_PAGE_PREV, CALLBACK_CLIENTS_PAGE_NEXT)
+    page = await get_clients_page(**cursor)
+    await query.message.edit_reply_markup(reply_markup=await get_clients_keyboard(page))
+
 async def handle_clients_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Обработчик callback-запросов для раздела клиентов
@@ -65,11 +95,13 @@ async def handle_clients_callback(update: Update, context: ContextTypes.DEFAULT_
                 f"*Список задач:*\n"
             )
             
+            # Исполнители всех задач загружаются одним запросом
+            assignees = await get_loader(User).load_many(task.assignee_id for task in sorted_tasks)
+
             # Формируем список задач
             tasks_list = []
             for task in sorted_tasks:
-                # Получаем исполнителя
-                assignee = await db.get(User, task.assignee_id) if task.assignee_id else None
+                assignee = assignees.get(task.assignee_id)
                 assignee_name = assignee.full_name if assignee else "Не назначен"
                 
                 # Формируем строку задачи
@@ -117,8 +149,8 @@ async def handle_client_name_input(update: Update, context: ContextTypes.DEFAULT
         new_client = await db.create(Client, name=client_name)
         if new_client:
             # Обновляем список клиентов
-            clients = await db.get_all(Client)
-            keyboard = await get_clients_keyboard(clients)
+            page = await get_clients_page()
+            keyboard = await get_clients_keyboard(page)
             
             await update.message.reply_text(
                 f"✅ Клиент \"{client_name}\" успешно создан!\n\nСписок клиентов:",
@@ -1,23 +1,51 @@
 """Обработчики callback-запросов для раздела сотрудников"""
 
 import logging
+from typing import Optional
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
-from src.database.db import db
+from src.database.db import db, Page
 from src.database.models import User
 from src.utils.invite_codes import generate_invite_code, save_invite_code
 from ..constants import (
     CALLBACK_EMPLOYEE_PREFIX,
     CALLBACK_EMPLOYEE_ADD,
+    CALLBACK_EMPLOYEES_PAGE_NEXT,
+    CALLBACK_EMPLOYEES_PAGE_PREV,
     EMPLOYEE_TASKS_MESSAGE,
-    EMPLOYEES_MENU_MESSAGE
+    EMPLOYEES_MENU_MESSAGE,
+    LIST_PAGE_SIZE
 )
-from .utils import get_employee_active_tasks, format_employee_tasks
+from .utils import get_employee_active_tasks, format_employee_tasks, parse_page_cursor
 from ..keyboards import get_employees_keyboard
 
 logger = logging.getLogger(__name__)
 
+async def get_employees_page(after_id: Optional[int] = None, before_id: Optional[int] = None) -> Page:
+    """Страница списка сотрудников (full_name может быть пустым, поэтому сортировка по ID)"""
+    return await db.get_page(
+        User,
+        after_id=after_id,
+        before_id=before_id,
+        limit=LIST_PAGE_SIZE
+    )
+
+async def handle_employees_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обработчик кнопок навигации по страницам списка сотрудников
+
+    Args:
+        update: Объект обновления Telegram
+        context: Контекст Telegram бота
+    """
+    query = update.callback_query
+    await query.answer()
+
+    cursor = parse_page_cursor(query.data, CALLBACK_EMPLOYEES_PAGE_PREV, CALLBACK_EMPLOYEES_PAGE_NEXT)
+    page = await get_employees_page(**cursor)
+    await query.message.edit_reply_markup(reply_markup=await get_employees_keyboard(page))
+
 async def handle_employees_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Обработчик callback-запросов для раздела сотрудников
@@ -61,18 +89,16 @@ async def handle_employees_callback(update: Update, context: ContextTypes.DEFAUL
             )
         
         elif query.data == "back_to_employees":
-            # Получаем список всех сотрудников
-            employees = await db.get_all(User)
             # Отправляем сообщение со списком
             await query.message.edit_text(
                 EMPLOYEES_MENU_MESSAGE,
             )
         
         elif query.data == EMPLOYEE_TASKS_MESSAGE:
-            # Получаем список всех сотрудников
-            employees = await db.get_all(User)
+            # Получаем первую страницу сотрудников
+            page = await get_employees_page()
             # Создаем клавиатуру со списком
-            keyboard = await get_employees_keyboard(employees)
+            keyboard = await get_employees_keyboard(page)
             # Отправляем сообщение со списком
             await query.message.edit_text(
                 EMPLOYEES_MENU_MESSAGE,
@@ -83,11 +109,7 @@ async def handle_employees_callback(update: Update, context: ContextTypes.DEFAUL
             employee_id = int(query.data.split('_')[-1])
             
             # Получаем информацию о сотруднике
-            users = await db.get_all(User)
-            employee = next(
-                (user for user in users if user.id == employee_id),
-                None
-            )
+            employee = await db.get(User, employee_id)
             if not employee:
                 await query.message.edit_text("❌ Сотрудник не найден")
                 return
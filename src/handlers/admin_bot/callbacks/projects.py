@@ -2,22 +2,52 @@
 
 import re
 from datetime import datetime
+from typing import Optional
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.helpers import escape_markdown
 
-from src.database.db import db
+from src.database.db import db, Page
+from src.database.loader import get_loader
 from src.database.models import Client, Project, Task, User
 from ..keyboards import get_projects_keyboard
 from ..constants import (
     CALLBACK_PROJECT_PREFIX,
-    CALLBACK_PROJECT_ADD
+    CALLBACK_PROJECT_ADD,
+    CALLBACK_PROJECTS_PAGE_NEXT,
+    CALLBACK_PROJECTS_PAGE_PREV,
+    LIST_PAGE_SIZE
 )
-from .utils import sort_tasks
+from .utils import sort_tasks, parse_page_cursor
 
 # Состояния обработки
 ENTER_PROJECT_NAME = 2
 
+async def get_projects_page(after_id: Optional[int] = None, before_id: Optional[int] = None) -> Page:
+    """Страница списка проектов (сортировка по названию)"""
+    return await db.get_page(
+        Project,
+        after_id=after_id,
+        before_id=before_id,
+        limit=LIST_PAGE_SIZE,
+        order_by='name'
+    )
+
+async def handle_projects_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обработчик кнопок навигации по страницам списка проектов
+
+    Args:
+        update: Объект обновления Telegram
+        context: Контекст Telegram бота
+    """
+    query = update.callback_query
+    await query.answer()
+
+    cursor = parse_page_cursor(query.data, CALLBACK_PROJECTS_PAGE_PREV, CALLBACK_PROJECTS_PAGE_NEXT)
+    page = await get_projects_page(**cursor)
+    await query.message.edit_reply_markup(reply_markup=await get_projects_keyboard(page))
+
 async def handle_projects_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Обработчик callback-запросов для раздела проектов
@@ -48,7 +78,7 @@ async def handle_projects_callback(update: Update, context: ContextTypes.DEFAULT
         
         if project:
             # Получаем клиента проекта
-            client = await db.get(Client, project.client_id) if project.client_id else None
+            client = await get_loader(Client).load(project.client_id)
 
             # Получаем только активные задачи для этого проекта
             active_tasks = await db.get_all(
@@ -68,11 +98,13 @@ async def handle_projects_callback(update: Update, context: ContextTypes.DEFAULT
                 f"*Список задач:*\n"
             )
             
+            # Исполнители всех задач загружаются одним запросом
+            assignees = await get_loader(User).load_many(task.assignee_id for task in sorted_tasks)
+
             # Формируем список задач
             tasks_list = []
             for task in sorted_tasks:
-                # Получаем исполнителя через ID
-                assignee = await db.get(User, task.assignee_id) if task.assignee_id else None
+                assignee = assignees.get(task.assignee_id)
                 assignee_name = assignee.full_name if assignee else "Не назначен"
                 
                 # Формируем строку задачи
@@ -120,8 +152,8 @@ async def handle_project_name_input(update: Update, context: ContextTypes.DEFAUL
         new_project = await db.create(Project, name=project_name)
         if new_project:
             # Обновляем список проектов
-            projects = await db.get_all(Project)
-            keyboard = await get_projects_keyboard(projects)
+            page = await get_projects_page()
+            keyboard = await get_projects_keyboard(page)
             
             await update.message.reply_text(
                 f"✅ Проект \"{project_name}\" успешно создан!\n\nСписок проектов:",
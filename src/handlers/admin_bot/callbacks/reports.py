@@ -3,9 +3,17 @@
 from datetime import datetime, timedelta
 import logging
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
-from src.services.excel import ExcelReportGenerator
+from src.services.report_jobs import (
+    report_queue,
+    ReportQueueFull,
+    get_report_key,
+    get_report_file_id,
+    remember_report_file_id,
+    forget_report_file_id
+)
 from ..constants import (
     CALLBACK_REPORT_WEEK,
     CALLBACK_REPORT_MONTH,
@@ -73,22 +81,39 @@ async def generate_report(update: Update, context: ContextTypes.DEFAULT_TYPE, pe
     
     try:
         # Сообщаем о начале генерации
-        await query.message.edit_text(
-            f"🔄 Генерация отчета {REPORT_PERIODS[period].lower()}..."
-        )
-        
-        # Создаем генератор отчетов
-        generator = ExcelReportGenerator()
-        
-        # Генерируем отчет
-        file_data = await generator.generate_report(period)
-        
-        # Отправляем файл
-        await query.message.reply_document(
-            document=file_data,
-            filename=f"report_{period}_{datetime.now().strftime('%Y%m%d')}.xlsx",
-            caption=f"📊 Отчет {REPORT_PERIODS[period].lower()}"
-        )
+        title = f"🔄 Генерация отчета {REPORT_PERIODS[period].lower()}..."
+        await query.message.edit_text(title)
+
+        async def show_progress(status: str) -> None:
+            await query.message.edit_text(f"{title}\n{status}")
+
+        key = await get_report_key(period)
+        caption = f"📊 Отчет {REPORT_PERIODS[period].lower()}"
+        bot_id = context.bot.id
+
+        # Тот же отчет уже отправлялся: пересылаем по file_id без загрузки файла
+        delivered = False
+        file_id = get_report_file_id(bot_id, key)
+        if file_id is not None:
+            try:
+                await query.message.reply_document(document=file_id, caption=caption)
+                delivered = True
+            except BadRequest as e:
+                logger.warning(f"file_id отчета {key} не принят, файл будет загружен заново: {e}")
+                forget_report_file_id(bot_id, key)
+
+        if not delivered:
+            # Одинаковые запросы в работе собираются один раз, файл общий
+            async with report_queue.report(key, progress=show_progress) as path:
+                # Отправляем файл
+                with open(path, 'rb') as file:
+                    message = await query.message.reply_document(
+                        document=file,
+                        filename=f"report_{period}_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                        caption=caption
+                    )
+            if message.document is not None:
+                remember_report_file_id(bot_id, key, message.document.file_id)
         
         # Восстанавливаем меню выбора периода
         keyboard = [
@@ -119,6 +144,11 @@ async def generate_report(update: Update, context: ContextTypes.DEFAULT_TYPE, pe
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
         
+    except ReportQueueFull as e:
+        logger.warning(f"Отчет {period} отклонен: {e}")
+        await query.message.edit_text(
+            "⏳ Сейчас формируется слишком много отчетов. Попробуйте через несколько минут."
+        )
     except Exception as e:
         logger.error(f"Ошибка при генерации отчета: {e}", exc_info=True)
         await query.message.edit_text(
@@ -5,11 +5,26 @@ from typing import List, Optional, Dict
 from sqlalchemy import and_, select
 
 from src.database.db import db
-from src.database.models import Task, User
+from src.database.loader import get_loader
+from src.database.models import Task, User, Client, Project
 from ..constants import EMPLOYEE_TASK_ITEM, DATE_FORMAT
 
 
-def format_tasks_list(tasks: List[Task]) -> str:
+def parse_page_cursor(data: str, prev_prefix: str, next_prefix: str) -> Dict[str, int]:
+    """
+    Извлекает курсор страницы из callback data кнопки навигации
+
+    Returns:
+        Dict[str, int]: {'after_id': id} для следующей страницы,
+            {'before_id': id} для предыдущей, {} для первой
+    """
+    if data.startswith(prev_prefix):
+        return {'before_id': int(data[len(prev_prefix):])}
+    if data.startswith(next_prefix):
+        return {'after_id': int(data[len(next_prefix):])}
+    return {}
+
+async def format_tasks_list(tasks: List[Task]) -> str:
     """
     Форматирует список задач для отображения
 
@@ -21,6 +36,11 @@ def format_tasks_list(tasks: List[Task]) -> str:
     """
     if not tasks:
         return "Нет задач для отображения"
+
+    # Исполнители, клиенты и проекты загружаются пакетно, по запросу на модель
+    assignees = await get_loader(User).load_many(task.assignee_id for task in tasks)
+    clients = await get_loader(Client).load_many(task.client_id for task in tasks)
+    projects = await get_loader(Project).load_many(task.project_id for task in tasks)
     
     result = []
     for task in tasks:
@@ -31,7 +51,7 @@ def format_tasks_list(tasks: List[Task]) -> str:
         }.get(task.status, '❓')
 
         # Получаем информацию об исполнителе
-        assignee = db.get(User, task.assignee_id) if task.assignee_id else None
+        assignee = assignees.get(task.assignee_id)
         assignee_name = assignee.full_name if assignee else "Не назначен"
         
         # Формируем строку с информацией о задаче
@@ -46,10 +66,12 @@ def format_tasks_list(tasks: List[Task]) -> str:
             task_info += f"Срок: {task.due_date.strftime('%d.%m.%Y')}\n"
 
         # Добавляем клиента и проект, если они указаны
-        if task.client:
-            task_info += f"Клиент: {task.client.name}\n"
-        if task.project:
-            task_info += f"Проект: {task.project.name}\n"
+        client = clients.get(task.client_id)
+        project = projects.get(task.project_id)
+        if client:
+            task_info += f"Клиент: {client.name}\n"
+        if project:
+            task_info += f"Проект: {project.name}\n"
         
         result.append(task_info)
     
@@ -94,12 +116,14 @@ async def get_tasks_statistics(tasks: List[Task]) -> dict:
         }
     """
     assignees_stats = {}
+
+    # Все исполнители загружаются одним запросом
+    assignees = await get_loader(User).load_many(task.assignee_id for task in tasks)
     
     for task in tasks:
         if task.assignee_id:
             if task.assignee_id not in assignees_stats:
-                # Получаем информацию об исполнителе из БД
-                assignee = await db.get(User, task.assignee_id)
+                assignee = assignees.get(task.assignee_id)
                 if not assignee:
                     continue
                     
@@ -25,14 +25,27 @@ CALLBACK_TASKS_NOT_STARTED = "tasks_not_started"
 # Клиенты
 CALLBACK_CLIENT_PREFIX = "client_"
 CALLBACK_CLIENT_ADD = "client_add"
+CALLBACK_CLIENTS_PAGE_NEXT = "clients_next_"
+CALLBACK_CLIENTS_PAGE_PREV = "clients_prev_"
 
 # Проекты
 CALLBACK_PROJECT_PREFIX = "project_"
 CALLBACK_PROJECT_ADD = "project_add"
+CALLBACK_PROJECTS_PAGE_NEXT = "projects_next_"
+CALLBACK_PROJECTS_PAGE_PREV = "projects_prev_"
 
 # Сотрудники
 CALLBACK_EMPLOYEE_PREFIX = "employee_"
 CALLBACK_EMPLOYEE_ADD = "employee_add"
+CALLBACK_EMPLOYEES_PAGE_NEXT = "employees_next_"
+CALLBACK_EMPLOYEES_PAGE_PREV = "employees_prev_"
+
+# Размер страницы в списках клиентов, проектов и сотрудников
+LIST_PAGE_SIZE = 10
+
+# Кнопки навигации по страницам
+BUTTON_PAGE_PREV = "◀️ Назад"
+BUTTON_PAGE_NEXT = "Вперед ▶️"
 
 # Отчеты
 CALLBACK_REPORT_WEEK = "report_week"
@@ -1,4 +1,8 @@
+from typing import List
+
 from telegram import ReplyKeyboardMarkup, InlineKeyboardMarkup, InlineKeyboardButton
+
+from src.database.db import Page
 from .constants import (
     # Кнопки главного меню
     BUTTON_TASKS,
@@ -14,10 +18,18 @@ from .constants import (
     CALLBACK_TASKS_NOT_STARTED,
     CALLBACK_CLIENT_PREFIX,
     CALLBACK_CLIENT_ADD,
+    CALLBACK_CLIENTS_PAGE_NEXT,
+    CALLBACK_CLIENTS_PAGE_PREV,
     CALLBACK_PROJECT_PREFIX,
     CALLBACK_PROJECT_ADD,
+    CALLBACK_PROJECTS_PAGE_NEXT,
+    CALLBACK_PROJECTS_PAGE_PREV,
     CALLBACK_EMPLOYEE_PREFIX,
     CALLBACK_EMPLOYEE_ADD,
+    CALLBACK_EMPLOYEES_PAGE_NEXT,
+    CALLBACK_EMPLOYEES_PAGE_PREV,
+    BUTTON_PAGE_PREV,
+    BUTTON_PAGE_NEXT,
     CALLBACK_REPORT_WEEK,
     CALLBACK_REPORT_MONTH,
     CALLBACK_REPORT_QUARTER,
@@ -53,12 +65,21 @@ async def get_tasks_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(keyboard)
 
-async def get_clients_keyboard(clients: list) -> InlineKeyboardMarkup:
-    """Создает inline клавиатуру со списком клиентов"""
+def get_page_navigation_row(page: Page, prev_prefix: str, next_prefix: str) -> List[InlineKeyboardButton]:
+    """Создает ряд кнопок навигации по страницам (пустой, если страница одна)"""
+    row = []
+    if page.has_prev and page.first_id is not None:
+        row.append(InlineKeyboardButton(BUTTON_PAGE_PREV, callback_data=f"{prev_prefix}{page.first_id}"))
+    if page.has_next and page.last_id is not None:
+        row.append(InlineKeyboardButton(BUTTON_PAGE_NEXT, callback_data=f"{next_prefix}{page.last_id}"))
+    return row
+
+async def get_clients_keyboard(page: Page) -> InlineKeyboardMarkup:
+    """Создает inline клавиатуру со страницей списка клиентов"""
     keyboard = []
     
     # Добавляем кнопку для каждого клиента
-    for client in clients:
+    for client in page.items:
         keyboard.append([
             InlineKeyboardButton(
                 f"👥 {client.name}",
@@ -66,6 +87,11 @@ async def get_clients_keyboard(clients: list) -> InlineKeyboardMarkup:
             )
         ])
     
+    # Навигация по страницам
+    navigation = get_page_navigation_row(page, CALLBACK_CLIENTS_PAGE_PREV, CALLBACK_CLIENTS_PAGE_NEXT)
+    if navigation:
+        keyboard.append(navigation)
+    
     # Добавляем кнопку создания нового клиента
     keyboard.append([
         InlineKeyboardButton(
@@ -76,12 +102,12 @@ async def get_clients_keyboard(clients: list) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
-async def get_projects_keyboard(projects: list) -> InlineKeyboardMarkup:
-    """Создает inline клавиатуру со списком проектов"""
+async def get_projects_keyboard(page: Page) -> InlineKeyboardMarkup:
+    """Создает inline клавиатуру со страницей списка проектов"""
     keyboard = []
     
     # Добавляем кнопку для каждого проекта
-    for project in projects:
+    for project in page.items:
         keyboard.append([
             InlineKeyboardButton(
                 f"📊 {project.name}",
@@ -89,6 +115,11 @@ async def get_projects_keyboard(projects: list) -> InlineKeyboardMarkup:
             )
         ])
     
+    # Навигация по страницам
+    navigation = get_page_navigation_row(page, CALLBACK_PROJECTS_PAGE_PREV, CALLBACK_PROJECTS_PAGE_NEXT)
+    if navigation:
+        keyboard.append(navigation)
+    
     # Добавляем кнопку создания нового проекта
     keyboard.append([
         InlineKeyboardButton(
@@ -99,12 +130,12 @@ async def get_projects_keyboard(projects: list) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
-async def get_employees_keyboard(employees: list) -> InlineKeyboardMarkup:
-    """Создает inline клавиатуру со списком сотрудников"""
+async def get_employees_keyboard(page: Page) -> InlineKeyboardMarkup:
+    """Создает inline клавиатуру со страницей списка сотрудников"""
     keyboard = []
     
     # Добавляем кнопку для каждого сотрудника
-    for employee in employees:
+    for employee in page.items:
         keyboard.append([
             InlineKeyboardButton(
                 f"👤 {employee.full_name}",
@@ -112,6 +143,11 @@ async def get_employees_keyboard(employees: list) -> InlineKeyboardMarkup:
             )
         ])
     
+    # Навигация по страницам
+    navigation = get_page_navigation_row(page, CALLBACK_EMPLOYEES_PAGE_PREV, CALLBACK_EMPLOYEES_PAGE_NEXT)
+    if navigation:
+        keyboard.append(navigation)
+    
     # Добавляем кнопку добавления сотрудника
     keyboard.append([
         InlineKeyboardButton(
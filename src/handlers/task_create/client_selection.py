@@ -14,7 +14,7 @@ from .constants import (
     CALLBACK_NEW_CLIENT,
     CALLBACK_SELECT_CLIENT
 )
-from .keyboards import create_client_keyboard
+from .keyboards import get_client_keyboard
 
 async def start_client_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
@@ -37,10 +37,8 @@ async def start_client_selection(update: Update, context: ContextTypes.DEFAULT_T
             )
             return ConversationHandler.END
 
-        # Получаем список клиентов и преобразуем их в словари
-        clients = await db.get_all(Client)
-        clients_data = [client.to_dict() for client in clients]
-        reply_markup = create_client_keyboard(clients_data)
+        # Клавиатура со списком клиентов (из кэша справочников)
+        reply_markup = await get_client_keyboard()
         
         await update.message.reply_text(MSG_SELECT_CLIENT, reply_markup=reply_markup)
         return SELECT_CLIENT
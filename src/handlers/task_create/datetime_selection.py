@@ -7,9 +7,8 @@ from telegram.ext import ContextTypes, ConversationHandler
 
 from src.utils.helpers import parse_datetime
 from .constants import DUE_DATE, SELECT_TIME, SELECT_EXECUTOR
-from .keyboards import create_time_keyboard, create_executor_keyboard
-from src.database.models import User
-from src.database.db import db
+from .keyboards import create_time_keyboard, get_executor_keyboard
+from src.services.reference_data import get_executors
 from .utils import get_next_workdays
 
 logger = logging.getLogger(__name__)
@@ -58,23 +57,12 @@ async def process_time_selection(update: Update, context: ContextTypes.DEFAULT_T
         due_date = parse_datetime(f"{date_str} {time_str}")
         context.user_data['task_due_date'] = due_date
         
-        # Получаем всех пользователей
-        executors = await db.get_all(User)
-        
-        if not executors:
+        # Исполнители и клавиатура из кэша справочников
+        if not await get_executors():
             await query.message.reply_text("❌ Нет доступных исполнителей")
             return ConversationHandler.END
 
-        # Преобразуем в формат для клавиатуры
-        executors_data = [
-            {
-                "id": executor.id,
-                "name": executor.full_name or executor.username or f"User {executor.telegram_id}"
-            }
-            for executor in executors
-        ]
-        
-        reply_markup = create_executor_keyboard(executors_data)
+        reply_markup = await get_executor_keyboard()
         
         await query.edit_message_text(
             "👤 Выберите исполнителя задачи:",
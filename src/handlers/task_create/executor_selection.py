@@ -10,7 +10,8 @@ from telegram.ext import ContextTypes, ConversationHandler
 from src.database.models import User
 from src.database.db import db
 from .constants import CONFIRM, SELECT_EXECUTOR
-from .keyboards import create_executor_keyboard
+from .keyboards import get_executor_keyboard
+from src.services.reference_data import get_executors
 from .task_confirmation import show_task_confirmation
 
 logger = logging.getLogger(__name__)
@@ -25,8 +26,8 @@ async def get_available_executors() -> List[Tuple[int, str]]:
     logger.info("Получение списка доступных исполнителей")
     
     try:
-        # Получаем всех пользователей из БД
-        executors = await db.get_all(User)
+        # Пользователи из кэша справочников
+        executors = await get_executors()
         logger.info(f"Найдено {len(executors)} пользователей в базе данных")
         
         # Если список пустой, логируем это
@@ -35,8 +36,7 @@ async def get_available_executors() -> List[Tuple[int, str]]:
             return []
         
         # Сохраняем только необходимые данные
-        result = [(user.id, (user.full_name or user.username or "Без имени")) 
-                 for user in executors if user.id]
+        result = [(executor['id'], executor['name']) for executor in executors]
         logger.debug(f"Обработанные данные исполнителей: {result}")
         return result
         
@@ -61,12 +61,8 @@ async def handle_executor_selection(update: Update, context: ContextTypes.DEFAUL
         await message.reply_text("❌ Ошибка: нет доступных исполнителей")
         return ConversationHandler.END
     
-    # Создаем список объектов для клавиатуры
-    executors_data = [{"id": ex_id, "name": name} for ex_id, name in executors]
-    logger.debug(f"Подготовлено {len(executors_data)} исполнителей для клавиатуры")
-    
-    # Создаем клавиатуру с исполнителями
-    reply_markup = create_executor_keyboard(executors_data)
+    # Клавиатура с исполнителями (из кэша справочников)
+    reply_markup = await get_executor_keyboard()
     
     message = (update.callback_query.message 
               if update.callback_query 
@@ -9,10 +9,12 @@ from .datetime import (
     create_date_keyboard,
     create_time_keyboard
 )
-from .executor import create_executor_keyboard
+from .executor import create_executor_keyboard, get_executor_keyboard
 from .client_project import (
     create_client_keyboard,
-    create_project_keyboard
+    create_project_keyboard,
+    get_client_keyboard,
+    get_project_keyboard
 )
 
 __all__ = [
@@ -21,6 +23,9 @@ __all__ = [
     'create_date_keyboard',
     'create_time_keyboard',
     'create_executor_keyboard',
+    'get_executor_keyboard',
     'create_client_keyboard',
-    'create_project_keyboard'
+    'create_project_keyboard',
+    'get_client_keyboard',
+    'get_project_keyboard'
 ]
\ No newline at end of file
@@ -5,6 +5,13 @@ from typing import List, Dict
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+from src.services.reference_data import (
+    cached,
+    get_clients,
+    get_client_projects,
+    CLIENT_TABLES,
+    PROJECT_TABLES
+)
 from ..constants import (
     CALLBACK_NEW_CLIENT,
     CALLBACK_SELECT_CLIENT,
@@ -100,4 +107,16 @@ def create_project_keyboard(projects: List[Dict[str, any]]) -> InlineKeyboardMar
         ]
     ])
     
-    return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+    return InlineKeyboardMarkup(keyboard)
+
+async def get_client_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора клиента (кэшируется вместе со списком клиентов)"""
+    async def build() -> InlineKeyboardMarkup:
+        return create_client_keyboard(await get_clients())
+    return await cached(('client_keyboard',), CLIENT_TABLES, build)
+
+async def get_project_keyboard(client_id: int) -> InlineKeyboardMarkup:
+    """Клавиатура выбора проекта клиента (кэшируется вместе со списком проектов)"""
+    async def build() -> InlineKeyboardMarkup:
+        return create_project_keyboard(await get_client_projects(client_id))
+    return await cached(('project_keyboard', client_id), PROJECT_TABLES, build)
@@ -4,6 +4,8 @@
 from typing import List, Dict
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+from src.services.reference_data import cached, get_executors, USER_TABLES
+
 def create_executor_keyboard(executors: List[Dict[str, any]]) -> InlineKeyboardMarkup:
     """
     Создание клавиатуры с исполнителями и кнопкой 'Отмена'
@@ -39,4 +41,10 @@ def create_executor_keyboard(executors: List[Dict[str, any]]) -> InlineKeyboardM
         )
     ])
     
-    return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+    return InlineKeyboardMarkup(keyboard)
+
+async def get_executor_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора исполнителя (кэшируется вместе со списком исполнителей)"""
+    async def build() -> InlineKeyboardMarkup:
+        return create_executor_keyboard(await get_executors())
+    return await cached(('executor_keyboard',), USER_TABLES, build)
@@ -14,7 +14,8 @@ from .constants import (
     CALLBACK_NEW_PROJECT,
     CALLBACK_SELECT_PROJECT
 )
-from .keyboards import create_project_keyboard
+from .keyboards import get_project_keyboard
+from src.services.reference_data import get_client_projects
 
 async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
@@ -26,18 +27,10 @@ async def show_projects(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         return ConversationHandler.END
 
     try:
-        # Получаем проекты для выбранного клиента и преобразуем их в словари
-        projects = await db.get_all(Project, client_id=client_id)
-        print(f"Found projects for client {client_id}: {projects}")  # Debug log
-        
-        if not projects:
-            # Если проектов нет, создаем клавиатуру только с кнопкой создания
-            projects_data = []
-        else:
-            projects_data = [project.to_dict() for project in projects]
-            print(f"Projects data: {projects_data}")  # Debug log
-            
-        reply_markup = create_project_keyboard(projects_data)
+        # Проекты выбранного клиента и клавиатура (из кэша справочников);
+        # если проектов нет, в клавиатуре только кнопка создания
+        projects_data = await get_client_projects(client_id)
+        reply_markup = await get_project_keyboard(client_id)
 
         message_text = (MSG_SELECT_PROJECT if projects_data
                        else "У клиента нет проектов. Создайте новый проект:")
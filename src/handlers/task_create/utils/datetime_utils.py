@@ -1,7 +1,7 @@
 """
 Утилиты для работы с датой и временем
 """
-from datetime import datetime, timedelta
+from src.utils.work_calendar import work_calendar
 
 def get_next_workdays(count=6):
     """
@@ -11,13 +11,6 @@ def get_next_workdays(count=6):
         count (int): Количество рабочих дней для получения
 
     Returns:
-        list[datetime]: Список дат рабочих дней
+        list[date]: Список дат рабочих дней (выходные и праздники - по рабочему календарю)
     """
-    workdays = []
-    current_date = datetime.now()
-    while len(workdays) < count:
-        current_date += timedelta(days=1)
-        # 5 = суббота, 6 = воскресенье
-        if current_date.weekday() not in [5, 6]:
-            workdays.append(current_date)
-    return workdays
\ No newline at end of file
+    return work_calendar.next_workdays(count)
\ No newline at end of file
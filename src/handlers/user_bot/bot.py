@@ -23,8 +23,10 @@ from src.middleware.auth import (
     handle_invite_code_button,
     handle_invite_code_input,
     cancel_invite_code,
+    get_auth_stage_handler,
     ENTER_INVITE_CODE,
-    CALLBACK_ENTER_CODE
+    CALLBACK_ENTER_CODE,
+    AUTH_STAGE_GROUP
 )
 
 logger = logging.getLogger(__name__)
@@ -70,6 +72,9 @@ def setup_user_bot(application: Application) -> None:
     )
 
     # Регистрация обработчиков по группам
+    logger.info("Добавление этапа аутентификации апдейтов...")
+    application.add_handler(get_auth_stage_handler(), group=AUTH_STAGE_GROUP)
+
     logger.info("Добавление обработчика инвайт-кодов...")
     application.add_handler(invite_code_handler, group=AUTH_GROUP)
 
@@ -93,7 +98,7 @@ def setup_user_bot(application: Application) -> None:
     application.add_handler(
         CallbackQueryHandler(
             require_auth(bot_type='user')(handle_task_callback),
-            pattern=r"^(my_tasks|(view|start|complete)_task_\d+)$"
+            pattern=r"^(my_tasks|(view|start|complete|pause|resume)_task_\d+)$"
         ),
         group=CALLBACK_GROUP
     )
@@ -5,7 +5,12 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from .task_details_callback import view_task_details, get_task_and_check_access
-from .task_status_callback import handle_start_task, handle_complete_task
+from .task_status_callback import (
+    handle_start_task,
+    handle_complete_task,
+    handle_pause_task,
+    handle_resume_task
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +55,10 @@ async def handle_task_callback(update: Update, context: ContextTypes.DEFAULT_TYP
                 await handle_start_task(query, task)
             elif action == "complete":
                 await handle_complete_task(query, task)
+            elif action == "pause":
+                await handle_pause_task(query, task)
+            elif action == "resume":
+                await handle_resume_task(query, task)
             else:
                 logger.warning(f"Неизвестное действие: {action}")
                 await query.message.reply_text("❌ Неизвестное действие.")
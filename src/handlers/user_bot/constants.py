@@ -7,6 +7,9 @@ TASK_STATUSES = {
     'completed': '✅ Завершена'
 }
 
+# Задача в работе без открытого интервала учета времени
+TASK_PAUSED_STATUS = '⏸ На паузе'
+
 # Форматы сообщений
 HELP_MESSAGE = """
 🤖 *Task Bot \\- Система управления задачами*\n
@@ -51,4 +54,6 @@ _{description}_
 
 # Callback data для управления задачами
 START_TASK = "start_task_{task_id}"
-COMPLETE_TASK = "complete_task_{task_id}"
\ No newline at end of file
+COMPLETE_TASK = "complete_task_{task_id}"
+PAUSE_TASK = "pause_task_{task_id}"
+RESUME_TASK = "resume_task_{task_id}"
\ No newline at end of file
@@ -10,7 +10,9 @@ from telegram import (
 from src.database.models import Task
 from .constants import (
     START_TASK,
-    COMPLETE_TASK
+    COMPLETE_TASK,
+    PAUSE_TASK,
+    RESUME_TASK
 )
 
 def create_main_keyboard() -> ReplyKeyboardMarkup:
@@ -58,8 +60,14 @@ def create_tasks_keyboard(tasks: List[Task]) -> InlineKeyboardMarkup:
     
     return InlineKeyboardMarkup(keyboard)
 
-def create_task_control_keyboard(task: Task) -> InlineKeyboardMarkup:
-    """Создает клавиатуру с кнопками управления задачей"""
+def create_task_control_keyboard(task: Task, paused: bool = False) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру с кнопками управления задачей
+
+    Args:
+        task: Задача
+        paused: Задача в работе поставлена на паузу
+    """
     keyboard = []
     
     if task.status == 'not_started':
@@ -70,7 +78,18 @@ def create_task_control_keyboard(task: Task) -> InlineKeyboardMarkup:
             )
         ])
     elif task.status == 'in_progress':
+        if paused:
+            pause_button = InlineKeyboardButton(
+                "▶️ Продолжить",
+                callback_data=RESUME_TASK.format(task_id=task.id)
+            )
+        else:
+            pause_button = InlineKeyboardButton(
+                "⏸ Пауза",
+                callback_data=PAUSE_TASK.format(task_id=task.id)
+            )
         keyboard.append([
+            pause_button,
             InlineKeyboardButton(
                 "✅ Завершить задачу",
                 callback_data=COMPLETE_TASK.format(task_id=task.id)
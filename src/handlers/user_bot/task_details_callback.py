@@ -8,8 +8,9 @@ from src.database.db import db, get_session
 from src.database.models import Task, User
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
+from src.services.time_tracking import get_open_interval
 from src.utils.helpers import format_datetime
-from .constants import TASK_DETAIL_MESSAGE, TASK_STATUSES
+from .constants import TASK_DETAIL_MESSAGE, TASK_STATUSES, TASK_PAUSED_STATUS
 from .keyboards import create_task_control_keyboard
 from .task_list import my_tasks
 
@@ -18,17 +19,22 @@ logger = logging.getLogger(__name__)
 async def view_task_details(query: CallbackQuery, task: Task) -> None:
     """Показывает детали задачи"""
     try:
+        status = TASK_STATUSES.get(task.status, task.status)
+        paused = task.status == Task.STATUS_IN_PROGRESS and await get_open_interval(task.id) is None
+        if paused:
+            status = TASK_PAUSED_STATUS
+
         message_text = TASK_DETAIL_MESSAGE.format(
             task_id=task.id,
             title=task.title,
             description=task.description or "Нет описания",
-            status=TASK_STATUSES.get(task.status, task.status),
+            status=status,
             created_at=format_datetime(task.created_at),
             deadline=format_datetime(task.due_date) if task.due_date else "Не указан",
             client=task.client.name if task.client else "Не указан",
             project=task.project.name if task.project else "Не указан"
         )
-        keyboard = create_task_control_keyboard(task)
+        keyboard = create_task_control_keyboard(task, paused)
         
         await query.message.edit_text(
             message_text,
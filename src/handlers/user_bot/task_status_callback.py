@@ -3,11 +3,11 @@
 import logging
 from telegram import CallbackQuery
 
-from src.database.db import db, get_session
+from src.database.db import db, read_your_writes
 from src.database.models import Task
+from src.services import time_tracking
 from .constants import TASK_STATUSES
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from .keyboards import create_task_control_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -20,35 +20,64 @@ async def handle_start_task(query: CallbackQuery, task: Task) -> None:
             )
             return
 
-        # Обновляем статус задачи
-        await db.update(Task, task.id, status="in_progress")
-        
-        # После обновления получаем свежую задачу со связями
-        async with get_session() as session:
-            stmt = (select(Task)
-                   .where(Task.id == task.id)
-                   .options(selectinload(Task.client),
-                           selectinload(Task.project)))
-            result = await session.execute(stmt)
-            updated_task = result.scalar_one_or_none()
-            
-            if not updated_task:
-                await query.edit_message_text("❌ Задача не найдена.")
-                return
-
-            # Отправляем подтверждение
-            from src.handlers.task_create.keyboards.basic import create_task_list_keyboard
-            await query.edit_message_text(
-                f"✅ Задача «{updated_task.title}» начата\n"
-                f"Клиент: {updated_task.client.name if updated_task.client else 'Не указан'}\n"
-                f"Проект: {updated_task.project.name if updated_task.project else 'Не указан'}",
-                reply_markup=create_task_list_keyboard()
-            )
+        # Статус задачи и интервал учета времени меняются вместе
+        await time_tracking.start_task(task.id, task.assignee_id)
+
+        # После обновления получаем свежую задачу со связями с основной БД
+        with read_your_writes():
+            updated_task = await db.get_task_with_relations(task.id)
+
+        if not updated_task:
+            await query.edit_message_text("❌ Задача не найдена.")
+            return
+
+        # Отправляем подтверждение
+        from src.handlers.task_create.keyboards.basic import create_task_list_keyboard
+        await query.edit_message_text(
+            f"✅ Задача «{updated_task.title}» начата\n"
+            f"Клиент: {updated_task.client.name if updated_task.client else 'Не указан'}\n"
+            f"Проект: {updated_task.project.name if updated_task.project else 'Не указан'}",
+            reply_markup=create_task_list_keyboard()
+        )
 
+    except ValueError as e:
+        await query.edit_message_text(f"❌ {e}")
     except Exception as e:
         logger.error(f"Ошибка при начале работы над задачей: {e}", exc_info=True)
         await query.edit_message_text("❌ Произошла ошибка. Попробуйте позже.")
 
+async def handle_pause_task(query: CallbackQuery, task: Task) -> None:
+    """Обработка паузы в работе над задачей"""
+    try:
+        interval = await time_tracking.pause_task(task.id)
+        minutes = (interval.duration or 0) // 60
+        await query.edit_message_text(
+            f"⏸ Задача «{task.title}» на паузе\n"
+            f"Учтено за интервал: {minutes} мин.",
+            reply_markup=create_task_control_keyboard(task, paused=True)
+        )
+
+    except ValueError as e:
+        await query.edit_message_text(f"❌ {e}")
+    except Exception as e:
+        logger.error(f"Ошибка при постановке задачи на паузу: {e}", exc_info=True)
+        await query.edit_message_text("❌ Произошла ошибка. Попробуйте позже.")
+
+async def handle_resume_task(query: CallbackQuery, task: Task) -> None:
+    """Обработка продолжения работы над задачей после паузы"""
+    try:
+        await time_tracking.resume_task(task.id, task.assignee_id)
+        await query.edit_message_text(
+            f"▶️ Работа над задачей «{task.title}» продолжена",
+            reply_markup=create_task_control_keyboard(task)
+        )
+
+    except ValueError as e:
+        await query.edit_message_text(f"❌ {e}")
+    except Exception as e:
+        logger.error(f"Ошибка при продолжении работы над задачей: {e}", exc_info=True)
+        await query.edit_message_text("❌ Произошла ошибка. Попробуйте позже.")
+
 async def handle_complete_task(query: CallbackQuery, task: Task) -> None:
     """Обработка завершения задачи"""
     try:
@@ -58,31 +87,28 @@ async def handle_complete_task(query: CallbackQuery, task: Task) -> None:
             )
             return
 
-        # Обновляем статус задачи
-        await db.update(Task, task.id, status="completed")
-        
-        # После обновления получаем свежую задачу со связями
-        async with get_session() as session:
-            stmt = (select(Task)
-                   .where(Task.id == task.id)
-                   .options(selectinload(Task.client),
-                           selectinload(Task.project)))
-            result = await session.execute(stmt)
-            updated_task = result.scalar_one_or_none()
-            
-            if not updated_task:
-                await query.edit_message_text("❌ Задача не найдена.")
-                return
-
-            # Отправляем подтверждение
-            from src.handlers.task_create.keyboards.basic import create_task_list_keyboard
-            await query.edit_message_text(
-                f"✅ Задача «{updated_task.title}» завершена\n"
-                f"Клиент: {updated_task.client.name if updated_task.client else 'Не указан'}\n"
-                f"Проект: {updated_task.project.name if updated_task.project else 'Не указан'}",
-                reply_markup=create_task_list_keyboard()
-            )
+        # Статус задачи и интервал учета времени меняются вместе
+        await time_tracking.complete_task(task.id)
 
+        # После обновления получаем свежую задачу со связями с основной БД
+        with read_your_writes():
+            updated_task = await db.get_task_with_relations(task.id)
+
+        if not updated_task:
+            await query.edit_message_text("❌ Задача не найдена.")
+            return
+
+        # Отправляем подтверждение
+        from src.handlers.task_create.keyboards.basic import create_task_list_keyboard
+        await query.edit_message_text(
+            f"✅ Задача «{updated_task.title}» завершена\n"
+            f"Клиент: {updated_task.client.name if updated_task.client else 'Не указан'}\n"
+            f"Проект: {updated_task.project.name if updated_task.project else 'Не указан'}",
+            reply_markup=create_task_list_keyboard()
+        )
+
+    except ValueError as e:
+        await query.edit_message_text(f"❌ {e}")
     except Exception as e:
         logger.error(f"Ошибка при завершении задачи: {e}", exc_info=True)
-        await query.edit_message_text("❌ Произошла ошибка. Попробуйте позже.")
\ No newline at end of file
+        await query.edit_message_text("❌ Произошла ошибка. Попробуйте позже.")
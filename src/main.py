@@ -7,54 +7,46 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv # Добавляем загрузку переменных окружения
 
-# Создаем директорию для логов
-os.makedirs('logs', exist_ok=True)
-
-# Отключаем логи от httpx
-logging.getLogger("httpx").setLevel(logging.WARNING)
-
-# Настраиваем ротацию логов
-log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-max_bytes = 10 * 1024 * 1024  # 10 MB
-
-handler = RotatingFileHandler(
-    "logs/app.log",
-    maxBytes=max_bytes,
-    backupCount=5
-)
-handler.setFormatter(logging.Formatter(log_format))
-
-logging.basicConfig(
-    format=log_format,
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(),
-        handler
-    ]
-)
-
-# Принудительная загрузка переменных окружения из .env
-
-
-# Загружаем рабочее время из переменных окружения
-WORK_START_TIME = os.getenv("WORK_START_TIME", "09:30")
-WORK_END_TIME = os.getenv("WORK_END_TIME", "17:30")
-
-print(f"✅ WORK_START_TIME: {WORK_START_TIME}")
-print(f"✅ WORK_END_TIME: {WORK_END_TIME}")
-
 # Настраиваем путь к корневой директории проекта
 src_dir = str(Path(__file__).resolve().parent.parent)
 if src_dir not in sys.path:
     sys.path.append(src_dir)
 
 from src.config import get_config
-from src.admin_bot import AdminBot
-from src.user_bot import UserBot
-from src.database.db import init_db
-from src.services.notifications import start_scheduler, send_task_notifications
 logger = logging.getLogger(__name__)
 
+# Модуль выполняется заново в каждом процессе пула сборки отчетов (spawn,
+# как __mp_main__), поэтому настройка логов, вывод и импорт ботов и БД
+# выполняются только при запуске приложения, а не при импорте.
+
+def setup_logging() -> None:
+    """Вывод логов в консоль и в logs/app.log с ротацией"""
+    # Создаем директорию для логов
+    os.makedirs('logs', exist_ok=True)
+
+    # Отключаем логи от httpx
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Настраиваем ротацию логов
+    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    max_bytes = 10 * 1024 * 1024  # 10 MB
+
+    handler = RotatingFileHandler(
+        "logs/app.log",
+        maxBytes=max_bytes,
+        backupCount=5
+    )
+    handler.setFormatter(logging.Formatter(log_format))
+
+    logging.basicConfig(
+        format=log_format,
+        level=logging.INFO,
+        handlers=[
+            logging.StreamHandler(),
+            handler
+        ]
+    )
+
 class BotRunner:
     """Класс для управления запуском ботов"""
 
@@ -78,15 +70,29 @@ class BotRunner:
 
     async def init_bots(self):
         """Инициализация и запуск ботов"""
+        from src.admin_bot import AdminBot
+        from src.user_bot import UserBot
+        from src.database.db import init_db
+        from src.services.notifications import start_scheduler
+
         try:
             # Инициализация базы данных
             logger.info("Инициализация базы данных...")
             await init_db()
 
-            # Исправление sequence 'users_id_seq' (если требуется)
+            # Однократное исправление sequence 'users_id_seq' при запуске
             from src.database.db import db
             await db.fix_users_sequence()
 
+            # Секции task_times на текущий и ближайшие месяцы
+            from src.database.partitions import run_partition_maintenance
+            await run_partition_maintenance()
+
+            # Сброс кэшей по изменениям из других процессов
+            if self.config.db_change_channel:
+                from src.database.change_feed import change_feed
+                await change_feed.start()
+
             # Инициализация ботов
             logger.info("Инициализация ботов...")
             self.admin_bot = AdminBot(self.config.admin_bot_token)
@@ -157,6 +163,14 @@ class BotRunner:
             except Exception as e:
                 logger.error(f"Ошибка при остановке user_bot: {e}")
 
+        # Остановка подписки на канал изменений
+        from src.database.change_feed import change_feed
+        await change_feed.stop()
+
+        # Остановка пула сборки отчетов
+        from src.services.excel import shutdown_report_executor
+        shutdown_report_executor()
+
         # Отмена всех оставшихся задач
         tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
         for task in tasks:
@@ -182,6 +196,12 @@ class BotRunner:
 
 def main():
     """Точка входа"""
+    setup_logging()
+
+    # Рабочее время из переменных окружения
+    print(f"✅ WORK_START_TIME: {os.getenv('WORK_START_TIME', '09:30')}")
+    print(f"✅ WORK_END_TIME: {os.getenv('WORK_END_TIME', '17:30')}")
+
     runner = BotRunner()
 
     try:
@@ -1,14 +1,15 @@
 """
 Middleware для аутентификации пользователей
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
-from telegram.ext import ContextTypes, ConversationHandler
-from sqlalchemy import select
+from telegram.ext import ContextTypes, ConversationHandler, TypeHandler
 import logging
 
-from src.database.db import db
+from src.config import get_config
+from src.database.db import db, add_change_listener, read_your_writes, Change, ALL_TABLES
 from src.database.models import User
+from src.utils.cache import TTLCache
 from src.utils.invite_codes import validate_invite_code
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,9 @@ import os
 ENTER_INVITE_CODE = 1
 ENTER_MASTER_KEY = 2
 
+# Группа предварительной аутентификации: выполняется раньше всех остальных обработчиков
+AUTH_STAGE_GROUP = -100
+
 # Callback data для кнопок
 CALLBACK_ENTER_CODE = "enter_invite_code"
 CALLBACK_ENTER_MASTER_KEY = "enter_master_key"
@@ -26,6 +30,22 @@ CALLBACK_ENTER_MASTER_KEY = "enter_master_key"
 # Мастер-ключ из переменной окружения
 MASTER_KEY = os.getenv("MASTER_KEY")
 
+config = get_config()
+
+# Кэш аутентифицированных пользователей по telegram_id
+user_cache = TTLCache(maxsize=config.auth_cache_size, ttl=config.auth_cache_ttl)
+
+def invalidate_user_cache(telegram_id: int) -> None:
+    """Сброс закэшированного пользователя (например, после смены роли)"""
+    user_cache.pop(telegram_id)
+
+def _on_changes(changes: Set[Change]) -> None:
+    # Кэш построен по telegram_id, а изменения приходят по id: сбрасывается целиком
+    if any(table in (User.__tablename__, ALL_TABLES) for table, _ in changes):
+        user_cache.clear()
+
+add_change_listener(_on_changes)
+
 class AuthMiddleware:
     """Middleware для проверки авторизации пользователей"""
     
@@ -52,10 +72,8 @@ class AuthMiddleware:
         if not update.effective_user:
             return False
             
-        user_id = update.effective_user.id
-        
-        # Проверка в БД
-        user = await self.get_user(user_id)
+        # Пользователь определяется один раз на апдейт
+        user = await resolve_update_user(update, context)
         if not user:
             if update.message:
                 if self.bot_type == 'admin':
@@ -98,7 +116,7 @@ class AuthMiddleware:
 
     async def get_user(self, telegram_id: int) -> Optional[User]:
         """
-        Получение пользователя из БД
+        Получение пользователя из кэша или из БД
         
         Args:
             telegram_id: Telegram ID пользователя
@@ -106,13 +124,53 @@ class AuthMiddleware:
         Returns:
             Optional[User]: Объект пользователя или None
         """
-        await db.fix_users_sequence()  # Исправляем автоинкремент перед запросом пользователя
-        stmt = select(User).where(User.telegram_id == telegram_id)
-        async for session in db.get_session():
-            result = await session.execute(stmt)
-            user = result.scalar_one_or_none()
+        user = user_cache.get(telegram_id)
+        if user is not None:
             return user
 
+        # Кэш заполняется с основной БД: смена роли, прочитанная с отстающей
+        # реплики, сохранилась бы до истечения AUTH_CACHE_TTL
+        with read_your_writes():
+            user = await db.get_by_field(User, 'telegram_id', telegram_id)
+        if user is not None:
+            # Кэшируем только найденных пользователей, чтобы доступ
+            # открывался сразу после ввода кода приглашения
+            user_cache.set(telegram_id, user)
+        return user
+
+# Маркер "пользователь апдейта еще не определен"
+_UNRESOLVED = object()
+
+async def resolve_update_user(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[User]:
+    """
+    Определяет пользователя БД для апдейта.
+
+    Контекст создается один раз на апдейт и общий для всех групп обработчиков,
+    поэтому результат сохраняется в нем и повторно не запрашивается.
+    """
+    user = getattr(context, 'auth_user', _UNRESOLVED)
+    if user is not _UNRESOLVED:
+        return user
+
+    user = None
+    if update.effective_user:
+        user = await AuthMiddleware().get_user(update.effective_user.id)
+    context.auth_user = user
+    return user
+
+async def authenticate_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Предварительная аутентификация апдейта до запуска обработчиков"""
+    await resolve_update_user(update, context)
+
+def get_auth_stage_handler() -> TypeHandler:
+    """
+    Обработчик предварительной аутентификации.
+
+    Регистрируется в группе AUTH_STAGE_GROUP и определяет пользователя
+    один раз на апдейт, остальные обработчики читают результат из контекста.
+    """
+    return TypeHandler(Update, authenticate_update)
+
 async def handle_invite_code_button(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Обработчик нажатия кнопки 'Ввести код'"""
     query = update.callback_query
@@ -148,6 +206,7 @@ async def handle_invite_code_input(update: Update, context: ContextTypes.DEFAULT
                 username=update.effective_user.username,
                 full_name=update.effective_user.full_name
             )
+            invalidate_user_cache(telegram_id)
             logger.info(f"Пользователь {telegram_id} успешно активирован")
             
             await update.message.reply_text(
@@ -209,15 +268,14 @@ async def handle_master_key_input(update: Update, context: ContextTypes.DEFAULT_
                 await db.update(User, user.id, role='admin')
             else:
                 # Создаем нового пользователя с правами админа
-                async for session in db.get_session():
-                    user = User(
-                        telegram_id=telegram_id,
-                        username=update.effective_user.username,
-                        full_name=update.effective_user.full_name,
-                        role='admin'
-                    )
-                    session.add(user)
-                    await session.commit()
+                await db.create(
+                    User,
+                    telegram_id=telegram_id,
+                    username=update.effective_user.username,
+                    full_name=update.effective_user.full_name,
+                    role='admin'
+                )
+            invalidate_user_cache(telegram_id)
                 
             logger.info(f"Администратор {telegram_id} успешно активирован")
             
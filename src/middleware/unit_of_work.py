@@ -0,0 +1,49 @@
+"""
+Middleware единицы работы: одна сессия БД на каждый апдейт Telegram
+"""
+import logging
+from typing import Any, Optional
+
+from telegram.ext import Application, BaseHandler
+
+from src.database.db import unit_of_work, current_unit_of_work
+from src.database.instrumentation import track_update, instrument_handler
+
+logger = logging.getLogger(__name__)
+
+class UnitOfWorkApplication(Application):
+    """
+    Application, оборачивающий обработку каждого апдейта в единицу работы.
+
+    Все вызовы db.* во время апдейта используют одну сессию и одну транзакцию,
+    которая фиксируется после всех обработчиков или откатывается,
+    если хотя бы один из них завершился ошибкой.
+
+    Ошибка фиксации передается обработчикам ошибок (process_error): к этому
+    моменту пользователь обычно уже получил подтверждение, и о потерянной
+    записи нужно сообщить.
+
+    Запросы апдейта учитываются инструментацией (src.database.instrumentation)
+    с привязкой к обработчику, который их выполнил.
+    """
+
+    def add_handler(self, handler: BaseHandler[Any, Any, Any], group: int = 0) -> None:
+        """Регистрация обработчика с привязкой его SQL-запросов к имени callback"""
+        super().add_handler(instrument_handler(handler), group)
+
+    async def process_update(self, update: object) -> None:
+        """Обработка апдейта внутри единицы работы"""
+        with track_update(update):
+            try:
+                async with unit_of_work():
+                    await super().process_update(update)
+            except Exception as e:
+                logger.error(f"Ошибка при завершении единицы работы апдейта: {e}", exc_info=True)
+                await self.process_error(update, e)
+
+    async def process_error(self, update: Optional[object], error: Exception, job=None, coroutine=None) -> bool:
+        """Ошибка обработчика переводит транзакцию апдейта в режим отката"""
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.mark_rollback_only()
+        return await super().process_error(update, error, job=job, coroutine=coroutine)
@@ -6,10 +6,22 @@
 - Аналитики по задачам
 - Аналитики по клиентам
 - Аналитики по проектам
+
+Модули импортируются при первом обращении: процессы пула сборки отчетов
+импортируют только src.services.excel_writer, без ботов и подключений к БД.
 """
+import importlib
+
+_EXPORTS = {
+    "ExcelReportGenerator": ".excel",
+    "start_scheduler": ".notifications",
+    "send_task_notifications": ".notifications",
+}
 
-from .excel import ExcelReportGenerator
-from .notifications import start_scheduler, send_task_notifications
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "ExcelReportGenerator",
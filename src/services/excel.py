@@ -1,24 +1,97 @@
-"""Модуль для работы с Excel-отчетами"""
+"""
+Модуль для работы с Excel-отчетами
 
+Данные читаются асинхронно (строки задач - курсором на стороне сервера
+пачками по REPORT_ROW_BATCH) и пишутся простыми кортежами во временный
+файл-спул. Сборка и сохранение xlsx выполняются в пуле процессов
+(REPORT_WORKERS), чтобы не занимать цикл событий, обслуживающий ботов.
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-import io
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import selectinload, joinedload
-from typing import Tuple, List, Dict
-
-from src.database.db import get_session
+import logging
+import multiprocessing
+import os
+import tempfile
+from sqlalchemy import select, and_, func, distinct, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from typing import Awaitable, Callable, Optional, Tuple
+
+from src.config import get_config
+from src.database.db import get_read_session
 from src.database.models import Task, Client, User, Project
+from src.services.excel_writer import REPORT_ROW_BATCH, RowSpool, build_workbook
+from src.services.rollups import get_client_totals, get_project_totals, get_user_totals, RollupTotals
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_report_executor() -> ProcessPoolExecutor:
+    """Пул процессов для сборки отчетов (создается при первом отчете)"""
+    global _executor
+    if _executor is None:
+        # spawn: дочерний процесс не наследует потоки и соединения родителя
+        _executor = ProcessPoolExecutor(
+            max_workers=config.report_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"Пул сборки отчетов запущен: {config.report_workers} процесс(ов)")
+    return _executor
+
+def shutdown_report_executor() -> None:
+    """Остановка пула сборки отчетов"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+# Обратный вызов прогресса: текст текущего этапа
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+def _distinct_names(column):
+    """string_agg(DISTINCT column, ', ' ORDER BY column): уникальные имена через запятую"""
+    return func.string_agg(distinct(column), aggregate_order_by(literal_column("', '"), column))
+
+def get_period_dates(period: str) -> Tuple[datetime, datetime]:
+    """Начало и конец периода отчета (week/month/quarter/year), конец - текущий момент"""
+    now = datetime.now()
+    if period == 'week':
+        date_from = now - timedelta(days=7)
+    elif period == 'month':
+        date_from = now - timedelta(days=30)
+    elif period == 'quarter':
+        date_from = now - timedelta(days=90)
+    else:  # year
+        date_from = now - timedelta(days=365)
+    return date_from, now
 
 class ExcelReportGenerator:
     """Генератор Excel-отчетов"""
-    
-    def __init__(self):
-        self.wb = Workbook()
-        # Удаляем лист по умолчанию, так как создадим свои
-        self.wb.remove(self.wb.active)
-        
+
+    SHEET_COUNT = 4
+
+    def __init__(self, progress: Optional[ProgressCallback] = None):
+        """
+        Args:
+            progress: Вызывается после каждой вкладки и перед сборкой файла
+        """
+        self.spool: Optional[RowSpool] = None
+        self.progress = progress
+        self._sheets_done = 0
+
+    async def _report_progress(self, text: str) -> None:
+        if self.progress is not None:
+            await self.progress(text)
+
+    async def _sheet_done(self, title: str) -> None:
+        self._sheets_done += 1
+        await self._report_progress(f"{title}: {self._sheets_done}/{self.SHEET_COUNT} готово")
+
     async def generate_report(self, period: str) -> bytes:
         """
         Генерация отчета за указанный период
@@ -29,38 +102,51 @@ class ExcelReportGenerator:
         Returns:
             bytes: Excel-файл в виде байтов
         """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.xlsx')
+            await self.write_report(period, path)
+            with open(path, 'rb') as file:
+                return file.read()
+
+    async def write_report(self, period: str, output_path: str) -> None:
+        """
+        Запись отчета за период в файл
+
+        Args:
+            period: Период (week/month/quarter/year)
+            output_path: Путь к создаваемому xlsx-файлу
+        """
+        global _executor
         date_from, date_to = self._get_period_dates(period)
-        
-        # Генерируем все вкладки
-        await self._generate_clients_sheet(date_from, date_to)
-        await self._generate_projects_sheet(date_from, date_to)
-        await self._generate_employees_sheet(date_from, date_to)
-        await self._generate_tasks_sheet(date_from, date_to)
-        
-        # Сохраняем в память
-        output = io.BytesIO()
-        self.wb.save(output)
-        output.seek(0)
-        
-        return output.getvalue()
+
+        with tempfile.NamedTemporaryFile(suffix='.spool') as spool_file:
+            self.spool = RowSpool(spool_file)
+            self._sheets_done = 0
+
+            # Генерируем все вкладки
+            await self._generate_clients_sheet(date_from, date_to)
+            await self._generate_projects_sheet(date_from, date_to)
+            await self._generate_employees_sheet(date_from, date_to)
+            await self._generate_tasks_sheet(date_from, date_to)
+            spool_file.flush()
+
+            await self._report_progress("Сборка файла")
+            loop = asyncio.get_running_loop()
+            executor = get_report_executor()
+            try:
+                await loop.run_in_executor(executor, build_workbook, spool_file.name, output_path)
+            except BrokenProcessPool:
+                # Процесс пула аварийно завершился: следующий отчет создаст новый пул
+                if _executor is executor:
+                    _executor = None
+                raise
     
     def _get_period_dates(self, period: str) -> Tuple[datetime, datetime]:
         """Получение дат начала и конца периода"""
-        now = datetime.now()
-        if period == 'week':
-            date_from = now - timedelta(days=7)
-        elif period == 'month':
-            date_from = now - timedelta(days=30)
-        elif period == 'quarter':
-            date_from = now - timedelta(days=90)
-        else:  # year
-            date_from = now - timedelta(days=365)
-        return date_from, now
+        return get_period_dates(period)
     
     async def _generate_clients_sheet(self, date_from: datetime, date_to: datetime) -> None:
         """Создание вкладки с отчетом по клиентам"""
-        sheet = self.wb.create_sheet("Клиенты")
-        
         # Заголовки
         headers = [
             "Клиент",
@@ -71,53 +157,48 @@ class ExcelReportGenerator:
             "Начало работы",
             "Последняя активность"
         ]
+        sheet = self.spool.sheet("Клиенты", headers)
         
-        self._write_headers(sheet, headers)
-        
-        # Получаем данные по клиентам
-        async with get_session() as session:
-            # Получаем клиентов с предзагруженными проектами и задачами
-            stmt = (
-                select(Client)
-                .options(
-                    selectinload(Client.projects),
-                    selectinload(Client.tasks)
-                )
+        # Итоги по задачам за период берутся из ежедневных сводок
+        totals = await get_client_totals(date_from.date(), date_to.date())
+
+        # Число проектов считается в БД одним запросом с группировкой
+        stmt = (
+            select(
+                Client.id,
+                Client.name,
+                func.count(Project.id),
+                func.count(Project.id).filter(Project.status == 'active'),
+                Client.created_at,
+                Client.updated_at
             )
-            result = await session.execute(stmt)
-            clients = result.scalars().all()
+            .outerjoin(Project, Project.client_id == Client.id)
+            .group_by(Client.id)
+            .order_by(Client.name)
+        )
 
-            row = 2  # Начинаем после заголовков
-            for client in clients:
-                # Проекты уже загружены
-                total_projects = len(client.projects)
-                active_projects = len([p for p in client.projects if p.status == 'active'])
-                
-                # Фильтруем задачи по периоду
-                tasks_list = [t for t in client.tasks if date_from <= t.created_at <= date_to]
-                completed_tasks = len([t for t in tasks_list if t.status == Task.STATUS_COMPLETED])
+        async with get_read_session() as session:
+            result = await session.execute(stmt)
+            for client_id, name, total_projects, active_projects, created_at, updated_at in result:
+                client_totals = totals.get(client_id, RollupTotals())
                 
                 # Записываем данные
                 data = [
-                    client.name,
+                    name,
                     total_projects,
                     active_projects,
-                    len(tasks_list),
-                    completed_tasks,
-                    client.created_at.strftime("%d.%m.%Y"),
-                    client.updated_at.strftime("%d.%m.%Y")
+                    client_totals.total_tasks,
+                    client_totals.completed_tasks,
+                    created_at.strftime("%d.%m.%Y"),
+                    updated_at.strftime("%d.%m.%Y")
                 ]
-                
-                for col, value in enumerate(data, 1):
-                    sheet.cell(row=row, column=col, value=value)
-                row += 1
-                
-        self._adjust_column_width(sheet)
+                sheet.append(data)
+
+        sheet.close()
+        await self._sheet_done("Клиенты")
     
     async def _generate_projects_sheet(self, date_from: datetime, date_to: datetime) -> None:
         """Создание вкладки с отчетом по проектам"""
-        sheet = self.wb.create_sheet("Проекты")
-        
         headers = [
             "Проект",
             "Клиент",
@@ -128,53 +209,54 @@ class ExcelReportGenerator:
             "Выполнено задач",
             "Команда"
         ]
+        sheet = self.spool.sheet("Проекты", headers)
         
-        self._write_headers(sheet, headers)
-        
-        # Получаем данные по проектам
-        async with get_session() as session:
-            # Загружаем проекты с клиентами и задачами
-            stmt = (
-                select(Project)
-                .options(
-                    joinedload(Project.client),
-                    selectinload(Project.tasks).joinedload(Task.assignee)
-                )
-                .where(Project.created_at.between(date_from, date_to))
+        totals = await get_project_totals(date_from.date(), date_to.date())
+
+        # Команда - исполнители задач проекта за период (фильтр периода в условии JOIN)
+        stmt = (
+            select(
+                Project.id,
+                Project.name,
+                Client.name,
+                Project.status,
+                Project.start_date,
+                Project.end_date,
+                _distinct_names(User.full_name)
             )
-            result = await session.execute(stmt)
-            projects = result.unique().scalars().all()
+            .outerjoin(Client, Client.id == Project.client_id)
+            .outerjoin(
+                Task,
+                and_(Task.project_id == Project.id, Task.created_at.between(date_from, date_to))
+            )
+            .outerjoin(User, User.id == Task.assignee_id)
+            .where(Project.created_at.between(date_from, date_to))
+            .group_by(Project.id, Client.name)
+            .order_by(Project.name)
+        )
 
-            row = 2
-            for project in projects:
-                # Фильтруем задачи по периоду
-                tasks_list = [t for t in project.tasks if date_from <= t.created_at <= date_to]
-                completed_tasks = len([t for t in tasks_list if t.status == Task.STATUS_COMPLETED])
-                
-                # Собираем команду из исполнителей задач
-                team = {t.assignee.full_name for t in tasks_list if t.assignee}
+        async with get_read_session() as session:
+            result = await session.execute(stmt)
+            for project_id, name, client_name, status, start_date, end_date, team in result:
+                project_totals = totals.get(project_id, RollupTotals())
                 
                 data = [
-                    project.name,
-                    project.client.name if project.client else "Нет",
-                    project.status,
-                    project.start_date.strftime("%d.%m.%Y") if project.start_date else "Не указано",
-                    project.end_date.strftime("%d.%m.%Y") if project.end_date else "Не указано",
-                    len(tasks_list),
-                    completed_tasks,
-                    ", ".join(team) if team else "Нет исполнителей"
+                    name,
+                    client_name or "Нет",
+                    status,
+                    start_date.strftime("%d.%m.%Y") if start_date else "Не указано",
+                    end_date.strftime("%d.%m.%Y") if end_date else "Не указано",
+                    project_totals.total_tasks,
+                    project_totals.completed_tasks,
+                    team or "Нет исполнителей"
                 ]
-                
-                for col, value in enumerate(data, 1):
-                    sheet.cell(row=row, column=col, value=value)
-                row += 1
-                
-        self._adjust_column_width(sheet)
+                sheet.append(data)
+
+        sheet.close()
+        await self._sheet_done("Проекты")
     
     async def _generate_employees_sheet(self, date_from: datetime, date_to: datetime) -> None:
         """Создание вкладки с отчетом по сотрудникам"""
-        sheet = self.wb.create_sheet("Сотрудники")
-        
         headers = [
             "Сотрудник",
             "Всего задач",
@@ -182,55 +264,49 @@ class ExcelReportGenerator:
             "В работе",
             "Проекты"
         ]
+        sheet = self.spool.sheet("Сотрудники", headers)
         
-        self._write_headers(sheet, headers)
-        
-        # Получаем данные по сотрудникам
-        async with get_session() as session:
-            # Получаем всех пользователей
-            employees = await session.execute(
-                select(User)
-                .where(User.role == 'user')
+        totals = await get_user_totals(date_from.date(), date_to.date())
+
+        # Задачи всех сотрудников за период - один запрос с группировкой
+        stmt = (
+            select(
+                User.id,
+                User.full_name,
+                User.username,
+                User.telegram_id,
+                func.count(Task.id).filter(Task.status == Task.STATUS_IN_PROGRESS),
+                _distinct_names(Project.name)
             )
-            employees = employees.scalars().all()
-
-            row = 2
-            for employee in employees:
-                # Получаем задачи сотрудника за период
-                tasks = await session.execute(
-                    select(Task)
-                    .options(joinedload(Task.project))
-                    .where(
-                        Task.assignee_id == employee.id,
-                        Task.created_at.between(date_from, date_to)
-                    )
-                )
-                tasks_list = tasks.unique().scalars().all()
-                
-                completed_tasks = len([t for t in tasks_list if t.status == Task.STATUS_COMPLETED])
-                in_progress_tasks = len([t for t in tasks_list if t.status == Task.STATUS_IN_PROGRESS])
-                
-                # Собираем проекты
-                projects = {t.project.name for t in tasks_list if t.project}
+            .outerjoin(
+                Task,
+                and_(Task.assignee_id == User.id, Task.created_at.between(date_from, date_to))
+            )
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(User.role == 'user')
+            .group_by(User.id)
+            .order_by(User.id)
+        )
+
+        async with get_read_session() as session:
+            result = await session.execute(stmt)
+            for user_id, full_name, username, telegram_id, in_progress_tasks, projects in result:
+                employee_totals = totals.get(user_id, RollupTotals())
                 
                 data = [
-                    employee.full_name or employee.username or f"User {employee.telegram_id}",
-                    len(tasks_list),
-                    completed_tasks,
+                    full_name or username or f"User {telegram_id}",
+                    employee_totals.total_tasks,
+                    employee_totals.completed_tasks,
                     in_progress_tasks,
-                    ", ".join(projects) if projects else "Нет проектов"
+                    projects or "Нет проектов"
                 ]
-                
-                for col, value in enumerate(data, 1):
-                    sheet.cell(row=row, column=col, value=value)
-                row += 1
-                
-        self._adjust_column_width(sheet)
+                sheet.append(data)
+
+        sheet.close()
+        await self._sheet_done("Сотрудники")
 
     async def _generate_tasks_sheet(self, date_from: datetime, date_to: datetime) -> None:
         """Создание вкладки со всеми задачами"""
-        sheet = self.wb.create_sheet("Задачи")
-        
         headers = [
             "Задача",
             "Описание",
@@ -242,71 +318,45 @@ class ExcelReportGenerator:
             "Создана",
             "Обновлена"
         ]
-        
-        self._write_headers(sheet, headers)
-        
-        async with get_session() as session:
-            # Получаем все задачи с загрузкой связанных данных
-            stmt = (
-                select(Task)
-                .options(
-                    joinedload(Task.assignee),
-                    joinedload(Task.client),
-                    joinedload(Task.project)
-                )
-                .where(Task.created_at.between(date_from, date_to))
-                .order_by(Task.created_at.desc())
-            )
-            tasks = await session.execute(stmt)
-            tasks_list = tasks.unique().scalars().all()
+        sheet = self.spool.sheet("Задачи", headers)
 
-            row = 2
-            for task in tasks_list:
-                data = [
-                    task.title,
-                    task.description or "",
-                    task.status,
-                    task.assignee.full_name if task.assignee else "Не назначен",
-                    task.client.name if task.client else "Не указан",
-                    task.project.name if task.project else "Не указан",
-                    task.due_date.strftime("%d.%m.%Y") if task.due_date else "Не указан",
-                    task.created_at.strftime("%d.%m.%Y"),
-                    task.updated_at.strftime("%d.%m.%Y")
-                ]
-                
-                for col, value in enumerate(data, 1):
-                    sheet.cell(row=row, column=col, value=str(value))
-                row += 1
-                
-        self._adjust_column_width(sheet)
-    
-    def _write_headers(self, sheet, headers: List[str]) -> None:
-        """Запись и форматирование заголовков"""
-        # Стили для заголовков
-        header_font = Font(bold=True)
-        header_fill = PatternFill(
-            start_color='CCE5FF',
-            end_color='CCE5FF',
-            fill_type='solid'
+        # Только нужные колонки, без ORM-объектов: строки не накапливаются в сессии
+        stmt = (
+            select(
+                Task.title,
+                Task.description,
+                Task.status,
+                User.full_name,
+                Client.name,
+                Project.name,
+                Task.due_date,
+                Task.created_at,
+                Task.updated_at
+            )
+            .outerjoin(User, User.id == Task.assignee_id)
+            .outerjoin(Client, Client.id == Task.client_id)
+            .outerjoin(Project, Project.id == Task.project_id)
+            .where(Task.created_at.between(date_from, date_to))
+            .order_by(Task.created_at.desc())
+            .execution_options(yield_per=REPORT_ROW_BATCH)
         )
-        
-        # Записываем заголовки
-        for col, header in enumerate(headers, 1):
-            cell = sheet.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-    
-    def _adjust_column_width(self, sheet) -> None:
-        """Автоматическая подстройка ширины столбцов"""
-        for column in sheet.columns:
-            max_length = 0
-            column = [cell for cell in column]
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)
-            sheet.column_dimensions[column[0].column_letter].width = adjusted_width
\ No newline at end of file
+
+        async with get_read_session() as session:
+            # Курсор на стороне сервера: в памяти не больше одной пачки строк
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                for title, description, status, assignee, client, project, due_date, created_at, updated_at in rows:
+                    sheet.append([
+                        title,
+                        description or "",
+                        status,
+                        assignee or "Не назначен",
+                        client or "Не указан",
+                        project or "Не указан",
+                        due_date.strftime("%d.%m.%Y") if due_date else "Не указан",
+                        created_at.strftime("%d.%m.%Y"),
+                        updated_at.strftime("%d.%m.%Y")
+                    ])
+
+        sheet.close()
+        await self._sheet_done("Задачи")
@@ -0,0 +1,124 @@
+"""
+Сборка xlsx-файла отчета из готовых строк
+
+Выполняется в процессе пула (см. get_report_executor в excel.py), поэтому
+работает только с простыми значениями. Строки передаются через файл-спул:
+последовательность записей pickle
+    ('sheet', title, headers) - начало листа;
+    ('rows', [tuple, ...])    - пачка строк текущего листа.
+Ширина столбцов в write-only листе задается до первой строки, поэтому
+она считается по заголовку и первой пачке строк, дальше строки пишутся сразу.
+"""
+import pickle
+from typing import Any, BinaryIO, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+
+# Размер пачки строк: курсор, спул и выборка для расчета ширины столбцов
+REPORT_ROW_BATCH = 1000
+
+# Ограничение ширины столбца (длинные описания задач)
+MAX_COLUMN_WIDTH = 80
+
+class SheetWriter:
+    """Запись строк в write-only лист с расчетом ширины столбцов"""
+
+    def __init__(self, wb: Workbook, title: str, headers: List[str], sample_size: int = REPORT_ROW_BATCH):
+        self.sheet = wb.create_sheet(title)
+        self.sample_size = sample_size
+        self.widths = [0] * len(headers)
+        self._pending: List[Sequence[Any]] = []
+        self._flushed = False
+        self._header = [self._header_cell(header) for header in headers]
+        self._measure(headers)
+
+    def _header_cell(self, value: str) -> WriteOnlyCell:
+        cell = WriteOnlyCell(self.sheet, value=value)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(
+            start_color='CCE5FF',
+            end_color='CCE5FF',
+            fill_type='solid'
+        )
+        cell.alignment = Alignment(horizontal='center')
+        return cell
+
+    def _measure(self, row: Iterable[Any]) -> None:
+        for col, value in enumerate(row):
+            if value is not None:
+                self.widths[col] = max(self.widths[col], len(str(value)))
+
+    def _flush(self) -> None:
+        """Фиксация ширины столбцов и запись накопленных строк"""
+        for col, width in enumerate(self.widths, 1):
+            self.sheet.column_dimensions[get_column_letter(col)].width = min(width + 2, MAX_COLUMN_WIDTH)
+        self.sheet.append(self._header)
+        for row in self._pending:
+            self.sheet.append(row)
+        self._pending = []
+        self._flushed = True
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Добавление строки"""
+        if self._flushed:
+            self.sheet.append(row)
+            return
+        self._measure(row)
+        self._pending.append(row)
+        if len(self._pending) >= self.sample_size:
+            self._flush()
+
+    def close(self) -> None:
+        """Запись оставшихся строк (лист с одними заголовками тоже записывается)"""
+        if not self._flushed:
+            self._flush()
+
+class RowSpool:
+    """Запись листов и строк отчета в файл-спул пачками"""
+
+    def __init__(self, file: BinaryIO, batch_size: int = REPORT_ROW_BATCH):
+        self.file = file
+        self.batch_size = batch_size
+        self._rows: List[tuple] = []
+
+    def sheet(self, title: str, headers: List[str]) -> "RowSpool":
+        """Начало нового листа"""
+        self.close()
+        pickle.dump(('sheet', title, headers), self.file, pickle.HIGHEST_PROTOCOL)
+        return self
+
+    def append(self, row: Sequence[Any]) -> None:
+        """Добавление строки текущего листа"""
+        self._rows.append(tuple(row))
+        if len(self._rows) >= self.batch_size:
+            self.close()
+
+    def close(self) -> None:
+        """Запись накопленной пачки строк"""
+        if self._rows:
+            pickle.dump(('rows', self._rows), self.file, pickle.HIGHEST_PROTOCOL)
+            self._rows = []
+
+def build_workbook(spool_path: str, output_path: str) -> None:
+    """Сборка xlsx-файла из спула (точка входа процесса пула)"""
+    wb = Workbook(write_only=True)
+    sheet: Optional[SheetWriter] = None
+    with open(spool_path, 'rb') as spool:
+        while True:
+            try:
+                record = pickle.load(spool)
+            except EOFError:
+                break
+            if record[0] == 'sheet':
+                if sheet is not None:
+                    sheet.close()
+                sheet = SheetWriter(wb, record[1], record[2])
+            else:
+                for row in record[1]:
+                    sheet.append(row)
+    if sheet is not None:
+        sheet.close()
+    wb.save(output_path)
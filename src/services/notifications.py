@@ -4,8 +4,12 @@ import re
 from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from telegram import Bot
-from src.database.db import db
+from src.config import get_config
+from src.database.db import db, get_pool_stats
+from src.database.partitions import run_partition_maintenance
+from src.services.rollups import run_daily_rollup
 from src.database.models import User, Task
 
 # Telegram Bot instance для user_bot
@@ -102,6 +106,10 @@ async def send_task_notifications(bot: Bot):
         except Exception as e:
             logger.error(f"Ошибка при отправке уведомления {user.id}: {e}")
 
+async def log_pool_stats():
+    """Записывает в лог статистику пула соединений с БД"""
+    logger.info(f"Статистика пула соединений БД: {get_pool_stats()}")
+
 def start_scheduler(bot):
     """Запускает планировщик уведомлений"""
     scheduler = AsyncIOScheduler(timezone="Europe/Moscow")  # Указываем МСК
@@ -126,5 +134,30 @@ def start_scheduler(bot):
         replace_existing=True,
     )
 
+    # Ежедневное обслуживание секций task_times
+    scheduler.add_job(
+        run_partition_maintenance,
+        trigger=CronTrigger(hour=3, minute=0),
+        id="partition_maintenance",
+        replace_existing=True,
+    )
+
+    # Ежедневные сводки по задачам за закрытые дни
+    scheduler.add_job(
+        run_daily_rollup,
+        trigger=CronTrigger(hour=3, minute=30),
+        id="daily_rollup",
+        replace_existing=True,
+    )
+
+    pool_stats_interval = get_config().db_pool_stats_interval
+    if pool_stats_interval > 0:
+        scheduler.add_job(
+            log_pool_stats,
+            trigger=IntervalTrigger(minutes=pool_stats_interval),
+            id="pool_stats",
+            replace_existing=True,
+        )
+
     scheduler.start()
     print("✅ Планировщик уведомлений запущен")
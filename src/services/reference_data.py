@@ -0,0 +1,96 @@
+"""
+Кэш справочных данных: клиенты, проекты и исполнители
+
+Списки меняются редко, а читаются на каждом шаге мастера создания задачи,
+поэтому хранятся в памяти процесса вместе с готовыми клавиатурами.
+Значения устаревают при фиксации любого изменения в их таблицах
+(подписка на изменения в src/database/db.py, в том числе из других
+процессов через src/database/change_feed.py). Пока текущий апдейт сам
+изменил таблицу, но еще не зафиксировал транзакцию, кэш для нее не используется.
+Значение для кэша загружается с основной БД: отстающая реплика не должна
+оставить в нем список без только что созданной записи до истечения TTL.
+"""
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Set
+
+from src.config import get_config
+from src.database.db import db, add_change_listener, pending_changes, read_your_writes, Change, ALL_TABLES
+from src.database.models import Client, Project, User
+from src.utils.cache import VersionedCache
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+CLIENT_TABLES = frozenset({Client.__tablename__})
+PROJECT_TABLES = frozenset({Project.__tablename__})
+USER_TABLES = frozenset({User.__tablename__})
+
+reference_cache = VersionedCache(
+    maxsize=config.reference_cache_size,
+    ttl=config.reference_cache_ttl
+)
+
+_MISSING = object()
+
+async def cached(key: Hashable, tables: Iterable[str], load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Значение из кэша или результат load(), сохраненный в кэш
+
+    Args:
+        key: Ключ значения
+        tables: Таблицы, от которых зависит значение
+        load: Загрузка значения при промахе
+    """
+    tables = frozenset(tables)
+    if any(table in tables for table, _ in pending_changes()):
+        return await load()
+
+    value = reference_cache.get(key, tables, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    version = reference_cache.version(tables)
+    with read_your_writes():
+        value = await load()
+    reference_cache.set(key, value, version)
+    return value
+
+def invalidate_tables(tables: Iterable[str]) -> None:
+    """Сброс значений, зависящих от таблиц"""
+    reference_cache.invalidate(tables)
+
+def _on_changes(changes: Set[Change]) -> None:
+    tables = {table for table, _ in changes}
+    if ALL_TABLES in tables:
+        reference_cache.invalidate_all()
+    else:
+        invalidate_tables(tables)
+
+add_change_listener(_on_changes)
+
+def executor_name(user: User) -> str:
+    """Отображаемое имя исполнителя"""
+    return user.full_name or user.username or f"User {user.telegram_id}"
+
+async def get_clients() -> List[Dict[str, Any]]:
+    """Клиенты: [{'id', 'name'}]"""
+    async def load() -> List[Dict[str, Any]]:
+        return [client.to_dict() for client in await db.get_all(Client)]
+    return await cached(('clients',), CLIENT_TABLES, load)
+
+async def get_client_projects(client_id: int) -> List[Dict[str, Any]]:
+    """Проекты клиента: [{'id', 'name', 'client_id', 'description', 'status'}]"""
+    async def load() -> List[Dict[str, Any]]:
+        return [project.to_dict() for project in await db.get_all(Project, client_id=client_id)]
+    return await cached(('client_projects', client_id), PROJECT_TABLES, load)
+
+async def get_executors() -> List[Dict[str, Any]]:
+    """Исполнители: [{'id', 'name'}]"""
+    async def load() -> List[Dict[str, Any]]:
+        return [
+            {'id': user.id, 'name': executor_name(user)}
+            for user in await db.get_all(User)
+            if user.id
+        ]
+    return await cached(('executors',), USER_TABLES, load)
@@ -0,0 +1,270 @@
+"""
+Очередь Excel-отчетов
+
+Отчет определяется ключом (период, день, отпечаток данных). Одинаковые
+запросы, пока отчет собирается, объединяются: файл строится один раз,
+и его получают все ожидающие. Отпечаток меняется при любом изменении
+данных отчета, поэтому запрос после изменения запускает новую сборку.
+
+Готовые файлы сохраняются в файловом кэше (REPORT_CACHE_DIR, LRU до
+REPORT_CACHE_SIZE_MB) с тем же ключом, поэтому повтор отчета без изменений
+данных стоит одного запроса отпечатка. Границы периода в ключе - с точностью
+до дня.
+
+После отправки file_id документа запоминается с ключом отчета: тот же отчет
+повторно отправляется по file_id, без загрузки файла в Telegram. file_id
+действителен только для отправившего бота, поэтому хранится вместе с его id.
+
+Одновременно собирается не больше REPORT_CONCURRENCY отчетов, остальные
+ждут в очереди. Всего в работе и в очереди - не больше REPORT_QUEUE_SIZE
+отчетов, к одной сборке присоединяются не больше REPORT_MAX_WAITERS
+запросов; сверх лимитов запросы отклоняются (ReportQueueFull).
+
+Запрос отпечатка и сборка выполняются вне контекста апдейта (_detached):
+не в его единице работы, а в собственных коротких сессиях, поэтому
+соединение апдейта не простаивает в транзакции, пока отчет ждет очереди,
+собирается и отправляется.
+Этапы сборки (см. ExcelReportGenerator.progress) рассылаются всем ожидающим
+в фоне: сборка не ждет Telegram, а медленному получателю уходит только
+последний этап.
+"""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import String, cast, func, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config import get_config
+from src.database.db import get_read_session
+from src.database.models import Client, Project, Task, User
+from src.services.excel import ExcelReportGenerator, ProgressCallback, get_period_dates
+from src.utils.cache import FileCache, TTLCache
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Период, дата начала, дата конца, отпечаток данных
+ReportKey = Tuple[str, date, date, str]
+
+report_cache = FileCache(config.report_cache_dir, config.report_cache_size_mb * 1024 * 1024)
+
+# Ключ отчета содержит дату, поэтому file_id нужен не дольше суток
+REPORT_FILE_ID_TTL = 24 * 3600
+_file_ids = TTLCache(maxsize=256, ttl=REPORT_FILE_ID_TTL)
+
+T = TypeVar('T')
+
+class ReportQueueFull(Exception):
+    """Очередь отчетов заполнена"""
+
+def _detached(coro: Awaitable[T]) -> "asyncio.Task[T]":
+    """Задача в пустом контексте: без единицы работы апдейта, сессии БД - свои"""
+    return asyncio.create_task(coro, context=contextvars.Context())
+
+def _table_state(model, changed):
+    """Число строк таблицы и признак последнего изменения"""
+    return select(
+        literal(model.__tablename__),
+        func.count(),
+        cast(changed, String)
+    ).select_from(model)
+
+async def get_data_watermark() -> str:
+    """
+    Отпечаток данных отчета
+
+    Число строк и время последнего изменения задач, клиентов и проектов;
+    у пользователей нет updated_at, поэтому берется хэш полей, попадающих в отчет.
+    """
+    user_fields = func.concat_ws('|', User.id, User.telegram_id, User.username, User.full_name, User.role)
+    stmt = union_all(
+        _table_state(Task, func.max(Task.updated_at)),
+        _table_state(Client, func.max(Client.updated_at)),
+        _table_state(Project, func.max(Project.updated_at)),
+        _table_state(
+            User,
+            func.md5(func.string_agg(user_fields, aggregate_order_by(literal_column("','"), User.id)))
+        ),
+    )
+    async with get_read_session() as session:
+        try:
+            rows = (await session.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при получении отпечатка данных отчета: {e}", exc_info=True)
+            raise
+    return hashlib.sha1(repr(sorted(tuple(row) for row in rows)).encode()).hexdigest()[:16]
+
+async def get_report_key(period: str) -> ReportKey:
+    """Ключ отчета за период при текущих данных"""
+    date_from, date_to = get_period_dates(period)
+    return period, date_from.date(), date_to.date(), await _detached(get_data_watermark())
+
+def _cache_name(key: ReportKey) -> str:
+    period, date_from, date_to, watermark = key
+    return f"{period}_{date_from:%Y%m%d}_{date_to:%Y%m%d}_{watermark}.xlsx"
+
+def get_report_file_id(bot_id: int, key: ReportKey) -> Optional[str]:
+    """file_id ранее отправленного ботом отчета"""
+    return _file_ids.get((bot_id, key))
+
+def remember_report_file_id(bot_id: int, key: ReportKey, file_id: str) -> None:
+    """Сохранение file_id отправленного отчета"""
+    _file_ids.set((bot_id, key), file_id)
+
+def forget_report_file_id(bot_id: int, key: ReportKey) -> None:
+    """Удаление file_id, который Telegram больше не принимает"""
+    _file_ids.pop((bot_id, key))
+
+class ReportJob:
+    """Сборка одного отчета и ее ожидающие"""
+
+    def __init__(self, key: ReportKey):
+        self.key = key
+        self.period = key[0]
+        self.status = "В очереди"
+        self.listeners: List[ProgressCallback] = []
+        self._sending: Dict[ProgressCallback, asyncio.Task] = {}
+        self.waiters = 0
+        self.directory = tempfile.mkdtemp(prefix='report_')
+        self.path = os.path.join(self.directory, 'report.xlsx')
+        self.task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: ProgressCallback) -> None:
+        """Подписка ожидающего на этапы сборки (текущий этап отправляется сразу)"""
+        self.listeners.append(listener)
+        self._schedule(listener)
+
+    def remove_listener(self, listener: ProgressCallback) -> None:
+        """Отписка: неотправленный этап больше не нужен и не должен перезаписать сообщение"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        sending = self._sending.pop(listener, None)
+        if sending is not None:
+            sending.cancel()
+
+    async def set_status(self, status: str) -> None:
+        """Новый этап сборки для всех ожидающих (сборка не ждет отправки)"""
+        self.status = status
+        for listener in list(self.listeners):
+            self._schedule(listener)
+
+    def _schedule(self, listener: ProgressCallback) -> None:
+        """Отправка этапа ожидающему: не больше одной одновременно"""
+        sending = self._sending.get(listener)
+        if sending is not None and not sending.done():
+            # Текущая отправка по завершении передаст последний этап
+            return
+        self._sending[listener] = asyncio.create_task(self._send(listener))
+
+    async def _send(self, listener: ProgressCallback) -> None:
+        """Передача этапов одному ожидающему, промежуточные пропускаются"""
+        sent = None
+        while sent != self.status and listener in self.listeners:
+            sent = self.status
+            try:
+                await listener(sent)
+            except Exception as e:
+                logger.warning(f"Не удалось передать прогресс отчета {self.key}: {e}")
+
+    def release(self) -> None:
+        """Удаление файла, когда сборка завершена и ожидающих не осталось"""
+        if self.waiters == 0 and self.task is not None and self.task.done():
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+class ReportQueue:
+    """Очередь отчетов с ограничением параллельности и объединением одинаковых запросов"""
+
+    def __init__(self, concurrency: int, max_jobs: int, max_waiters: int):
+        """
+        Args:
+            concurrency: Отчетов, собираемых одновременно
+            max_jobs: Отчетов в работе и в очереди
+            max_waiters: Запросов, ожидающих одну сборку
+        """
+        self.max_jobs = max_jobs
+        self.max_waiters = max_waiters
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs: Dict[ReportKey, ReportJob] = {}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @asynccontextmanager
+    async def report(self, key: ReportKey, progress: Optional[ProgressCallback] = None) -> AsyncIterator[str]:
+        """
+        Путь к файлу отчета (действителен внутри блока)
+
+        Args:
+            key: Ключ отчета (см. get_report_key)
+            progress: Получает текущий этап сборки
+
+        Raises:
+            ReportQueueFull: Очередь заполнена
+        """
+        cached = report_cache.get(_cache_name(key))
+        if cached is not None:
+            logger.info(f"Отчет {key} взят из кэша")
+            yield cached
+            return
+
+        job = self._jobs.get(key)
+        if job is None:
+            if len(self._jobs) >= self.max_jobs:
+                raise ReportQueueFull(f"В очереди уже {len(self._jobs)} отчетов")
+            job = ReportJob(key)
+            self._jobs[key] = job
+            # Сборка общая для всех ожидающих и не должна работать в сессиях первого из них
+            job.task = _detached(self._run(job))
+            job.task.add_done_callback(lambda _, job=job: self._finish(job))
+        elif job.waiters >= self.max_waiters:
+            raise ReportQueueFull(f"Сборку отчета {key} уже ждут {job.waiters} запросов")
+        else:
+            logger.info(f"Запрос присоединен к сборке отчета {key}")
+
+        job.waiters += 1
+        try:
+            if progress is not None:
+                job.add_listener(progress)
+            # Отмена одного ожидающего не прерывает сборку для остальных
+            await asyncio.shield(job.task)
+            yield job.path
+        finally:
+            if progress is not None:
+                job.remove_listener(progress)
+            job.waiters -= 1
+            job.release()
+
+    async def _run(self, job: ReportJob) -> None:
+        async with self._semaphore:
+            await job.set_status("Сбор данных")
+            logger.info(f"Сборка отчета {job.key}")
+            try:
+                generator = ExcelReportGenerator(progress=job.set_status)
+                await generator.write_report(job.period, job.path)
+            except Exception as e:
+                logger.error(f"Ошибка при сборке отчета {job.key}: {e}", exc_info=True)
+                raise
+        try:
+            report_cache.put(_cache_name(job.key), job.path)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить отчет {job.key} в кэш: {e}")
+
+    def _finish(self, job: ReportJob) -> None:
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        # Ошибка уже записана в лог, даже если ожидающих не осталось
+        if not job.task.cancelled():
+            job.task.exception()
+        job.release()
+
+report_queue = ReportQueue(config.report_concurrency, config.report_queue_size, config.report_max_waiters)
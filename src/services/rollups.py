@@ -0,0 +1,337 @@
+"""
+Ежедневные сводки по задачам для отчетов и аналитики
+
+Запуск пересчета вручную: python -m src.services.rollups [--from ГГГГ-ММ-ДД]
+
+Сводки хранятся в work_reports (по сотрудникам и итог по всем задачам
+в строке с user_id = NULL), project_reports и client_reports: одна строка
+на сущность за день. За день учитываются:
+    total_tasks     - задачи, созданные в этот день;
+    completed_tasks - задачи, завершенные в этот день (tasks.completed_at);
+    total_time      - длительность интервалов task_times, начатых в этот день, в минутах.
+Дни - местные (TIMEZONE): created_at и completed_at хранятся в UTC и
+переводятся в местное время, work_date уже местная дата.
+
+Задание пересчитывает закрытые дни (до вчерашнего включительно) с запасом
+в ROLLUP_LOOKBACK_DAYS дней на поздние изменения. Итоговые строки пишутся
+за каждый день, даже без активности, поэтому последний день итоговых строк
+служит отметкой: до него (включительно) сводки полные. Чтение за период
+суммирует сводки до отметки и досчитывает оставшиеся дни по задачам.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.config import get_config
+from src.database.db import engine, get_read_session
+from src.database.models import WorkReport
+
+logger = logging.getLogger(__name__)
+
+config = get_config()
+
+# Размер пачки дней, пересчитываемой в одной транзакции
+ROLLUP_CHUNK_DAYS = 31
+
+# Ключ advisory-блокировки: пересчет не должен идти параллельно
+ROLLUP_LOCK_KEY = 7301
+
+@dataclass(frozen=True)
+class RollupLevel:
+    """Уровень сводки: таблица и выражения сущности для задач и интервалов"""
+    table: str
+    entity_column: str
+    task_key: str
+    time_key: str
+    project_key: Optional[str] = None  # для клиентов: проекты, созданные за день
+    report_type: bool = False  # есть ли колонка report_type
+
+@dataclass
+class RollupTotals:
+    """Итоги сводки за период"""
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    total_time: int = 0  # в минутах
+    total_projects: int = 0
+
+USERS = RollupLevel('work_reports', 'user_id', 't.assignee_id', 'tt.user_id', report_type=True)
+PROJECTS = RollupLevel('project_reports', 'project_id', 't.project_id', 't.project_id')
+CLIENTS = RollupLevel('client_reports', 'client_id', 't.client_id', 't.client_id', project_key='p.client_id')
+# Итог по всем задачам: сущность 0 сохраняется как user_id = NULL
+COMPANY = RollupLevel('work_reports', 'user_id', '0', '0', report_type=True)
+
+LEVELS = (USERS, PROJECTS, CLIENTS, COMPANY)
+
+def _local_day(column: str) -> str:
+    """Местная дата метки времени, хранящейся в UTC"""
+    return f"({column} AT TIME ZONE 'UTC' AT TIME ZONE CAST(:tz AS TEXT))::date"
+
+def _in_days(column: str) -> str:
+    """Метка времени (UTC) попадает в местные дни [date_from, date_to)"""
+    bound = "(CAST(:{} AS DATE)::timestamp AT TIME ZONE CAST(:tz AS TEXT) AT TIME ZONE 'UTC')"
+    return f"{column} >= {bound.format('date_from')} AND {column} < {bound.format('date_to')}"
+
+def _daily_sql(level: RollupLevel) -> str:
+    """Итоги по сущностям и дням за [date_from, date_to)"""
+    ctes = [
+        f"created AS ("
+        f"SELECT {level.task_key} AS entity_id, {_local_day('t.created_at')} AS day, count(*) AS total_tasks "
+        f"FROM tasks t "
+        f"WHERE {_in_days('t.created_at')} "
+        f"AND {level.task_key} IS NOT NULL "
+        f"GROUP BY 1, 2)",
+        f"completed AS ("
+        f"SELECT {level.task_key} AS entity_id, {_local_day('t.completed_at')} AS day, count(*) AS completed_tasks "
+        f"FROM tasks t "
+        f"WHERE {_in_days('t.completed_at')} "
+        f"AND {level.task_key} IS NOT NULL "
+        f"GROUP BY 1, 2)",
+        f"tracked AS ("
+        f"SELECT {level.time_key} AS entity_id, tt.work_date AS day, "
+        f"coalesce(sum(tt.duration), 0) / 60 AS total_time "
+        f"FROM task_times tt JOIN tasks t ON t.id = tt.task_id "
+        f"WHERE tt.work_date >= CAST(:date_from AS DATE) AND tt.work_date < CAST(:date_to AS DATE) "
+        f"AND {level.time_key} IS NOT NULL "
+        f"GROUP BY 1, 2)",
+    ]
+    joins = (
+        "created FULL JOIN completed USING (entity_id, day) "
+        "FULL JOIN tracked USING (entity_id, day)"
+    )
+    total_projects = "0"
+    if level.project_key:
+        ctes.append(
+            f"created_projects AS ("
+            f"SELECT {level.project_key} AS entity_id, {_local_day('p.created_at')} AS day, count(*) AS total_projects "
+            f"FROM projects p "
+            f"WHERE {_in_days('p.created_at')} "
+            f"AND {level.project_key} IS NOT NULL "
+            f"GROUP BY 1, 2)"
+        )
+        joins += " FULL JOIN created_projects USING (entity_id, day)"
+        total_projects = "coalesce(total_projects, 0)"
+
+    return (
+        f"WITH {', '.join(ctes)} "
+        f"SELECT entity_id, day, "
+        f"coalesce(total_tasks, 0) AS total_tasks, "
+        f"coalesce(completed_tasks, 0) AS completed_tasks, "
+        f"coalesce(total_time, 0) AS total_time, "
+        f"{total_projects} AS total_projects "
+        f"FROM {joins}"
+    )
+
+def _level_filter(level: RollupLevel) -> str:
+    """Условие отбора строк уровня в таблице сводок"""
+    if not level.report_type:
+        return "TRUE"
+    entity_condition = "IS NULL" if level is COMPANY else "IS NOT NULL"
+    return (
+        f"report_type = '{WorkReport.REPORT_TYPE_DAILY}' "
+        f"AND {level.entity_column} {entity_condition}"
+    )
+
+def _insert_sql(level: RollupLevel) -> str:
+    """INSERT ... SELECT сводок уровня за [date_from, date_to)"""
+    columns = [level.entity_column, 'report_date', 'total_tasks', 'completed_tasks', 'total_time']
+    values = ['entity_id', 'day', 'total_tasks', 'completed_tasks', 'total_time']
+    source = f"({_daily_sql(level)}) rollup"
+    if level is COMPANY:
+        # Итоговая строка пишется за каждый день периода, в том числе без активности
+        values = [
+            'NULL',
+            'days.day::date',
+            'coalesce(rollup.total_tasks, 0)',
+            'coalesce(rollup.completed_tasks, 0)',
+            'coalesce(rollup.total_time, 0)',
+        ]
+        source = (
+            f"generate_series(CAST(:date_from AS DATE), CAST(:date_to AS DATE) - 1, interval '1 day') "
+            f"AS days(day) LEFT JOIN {source} ON rollup.day = days.day::date"
+        )
+    if level.project_key:
+        columns.append('total_projects')
+        values.append('total_projects')
+    if level.report_type:
+        columns.append('report_type')
+        values.append(f"'{WorkReport.REPORT_TYPE_DAILY}'")
+    columns.append('created_at')
+    values.append("timezone('utc', now())")
+
+    return (
+        f"INSERT INTO {level.table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values)} FROM {source}"
+    )
+
+async def get_watermark(conn: AsyncConnection) -> Optional[date]:
+    """Последний день, до которого (включительно) сводки полные"""
+    result = await conn.execute(text(
+        f"SELECT max(report_date) FROM {COMPANY.table} WHERE {_level_filter(COMPANY)}"
+    ))
+    return result.scalar_one_or_none()
+
+async def _first_data_day(conn: AsyncConnection) -> Optional[date]:
+    """Первый день, за который есть задачи или интервалы"""
+    result = await conn.execute(text(
+        f"SELECT least((SELECT {_local_day('min(created_at)')} FROM tasks), (SELECT min(work_date) FROM task_times))"
+    ), {'tz': config.timezone})
+    return result.scalar_one_or_none()
+
+async def rollup_days(date_from: date, date_to: date) -> None:
+    """
+    Пересчет сводок всех уровней за дни [date_from, date_to)
+
+    Каждая пачка дней пересчитывается в своей транзакции: старые строки
+    удаляются и записываются заново.
+    """
+    chunk_start = date_from
+    while chunk_start < date_to:
+        chunk_end = min(chunk_start + timedelta(days=ROLLUP_CHUNK_DAYS), date_to)
+        params = {'date_from': chunk_start, 'date_to': chunk_end, 'tz': config.timezone}
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': ROLLUP_LOCK_KEY})
+            for level in LEVELS:
+                await conn.execute(
+                    text(
+                        f"DELETE FROM {level.table} "
+                        f"WHERE report_date >= CAST(:date_from AS DATE) AND report_date < CAST(:date_to AS DATE) "
+                        f"AND {_level_filter(level)}"
+                    ),
+                    params
+                )
+                await conn.execute(text(_insert_sql(level)), params)
+        logger.info(f"Сводки пересчитаны за {chunk_start} - {chunk_end - timedelta(days=1)}")
+        chunk_start = chunk_end
+
+async def refresh_rollups(today: Optional[date] = None, date_from: Optional[date] = None) -> None:
+    """
+    Пересчет сводок за закрытые дни (до вчерашнего включительно)
+
+    Начало пересчета - самое раннее из: date_from, дня после отметки,
+    today минус ROLLUP_LOOKBACK_DAYS. Без отметки (первый запуск)
+    пересчитывается вся история.
+    """
+    today = today or date.today()
+    start = today - timedelta(days=max(config.rollup_lookback_days, 1))
+    if date_from is not None:
+        start = min(start, date_from)
+
+    async with engine.connect() as conn:
+        watermark = await get_watermark(conn)
+        if watermark is None:
+            first_day = await _first_data_day(conn)
+            if first_day is not None:
+                start = min(start, first_day)
+    if watermark is not None:
+        # Пропусков между отметкой и началом пересчета быть не должно
+        start = min(start, watermark + timedelta(days=1))
+
+    if start < today:
+        await rollup_days(start, today)
+
+async def run_daily_rollup() -> None:
+    """Плановый пересчет сводок (ошибки пишутся в лог)"""
+    try:
+        await refresh_rollups()
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при пересчете сводок: {e}", exc_info=True)
+
+async def _get_totals(level: RollupLevel, date_from: date, date_to: date) -> Dict[int, RollupTotals]:
+    """Итоги уровня за дни с date_from по date_to включительно"""
+    end = date_to + timedelta(days=1)
+    totals: Dict[int, RollupTotals] = {}
+
+    def add(rows) -> None:
+        for entity_id, total_tasks, completed_tasks, total_time, total_projects in rows:
+            entry = totals.setdefault(entity_id or 0, RollupTotals())
+            entry.total_tasks += int(total_tasks or 0)
+            entry.completed_tasks += int(completed_tasks or 0)
+            entry.total_time += int(total_time or 0)
+            entry.total_projects += int(total_projects or 0)
+
+    async with get_read_session() as session:
+        watermark = await get_watermark(await session.connection())
+        # Дни до отметки читаются из сводок
+        closed_end = end if watermark is None else min(end, watermark + timedelta(days=1))
+        if watermark is not None and date_from < closed_end:
+            total_projects = "sum(total_projects)" if level.project_key else "0"
+            result = await session.execute(
+                text(
+                    f"SELECT {level.entity_column}, sum(total_tasks), sum(completed_tasks), "
+                    f"sum(total_time), {total_projects} "
+                    f"FROM {level.table} "
+                    f"WHERE report_date >= CAST(:date_from AS DATE) AND report_date < CAST(:date_to AS DATE) "
+                    f"AND {_level_filter(level)} "
+                    f"GROUP BY 1"
+                ),
+                {'date_from': date_from, 'date_to': closed_end}
+            )
+            add(result.all())
+
+        # Остальные дни (обычно только сегодняшний) считаются по задачам
+        live_start = date_from if watermark is None else max(date_from, closed_end)
+        if live_start < end:
+            result = await session.execute(
+                text(
+                    f"SELECT entity_id, sum(total_tasks), sum(completed_tasks), sum(total_time), "
+                    f"sum(total_projects) FROM ({_daily_sql(level)}) rollup GROUP BY 1"
+                ),
+                {'date_from': live_start, 'date_to': end, 'tz': config.timezone}
+            )
+            add(result.all())
+
+    return totals
+
+async def get_user_totals(date_from: date, date_to: date) -> Dict[int, RollupTotals]:
+    """Итоги по сотрудникам (исполнителям) за период, включая обе границы"""
+    return await _get_totals(USERS, date_from, date_to)
+
+async def get_project_totals(date_from: date, date_to: date) -> Dict[int, RollupTotals]:
+    """Итоги по проектам за период, включая обе границы"""
+    return await _get_totals(PROJECTS, date_from, date_to)
+
+async def get_client_totals(date_from: date, date_to: date) -> Dict[int, RollupTotals]:
+    """Итоги по клиентам за период, включая обе границы"""
+    return await _get_totals(CLIENTS, date_from, date_to)
+
+async def get_company_totals(date_from: date, date_to: date) -> RollupTotals:
+    """Итоги по всем задачам за период, включая обе границы"""
+    totals = await _get_totals(COMPANY, date_from, date_to)
+    return totals.get(0, RollupTotals())
+
+def main() -> int:
+    """Точка входа ручного пересчета сводок"""
+    parser = argparse.ArgumentParser(description="Пересчет ежедневных сводок по задачам")
+    parser.add_argument(
+        '--from',
+        dest='date_from',
+        type=date.fromisoformat,
+        help="пересчитать начиная с даты (ГГГГ-ММ-ДД); по умолчанию - с последней отметки"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    async def run() -> None:
+        try:
+            await refresh_rollups(date_from=args.date_from)
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(run())
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка при пересчете сводок: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Учет времени по задачам
+
+Смена статуса задачи и интервал task_times меняются в одной транзакции:
+    start_task    - задача «в работе», открывается интервал;
+    pause_task    - открытый интервал закрывается со статусом paused;
+    resume_task   - открывается новый интервал;
+    complete_task - задача завершена, открытый интервал закрывается.
+
+Открытый интервал ищется по частичному индексу ix_task_times_open_task_id,
+закрытие - один UPDATE ... RETURNING, который сразу записывает длительность.
+Время хранится с часовым поясом, work_date - местная дата начала интервала.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Integer, cast, extract, func, insert, literal, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.database.db import get_session, unit_of_work
+from src.database.models import Task, TaskTime
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TimeInterval:
+    """Интервал учета времени"""
+    id: int
+    work_date: date
+    started_at: datetime
+    ended_at: Optional[datetime] = None
+    duration: Optional[int] = None  # в секундах
+
+_INTERVAL_COLUMNS = (
+    TaskTime.id,
+    TaskTime.work_date,
+    TaskTime.started_at,
+    TaskTime.ended_at,
+    TaskTime.duration,
+)
+
+def _now() -> datetime:
+    """Текущее местное время с часовым поясом"""
+    return datetime.now().astimezone()
+
+def _open_interval(task_id: int):
+    """Условие открытого интервала задачи (частичный индекс по ended_at IS NULL)"""
+    return (TaskTime.task_id == task_id) & TaskTime.ended_at.is_(None)
+
+async def _execute(session: AsyncSession, stmt) -> Optional[TimeInterval]:
+    """Выполнение INSERT/UPDATE ... RETURNING интервала"""
+    result = await session.execute(stmt, execution_options={'synchronize_session': False})
+    row = result.first()
+    return TimeInterval(**row._mapping) if row is not None else None
+
+async def _set_status(session: AsyncSession, task_id: int, expected: str, status: str, **values) -> bool:
+    """Смена статуса задачи (и полей values), если текущий статус равен expected"""
+    result = await session.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.status == expected)
+        .values(status=status, **values)
+    )
+    return result.rowcount > 0
+
+async def _open(session: AsyncSession, task_id: int, user_id: Optional[int]) -> Optional[TimeInterval]:
+    """Открытие интервала, если у задачи нет открытого"""
+    now = _now()
+    source = select(
+        literal(task_id, Integer),
+        literal(user_id, Integer),
+        literal(now.date(), TaskTime.work_date.type),
+        literal(now, TaskTime.started_at.type),
+        literal(TaskTime.STATUS_STARTED, TaskTime.status.type),
+    ).where(~select(TaskTime.id).where(_open_interval(task_id)).exists())
+    return await _execute(
+        session,
+        insert(TaskTime)
+        .from_select(['task_id', 'user_id', 'work_date', 'started_at', 'status'], source)
+        .returning(*_INTERVAL_COLUMNS)
+    )
+
+async def _close(session: AsyncSession, task_id: int, status: str) -> Optional[TimeInterval]:
+    """Закрытие открытого интервала с записью длительности"""
+    now = _now()
+    duration = func.greatest(extract('epoch', literal(now, TaskTime.started_at.type) - TaskTime.started_at), 0)
+    return await _execute(
+        session,
+        update(TaskTime)
+        .where(_open_interval(task_id))
+        .values(ended_at=now, duration=cast(duration, Integer), status=status)
+        .returning(*_INTERVAL_COLUMNS)
+    )
+
+async def _mark_last_completed(session: AsyncSession, task_id: int) -> Optional[TimeInterval]:
+    """Завершение задачи на паузе: последний интервал помечается завершающим"""
+    latest = aliased(TaskTime)
+    last_id = select(func.max(latest.id)).where(latest.task_id == task_id).scalar_subquery()
+    return await _execute(
+        session,
+        update(TaskTime)
+        .where(TaskTime.task_id == task_id, TaskTime.id == last_id)
+        .values(status=TaskTime.STATUS_COMPLETED)
+        .returning(*_INTERVAL_COLUMNS)
+    )
+
+async def start_task(task_id: int, user_id: Optional[int]) -> Optional[TimeInterval]:
+    """
+    Начало работы над задачей
+
+    Raises:
+        ValueError: Задача не в статусе «не начата»
+    """
+    async with unit_of_work() as uow:
+        try:
+            if not await _set_status(uow.session, task_id, Task.STATUS_NOT_STARTED, Task.STATUS_IN_PROGRESS):
+                raise ValueError("Невозможно начать работу над задачей в текущем статусе")
+            return await _open(uow.session, task_id, user_id)
+        except SQLAlchemyError as e:
+            uow.mark_rollback_only()
+            logger.error(f"Ошибка при начале работы над задачей {task_id}: {e}", exc_info=True)
+            raise
+
+async def pause_task(task_id: int) -> TimeInterval:
+    """
+    Пауза: закрытие открытого интервала задачи
+
+    Raises:
+        ValueError: У задачи нет открытого интервала
+    """
+    async with unit_of_work() as uow:
+        try:
+            interval = await _close(uow.session, task_id, TaskTime.STATUS_PAUSED)
+        except SQLAlchemyError as e:
+            uow.mark_rollback_only()
+            logger.error(f"Ошибка при постановке задачи {task_id} на паузу: {e}", exc_info=True)
+            raise
+    if interval is None:
+        raise ValueError("Задача не в работе или уже на паузе")
+    return interval
+
+async def resume_task(task_id: int, user_id: Optional[int]) -> TimeInterval:
+    """
+    Продолжение работы над задачей после паузы
+
+    Raises:
+        ValueError: Задача не в работе или интервал уже открыт
+    """
+    async with unit_of_work() as uow:
+        try:
+            # Блокировка задачи: повторное нажатие ждет и не откроет второй интервал
+            # (уникальный частичный индекс на секционированной таблице невозможен)
+            status = await uow.session.scalar(
+                select(Task.status).where(Task.id == task_id).with_for_update()
+            )
+            interval = None
+            if status == Task.STATUS_IN_PROGRESS:
+                interval = await _open(uow.session, task_id, user_id)
+        except SQLAlchemyError as e:
+            uow.mark_rollback_only()
+            logger.error(f"Ошибка при продолжении работы над задачей {task_id}: {e}", exc_info=True)
+            raise
+    if interval is None:
+        raise ValueError("Задача не на паузе")
+    return interval
+
+async def complete_task(task_id: int) -> Optional[TimeInterval]:
+    """
+    Завершение задачи
+
+    Returns:
+        Последний интервал задачи (None, если учета времени не было)
+
+    Raises:
+        ValueError: Задача не в статусе «в работе»
+    """
+    async with unit_of_work() as uow:
+        try:
+            completed = await _set_status(
+                uow.session, task_id, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED,
+                completed_at=datetime.utcnow()
+            )
+            if not completed:
+                raise ValueError("Невозможно завершить задачу в текущем статусе")
+            interval = await _close(uow.session, task_id, TaskTime.STATUS_COMPLETED)
+            if interval is None:
+                interval = await _mark_last_completed(uow.session, task_id)
+            return interval
+        except SQLAlchemyError as e:
+            uow.mark_rollback_only()
+            logger.error(f"Ошибка при завершении задачи {task_id}: {e}", exc_info=True)
+            raise
+
+async def get_open_interval(task_id: int) -> Optional[TimeInterval]:
+    """Открытый интервал задачи (None - задача не начата, на паузе или завершена)"""
+    # С основной БД: состояние показывается сразу после паузы или возобновления
+    async with get_session() as session:
+        try:
+            result = await session.execute(select(*_INTERVAL_COLUMNS).where(_open_interval(task_id)))
+            row = result.first()
+            return TimeInterval(**row._mapping) if row is not None else None
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при получении интервала задачи {task_id}: {e}", exc_info=True)
+            raise
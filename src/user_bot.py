@@ -2,6 +2,7 @@
 
 import logging
 from telegram.ext import Application
+from src.middleware.unit_of_work import UnitOfWorkApplication
 
 logger = logging.getLogger(__name__)
 
@@ -16,5 +17,10 @@ class UserBot:
             token (str): Токен бота от BotFather
         """
         from src.handlers.user_bot.bot import setup_user_bot
-        self.application = Application.builder().token(token).build()
+        self.application = (
+            Application.builder()
+            .token(token)
+            .application_class(UnitOfWorkApplication)
+            .build()
+        )
         setup_user_bot(self.application)
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+Простые кэши: в памяти процесса и файловый
+"""
+import logging
+import os
+import re
+import shutil
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    LRU-кэш с ограничением размера и временем жизни записей.
+
+    Используется из одного event loop, поэтому блокировки не нужны.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        """
+        Args:
+            maxsize: Максимальное количество записей
+            ttl: Время жизни записи в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Получение значения (просроченные записи удаляются)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохранение значения с вытеснением самых старых записей"""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаление записи"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class VersionedCache:
+    """
+    Кэш значений, зависящих от таблиц БД.
+
+    У каждой таблицы есть счетчик версий. Значение сохраняется вместе с версиями
+    своих таблиц и считается устаревшим, как только любая из них изменилась.
+    Размер ограничен LRU-вытеснением, время жизни - TTL (страховка от изменений,
+    о которых процесс не узнал).
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        # Общая версия: меняется, когда неизвестно, какие таблицы изменились
+        self._epoch = 0
+
+    def version(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Текущие версии таблиц (в порядке сортировки имен)"""
+        return (self._epoch,) + tuple(self._versions.get(table, 0) for table in sorted(tables))
+
+    def get(self, key: Hashable, tables: Iterable[str], default: Optional[Any] = None) -> Any:
+        """Значение, если ни одна из таблиц не менялась после его сохранения"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.version(tables):
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Tuple[int, ...]) -> None:
+        """
+        Сохранение значения с версиями таблиц, снятыми до его загрузки
+
+        Если таблица изменилась во время загрузки, запись сразу окажется устаревшей.
+        """
+        self._entries.set(key, (version, value))
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        """Отметка об изменении таблиц: все зависящие от них значения устаревают"""
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def invalidate_all(self) -> None:
+        """Все значения устаревают"""
+        self._epoch += 1
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class FileCache:
+    """
+    Файлы на локальном диске с ограничением общего размера (LRU).
+
+    Порядок использования хранится во времени изменения файлов, поэтому
+    переживает перезапуск. Запись атомарна: файл готовится под временным
+    именем и переименовывается. Используется из одного event loop.
+    """
+
+    _NAME = re.compile(r'^[\w.-]+$')
+    _TMP_SUFFIX = '.tmp'
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Args:
+            directory: Каталог кэша (создается при первой записи)
+            max_bytes: Предельный общий размер файлов, 0 - кэш отключен
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._sizes: Optional["OrderedDict[str, int]"] = None
+        self._total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, name: str) -> str:
+        if not self._NAME.match(name):
+            raise ValueError(f"Недопустимое имя файла кэша: {name}")
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> "OrderedDict[str, int]":
+        """Индекс файлов кэша от давно использованных к недавним"""
+        if self._sizes is None:
+            entries = []
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith(self._TMP_SUFFIX):
+                        # Остаток прерванной записи
+                        os.remove(entry.path)
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+            self._sizes = OrderedDict((name, size) for _, name, size in sorted(entries))
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def get(self, name: str) -> Optional[str]:
+        """Путь к файлу кэша или None; файл отмечается как недавно использованный"""
+        if not self.enabled:
+            return None
+        sizes = self._load()
+        if name not in sizes:
+            return None
+        path = self._path(name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._discard(name)
+            return None
+        sizes.move_to_end(name)
+        return path
+
+    def put(self, name: str, source: str) -> Optional[str]:
+        """
+        Сохранение копии файла source (жесткая ссылка, если возможно)
+
+        Returns:
+            Путь к файлу кэша или None, если кэш отключен или файл больше предела
+        """
+        size = os.path.getsize(source)
+        if not self.enabled or size > self.max_bytes:
+            return None
+        sizes = self._load()
+        path = self._path(name)
+        tmp_path = path + self._TMP_SUFFIX
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+
+        self._total -= sizes.pop(name, 0)
+        sizes[name] = size
+        self._total += size
+        self._evict()
+        return path
+
+    def _discard(self, name: str) -> None:
+        self._total -= self._load().pop(name, 0)
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Удаление давно использованных файлов сверх предельного размера"""
+        sizes = self._load()
+        while self._total > self.max_bytes and sizes:
+            name = next(iter(sizes))
+            logger.debug(f"Файл {name} вытеснен из кэша {self.directory}")
+            self._discard(name)
+
+    def clear(self) -> None:
+        """Удаление всех файлов кэша"""
+        for name in list(self._load()):
+            self._discard(name)
+
+    def __len__(self) -> int:
+        return len(self._load())
@@ -23,7 +23,7 @@ def require_auth(bot_type: str = 'user'):
         
         @wraps(handler)
         async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-            logger.info(
+            logger.debug(
                 f"Проверка авторизации для handler={handler.__name__}, "
                 f"user_id={update.effective_user.id if update.effective_user else 'None'}, "
                 f"bot_type={bot_type}"
@@ -35,7 +35,7 @@ def require_auth(bot_type: str = 'user'):
                 update.message.text.startswith('/cancel')):
                 return await handler(update, context, *args, **kwargs)
             
-            # Проверяем авторизацию
+            # Проверяем авторизацию (пользователь уже определен на этапе аутентификации апдейта)
             is_authorized = await auth_middleware(update, context)
             if not is_authorized:
                 logger.warning(
@@ -44,7 +44,7 @@ def require_auth(bot_type: str = 'user'):
                 )
                 return None
                 
-            logger.info(
+            logger.debug(
                 f"Доступ разрешен: handler={handler.__name__}, "
                 f"user_id={update.effective_user.id}"
             )
@@ -18,7 +18,7 @@ async def common_error_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     logger.error(f"Update {update} caused error {context.error}")
     try:
         if update and update.effective_message:
-            await update.message.reply_text(
+            await update.effective_message.reply_text(
                 "Произошла ошибка при выполнении команды. Пожалуйста, попробуйте позже."
             )
     except Exception as e:
@@ -1,6 +1,7 @@
-from datetime import datetime, time, timedelta
+from datetime import datetime, time
 from typing import Optional, Tuple
 from src.config import get_config
+from src.utils.work_calendar import work_calendar
 
 # Получаем конфигурацию
 config = get_config()
@@ -16,20 +17,9 @@ def is_work_time(current_time: Optional[time] = None) -> bool:
 def get_effective_work_time(start_time: datetime, end_time: datetime) -> int:
     """
     Рассчитывает эффективное рабочее время в минутах между двумя датами
-    Учитывает только время в рабочие часы
+    Учитывает только рабочие часы рабочих дней (см. src/utils/work_calendar.py)
     """
-    if start_time > end_time:
-        return 0
-
-    total_minutes = 0
-    current = start_time
-
-    while current < end_time:
-        if is_work_time(current.time()):
-            total_minutes += 1
-        current += timedelta(minutes=1)
-
-    return total_minutes
+    return work_calendar.work_minutes(start_time, end_time)
 
 def format_datetime(dt: datetime) -> str:
     """
@@ -79,6 +79,18 @@ async def validate_invite_code(code: str, telegram_id: int) -> Optional[User]:
             logger.warning(f"Код {code} уже использован")
             return None
             
+        # Отмечаем код как использованный одним UPDATE ... WHERE,
+        # чтобы один код нельзя было активировать дважды одновременно
+        claimed = await db.update_where(
+            Invitation,
+            {'id': invitation.id, 'is_used': False},
+            is_used=True
+        )
+        if not claimed:
+            logger.warning(f"Код {code} уже использован")
+            return None
+        logger.info(f"Код {code} помечен как использованный")
+        
         # Создаем нового пользователя
         user = await db.create(User, 
             telegram_id=telegram_id,
@@ -86,11 +98,6 @@ async def validate_invite_code(code: str, telegram_id: int) -> Optional[User]:
         )
         logger.info(f"Создан новый пользователь: telegram_id={telegram_id}")
         
-        # Отмечаем код как использованный
-        invitation.is_used = True
-        await db.update(Invitation, invitation.id, is_used=True)
-        logger.info(f"Код {code} помечен как использованный")
-        
         return user
         
     except Exception as e:
@@ -0,0 +1,180 @@
+"""
+Рабочий календарь: рабочие минуты между моментами времени
+
+Рабочее время считается через накопленную функцию W(t) - число рабочих
+секунд от начала отсчета до момента t:
+    W(t) = полные недели * секунды рабочей недели
+         + рабочие дни текущей недели до дня t
+         - праздники до дня t (бинарный поиск по отсортированному списку)
+         + рабочая часть дня t до момента t.
+Рабочее время между a и b равно W(b) - W(a) и не зависит от длины периода.
+Пакетный режим считает ту же формулу на массивах NumPy.
+
+Моменты времени - местное время; время с часовым поясом переводится в местное.
+"""
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import Config, get_config
+
+# date(1970, 1, 1).toordinal(): перевод дней numpy.datetime64 в порядковые номера дат
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def _seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+def _local(moment: datetime) -> datetime:
+    """Местное время без часового пояса"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+class WorkCalendar:
+    """Рабочие дни недели с часами, праздники и расчет рабочего времени"""
+
+    def __init__(
+        self,
+        work_hours: Dict[int, Tuple[time, time]],
+        holidays: Iterable[date] = ()
+    ):
+        """
+        Args:
+            work_hours: Часы работы по дням недели (0 - понедельник), остальные дни выходные
+            holidays: Нерабочие даты
+        """
+        self.work_hours = dict(work_hours)
+        self._starts = [0] * 7
+        self._ends = [0] * 7
+        for weekday, (start, end) in self.work_hours.items():
+            self._starts[weekday] = _seconds(start)
+            self._ends[weekday] = max(_seconds(end), _seconds(start))
+        self._day_seconds = [end - start for start, end in zip(self._starts, self._ends)]
+        # Рабочие секунды недели до дня недели (не включая его)
+        self._week_prefix = [0, *accumulate(self._day_seconds)]
+
+        # Праздники, выпадающие на рабочие дни, и накопленные потерянные секунды
+        self._holidays = sorted({
+            day.toordinal() for day in holidays if self._day_seconds[day.weekday()]
+        })
+        self._holiday_prefix = [0, *accumulate(
+            self._day_seconds[(ordinal - 1) % 7] for ordinal in self._holidays
+        )]
+
+        self._np_starts = np.array(self._starts, dtype=np.int64)
+        self._np_ends = np.array(self._ends, dtype=np.int64)
+        self._np_week_prefix = np.array(self._week_prefix, dtype=np.int64)
+        self._np_holidays = np.array(self._holidays, dtype=np.int64)
+        self._np_holiday_prefix = np.array(self._holiday_prefix, dtype=np.int64)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "WorkCalendar":
+        """Календарь из настроек WORK_DAYS, WORK_HOURS, WORK_START_TIME/WORK_END_TIME и HOLIDAYS"""
+        default_hours = (config.work_start_time, config.work_end_time)
+        return cls(
+            {day: config.work_hours.get(day, default_hours) for day in config.work_days},
+            config.holidays
+        )
+
+    def is_workday(self, day: date) -> bool:
+        """Рабочий ли день"""
+        if not self._day_seconds[day.weekday()]:
+            return False
+        ordinal = day.toordinal()
+        index = bisect_left(self._holidays, ordinal)
+        return index == len(self._holidays) or self._holidays[index] != ordinal
+
+    def is_work_time(self, moment: datetime) -> bool:
+        """Попадает ли момент в рабочие часы рабочего дня"""
+        moment = _local(moment)
+        weekday = moment.weekday()
+        second = _seconds(moment.time())
+        return (
+            self._starts[weekday] <= second < self._ends[weekday]
+            and self.is_workday(moment.date())
+        )
+
+    def _accumulated(self, moment: datetime) -> int:
+        """W(t): рабочие секунды от начала отсчета до момента"""
+        moment = _local(moment)
+        ordinal = moment.toordinal()
+        weeks, weekday = divmod(ordinal - 1, 7)
+        holidays_before = bisect_left(self._holidays, ordinal)
+        total = (
+            weeks * self._week_prefix[7]
+            + self._week_prefix[weekday]
+            - self._holiday_prefix[holidays_before]
+        )
+        is_holiday = (
+            holidays_before < len(self._holidays) and self._holidays[holidays_before] == ordinal
+        )
+        if not is_holiday:
+            start = self._starts[weekday]
+            total += min(max(_seconds(moment.time()), start), self._ends[weekday]) - start
+        return total
+
+    def work_seconds(self, start: datetime, end: datetime) -> int:
+        """Рабочие секунды между моментами (0, если конец раньше начала)"""
+        return max(self._accumulated(end) - self._accumulated(start), 0)
+
+    def work_minutes(self, start: datetime, end: datetime) -> int:
+        """Рабочие минуты между моментами (0, если конец раньше начала)"""
+        return self.work_seconds(start, end) // 60
+
+    def _accumulated_batch(self, moments: np.ndarray) -> np.ndarray:
+        """W(t) для массива datetime64[s]"""
+        days = moments.astype('datetime64[D]')
+        ordinals = days.astype(np.int64) + _EPOCH_ORDINAL
+        weeks, weekdays = np.divmod(ordinals - 1, 7)
+        holidays_before = np.searchsorted(self._np_holidays, ordinals, side='left')
+        holidays_through = np.searchsorted(self._np_holidays, ordinals, side='right')
+
+        seconds = (moments - days).astype('timedelta64[s]').astype(np.int64)
+        starts = self._np_starts[weekdays]
+        within = np.clip(seconds, starts, self._np_ends[weekdays]) - starts
+        within[holidays_through > holidays_before] = 0
+
+        return (
+            weeks * self._np_week_prefix[7]
+            + self._np_week_prefix[weekdays]
+            - self._np_holiday_prefix[holidays_before]
+            + within
+        )
+
+    def work_minutes_batch(self, starts: Sequence, ends: Sequence) -> np.ndarray:
+        """
+        Рабочие минуты для пар (начало, конец)
+
+        Args:
+            starts: Начала - последовательность datetime или массив datetime64
+            ends: Концы той же длины
+
+        Returns:
+            np.ndarray: Минуты (int64), 0 для пар с концом раньше начала
+        """
+        start_seconds = self._accumulated_batch(_as_datetime64(starts))
+        end_seconds = self._accumulated_batch(_as_datetime64(ends))
+        return np.maximum(end_seconds - start_seconds, 0) // 60
+
+    def next_workdays(self, count: int, after: Optional[date] = None) -> List[date]:
+        """Ближайшие count рабочих дней после даты (по умолчанию после сегодня)"""
+        if not any(self._day_seconds):
+            return []
+        day = after or date.today()
+        workdays = []
+        while len(workdays) < count:
+            day += timedelta(days=1)
+            if self.is_workday(day):
+                workdays.append(day)
+        return workdays
+
+def _as_datetime64(moments: Sequence) -> np.ndarray:
+    """Массив datetime64[s] в местном времени"""
+    if isinstance(moments, np.ndarray) and np.issubdtype(moments.dtype, np.datetime64):
+        return moments.astype('datetime64[s]')
+    return np.array([_local(moment) for moment in moments], dtype='datetime64[s]')
+
+work_calendar = WorkCalendar.from_config(get_config())
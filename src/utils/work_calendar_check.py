@@ -0,0 +1,142 @@
+"""
+Проверка рабочего календаря против поминутного перебора
+
+Запуск: python -m src.utils.work_calendar_check
+
+Скрипт сравнивает WorkCalendar с прежним способом расчета - перебором
+периода по минутам - на фиксированном календаре (разные часы по дням,
+рабочая суббота, праздники в будни и в выходные) и детерминированном
+наборе периодов: границы полуночи и недели, праздники, пустые и обратные
+периоды, время с часовым поясом и случайные периоды с фиксированным seed.
+Для каждого периода сверяются work_minutes и work_minutes_batch (из
+datetime и из массива datetime64). Завершается с ошибкой при расхождении.
+"""
+import logging
+import random
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Tuple
+
+import numpy as np
+
+from src.utils.work_calendar import WorkCalendar
+
+logger = logging.getLogger(__name__)
+
+WORK_HOURS = {
+    0: (time(9, 30), time(17, 30)),
+    1: (time(9, 30), time(17, 30)),
+    2: (time(9, 30), time(17, 30)),
+    3: (time(9, 30), time(17, 30)),
+    4: (time(9, 30), time(16, 30)),
+    5: (time(10, 0), time(14, 0)),
+}
+# Среда, суббота и воскресенье (праздник в выходной ничего не меняет)
+HOLIDAYS = (date(2026, 1, 7), date(2026, 1, 10), date(2026, 1, 11), date(2026, 3, 9))
+
+RANDOM_SEED = 20260118
+RANDOM_CASES = 300
+RANDOM_MAX_DAYS = 10
+
+def reference_minutes(start: datetime, end: datetime) -> int:
+    """Рабочие минуты перебором по минутам, как до рабочего календаря"""
+    if start.tzinfo is not None:
+        start = start.astimezone().replace(tzinfo=None)
+    if end.tzinfo is not None:
+        end = end.astimezone().replace(tzinfo=None)
+
+    total_minutes = 0
+    current = start
+    while current < end:
+        hours = WORK_HOURS.get(current.weekday())
+        if hours and current.date() not in HOLIDAYS and hours[0] <= current.time() < hours[1]:
+            total_minutes += 1
+        current += timedelta(minutes=1)
+    return total_minutes
+
+def _cases() -> List[Tuple[datetime, datetime]]:
+    """Проверяемые периоды"""
+    cases = [
+        # Полночь: внутри ночи, через полночь, из рабочего дня в следующий
+        (datetime(2026, 1, 5, 23, 59), datetime(2026, 1, 6, 0, 1)),
+        (datetime(2026, 1, 5, 17, 0), datetime(2026, 1, 6, 10, 0)),
+        (datetime(2026, 1, 5, 0, 0), datetime(2026, 1, 6, 0, 0)),
+        # Граница недели: воскресенье - понедельник, пятница - понедельник
+        (datetime(2026, 1, 18, 23, 0), datetime(2026, 1, 19, 10, 0)),
+        (datetime(2026, 1, 16, 16, 0), datetime(2026, 1, 19, 9, 45)),
+        (datetime(2026, 1, 12, 0, 0), datetime(2026, 1, 19, 0, 0)),
+        # Праздники: внутри праздника, через праздник, праздничные выходные
+        (datetime(2026, 1, 7, 10, 0), datetime(2026, 1, 7, 12, 0)),
+        (datetime(2026, 1, 6, 12, 0), datetime(2026, 1, 8, 12, 0)),
+        (datetime(2026, 1, 9, 15, 0), datetime(2026, 1, 12, 11, 0)),
+        (datetime(2026, 3, 6, 9, 0), datetime(2026, 3, 10, 18, 0)),
+        # Часы отдельных дней: укороченная пятница, рабочая суббота
+        (datetime(2026, 1, 16, 16, 0), datetime(2026, 1, 16, 17, 0)),
+        (datetime(2026, 1, 17, 9, 0), datetime(2026, 1, 17, 15, 0)),
+        # Границы рабочего дня, пустой и обратный периоды
+        (datetime(2026, 1, 5, 9, 30), datetime(2026, 1, 5, 17, 30)),
+        (datetime(2026, 1, 5, 9, 29), datetime(2026, 1, 5, 9, 31)),
+        (datetime(2026, 1, 5, 12, 0), datetime(2026, 1, 5, 12, 0)),
+        (datetime(2026, 1, 6, 12, 0), datetime(2026, 1, 5, 12, 0)),
+        # Время с часовым поясом (переводится в местное)
+        (
+            datetime(2026, 1, 5, 6, 0, tzinfo=timezone.utc),
+            datetime(2026, 1, 6, 20, 0, tzinfo=timezone(timedelta(hours=3))),
+        ),
+        (
+            datetime(2026, 1, 9, 22, 0, tzinfo=timezone(timedelta(hours=-5))),
+            datetime(2026, 1, 12, 15, 0, tzinfo=timezone.utc),
+        ),
+    ]
+
+    rng = random.Random(RANDOM_SEED)
+    origin = datetime(2026, 1, 1)
+    for _ in range(RANDOM_CASES):
+        start = origin + timedelta(minutes=rng.randrange(90 * 24 * 60))
+        end = start + timedelta(minutes=rng.randrange(RANDOM_MAX_DAYS * 24 * 60))
+        if rng.random() < 0.2:
+            start = start.replace(tzinfo=timezone(timedelta(hours=rng.randrange(-12, 13))))
+        cases.append((start, end))
+    return cases
+
+def _naive(moment: datetime) -> datetime:
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo is not None else moment
+
+def check_work_calendar() -> List[str]:
+    """Расхождения календаря с перебором (пустой список - расхождений нет)"""
+    calendar = WorkCalendar(WORK_HOURS, HOLIDAYS)
+    cases = _cases()
+    starts = [start for start, _ in cases]
+    ends = [end for _, end in cases]
+    batch = calendar.work_minutes_batch(starts, ends)
+    batch64 = calendar.work_minutes_batch(
+        np.array([_naive(start) for start in starts], dtype='datetime64[s]'),
+        np.array([_naive(end) for end in ends], dtype='datetime64[s]')
+    )
+
+    failures = []
+    for (start, end), from_list, from_array in zip(cases, batch, batch64):
+        expected = reference_minutes(start, end)
+        actual = calendar.work_minutes(start, end)
+        if not expected == actual == from_list == from_array:
+            failures.append(
+                f"{start} - {end}: перебор {expected}, work_minutes {actual}, "
+                f"work_minutes_batch {from_list} / {from_array}"
+            )
+    logger.info(f"Проверено периодов: {len(cases)}")
+    return failures
+
+def main() -> int:
+    """Точка входа проверки рабочего календаря"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    failures = check_work_calendar()
+    for failure in failures:
+        logger.error(failure)
+    if failures:
+        logger.error(f"Расхождений с поминутным перебором: {len(failures)}")
+        return 1
+    logger.info("Рабочий календарь совпадает с поминутным перебором")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())